@@ -1,4 +1,4 @@
-import random
+import itertools
 from generators.base import MathTaskGenerator
 
 class AlgebraSimplificationGenerator(MathTaskGenerator):
@@ -6,18 +6,24 @@ class AlgebraSimplificationGenerator(MathTaskGenerator):
         super().__init__()
         self.topic = "Algebra: Polynomials"
 
+    def parameter_space(self):
+        # var2 never appears in the question, so it does not add distinct tasks
+        return list(itertools.product(["a", "x", "m"], [1, 2, 3, 4, 5], [1, 2, 3, 4, 5, 6, 7]))
+
     def generate(self):
         # Task: Simplify (a - b)(a + b) or (a + b)^2
         # Variable names
-        var1 = random.choice(["a", "x", "m"])
-        var2 = random.choice(["b", "y", "n"])
-        if var1 == var2: var2 = "y"
+        var1 = self.rng.choice(["a", "x", "m"])
         
         # Coefficients/Numbers
         # Type 1: Difference of Squares (Difference of two squares) formula
         # (kx - m)(kx + m) = k^2 x^2 - m^2
-        k = random.choice([1, 2, 3, 4, 5])
-        m = random.choice([1, 2, 3, 4, 5, 6, 7])
+        k = self.rng.choice([1, 2, 3, 4, 5])
+        m = self.rng.choice([1, 2, 3, 4, 5, 6, 7])
+        return self.generate_from((var1, k, m))
+
+    def generate_from(self, params):
+        var1, k, m = params
         
         # Formatting
         term1 = f"{k if k>1 else ''}{var1}"
@@ -53,7 +59,7 @@ class AlgebraSimplificationGenerator(MathTaskGenerator):
         distractors.add(f"${t1_sq_str} - {mid}{var1} + {term2_sq}$")
         
         distractors.discard(correct_ans)
-        result = self.get_random_options(correct_ans, list(distractors)[:4])
+        result = self.get_random_options(correct_ans, self.pick_distractors(distractors))
         
         return {
             "question": question,
@@ -68,19 +74,23 @@ class AlgebraFractionGenerator(MathTaskGenerator):
         super().__init__()
         self.topic = "Algebra: Rational Fractions"
 
+    def parameter_space(self):
+        return list(itertools.product(["b"] + list(range(1, 10)), ["+", "-"]))
+
     def generate(self):
         # Task: Simplify (x^2 - y^2) / (x - y)
         # Or (a^2 - 2ab + b^2) / (a - b)
+        var2 = self.rng.choice(["b", self.rng.randint(1, 9)])
         
+        # Randomize signs
+        target_sign = self.rng.choice(["+", "-"]) # result
+        return self.generate_from((var2, target_sign))
+
+    def generate_from(self, params):
+        var2, target_sign = params
         var1 = "a"
-        var2 = random.choice(["b", random.randint(1, 9)])
         
         # Structure: (VAR1^2 - VAR2^2) / (VAR1 + VAR2) -> VAR1 - VAR2
-        op_top = "-"
-        op_bot = "-" # result is +
-        
-        # Randomize signs
-        target_sign = random.choice(["+", "-"]) # result
         
         # If result is (a - b): top = a^2 - b^2, bot = a + b.  Wait: (a-b)(a+b)/(a+b) = a-b.
         # If result is (a + b): top = a^2 - b^2, bot = a - b.
@@ -112,7 +122,7 @@ class AlgebraFractionGenerator(MathTaskGenerator):
         distractors.add("$-1$")
         
         distractors.discard(correct_ans)
-        result = self.get_random_options(correct_ans, list(distractors)[:4])
+        result = self.get_random_options(correct_ans, self.pick_distractors(distractors))
         
         return {
             "question": question,
@@ -123,14 +133,27 @@ class AlgebraFractionGenerator(MathTaskGenerator):
         }
 
 class SymbolicLogGenerator(MathTaskGenerator):
+    # Values drawn for each task type: a base, or the power k for change_base
+    VALUES = {
+        "expon_base": [2, 3, 4, 5, 10],
+        "log_power": [2, 3, 5],
+        "change_base": [2, 3, 4, 5],
+    }
+
     def __init__(self):
         super().__init__()
         self.topic = "Algebra: Log Properties"
 
+    def parameter_space(self):
+        return [(type_, value) for type_, values in self.VALUES.items() for value in values]
+
     def generate(self):
         # Task: log_a a^k, or 2^log_2 b
-        
-        type_ = random.choice(["expon_base", "log_power", "change_base"])
+        type_ = self.rng.choice(["expon_base", "log_power", "change_base"])
+        return self.generate_from((type_, self.rng.choice(self.VALUES[type_])))
+
+    def generate_from(self, params):
+        type_, value = params
         var = "a"
         
         question = ""
@@ -139,27 +162,27 @@ class SymbolicLogGenerator(MathTaskGenerator):
         
         if type_ == "expon_base":
             # 5 ^ (log_5 a)
-            base = random.choice([2, 3, 4, 5, 10])
+            base = value
             question = f"Обчисліть ${base}^{{\\log_{{{base}}} {var}}}$."
             correct_ans = f"${var}$"
             distractors = {f"${var}^2$", f"${base}{var}$", f"${base}$", "1"}
             
         elif type_ == "log_power":
             # log_3 3^a
-            base = random.choice([2, 3, 5])
+            base = value
             question = f"Обчисліть $\\log_{{{base}}} {base}^{{{var}}}$."
             correct_ans = f"${var}$"
             distractors = {f"${base}{var}$", "1", "0", f"${base}$"}
             
         elif type_ == "change_base":
             # log_{a^k} a
-            k = random.randint(2, 5)
+            k = value
             question = f"Обчисліть $\\log_{{{var}^{k}}} {var}$."
             correct_ans = f"$\\frac{{1}}{{{k}}}$"
             distractors = {f"${k}$", f"$-{k}$", f"$-\\frac{{1}}{{{k}}}$", "1"}
             
         distractors.discard(correct_ans)
-        result = self.get_random_options(correct_ans, list(distractors)[:4])
+        result = self.get_random_options(correct_ans, self.pick_distractors(distractors))
         
         return {
             "question": question,
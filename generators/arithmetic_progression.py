@@ -1,4 +1,3 @@
-import random
 from generators.base import MathTaskGenerator
 
 class ArithmeticFindDifferentGenerator(MathTaskGenerator):
@@ -6,72 +5,66 @@ class ArithmeticFindDifferentGenerator(MathTaskGenerator):
         super().__init__()
         self.topic = "Arithmetic Progression: Find d"
 
+    @staticmethod
+    def _fmt(num):
+        if isinstance(num, float) and num.is_integer():
+            return str(int(num))
+        return str(num).replace('.', '{,}')
+
+    def _render(self, a1, a3, d, wrong):
+        fmt = self._fmt
+        question = f"В арифметичній прогресії $(a_n)$: $a_1 = {fmt(a1)}$, $a_3 = {fmt(a3)}$. Визначте різницю $d$ прогресії."
+        correct_ans = f"$d = {fmt(d)}$"
+        distractors = [f"$d = {fmt(w)}$" for w in wrong]
+
+        return question, correct_ans, distractors
+
+    @staticmethod
+    def _wrong(a1, a3, d):
+        # Forgot /2, mean, sign error, random
+        return (a3 - a1, (a3 + a1) / 2, -d, d + 1)
+
+    def capacity(self):
+        # a1 in [-10, 20]; d on the 0.5 grid in [-10, 10] without 0
+        return 31 * 40
+
     def generate(self):
         # Task: "В арифметичній прогресії (a_n): a_1 = 4, a_3 = 9. Визначте різницю d прогресії."
         
-        a1 = random.randint(-10, 20)
+        a1 = self.rng.randint(-10, 20)
         # d should be divisible by 2 if we want integers, or 0.5 step
-        d = random.choice([
-            random.randint(-10, 10),
-            0.5 * random.randint(-20, 20)
+        d = self.rng.choice([
+            self.rng.randint(-10, 10),
+            0.5 * self.rng.randint(-20, 20)
         ])
         if d == 0: d = 2
         
         a3 = a1 + 2 * d
-        
-        def fmt(num):
-             if isinstance(num, float) and num.is_integer():
-                 return str(int(num))
-             return str(num).replace('.', '{,}')
-             
-        question = f"В арифметичній прогресії $(a_n)$: $a_1 = {fmt(a1)}$, $a_3 = {fmt(a3)}$. Визначте різницю $d$ прогресії."
-        correct_ans = f"$d = {fmt(d)}$"
-        
-        # Distractors
-        distractors = []
-        distractors.append(f"$d = {fmt(a3 - a1)}$") # Forgot /2
-        distractors.append(f"$d = {fmt((a3 + a1) / 2)}$") # Mean
-        distractors.append(f"$d = {fmt(-d)}$") # Sign error
-        distractors.append(f"$d = {fmt(d + 1)}$") # Random
-        
-        result = self.get_random_options(correct_ans, distractors)
-        return {
-            "question": question,
-            "options": result["options"],
-            "correct_index": result["correct_index"],
-            "correct_letter": result["correct_letter"],
-            "raw_correct_value": d
-        }
+        return self.make_task(*self._render(a1, a3, d, self._wrong(a1, a3, d)), d)
+
+    def generate_batch(self, n, seed=None, shard_id=0):
+        if seed is not None:
+            self.reseed(seed, shard_id)
+        rng = self.rng
+        # Parameters for all n tasks in one pass
+        a1s = rng.choices(range(-10, 21), k=n)
+        whole = rng.choices(range(-10, 11), k=n)
+        halves = rng.choices(range(-20, 21), k=n)
+        use_half = rng.choices((False, True), k=n)
+
+        ds = [0.5 * h if half else w for w, h, half in zip(whole, halves, use_half)]
+        ds = [d if d != 0 else 2 for d in ds]
+        a3s = [a1 + 2 * d for a1, d in zip(a1s, ds)]
+        wrongs = [self._wrong(a1, a3, d) for a1, a3, d in zip(a1s, a3s, ds)]
+
+        return self.make_tasks(map(self._render, a1s, a3s, ds, wrongs), ds)
 
 class ArithmeticMemberDifferenceGenerator(MathTaskGenerator):
     def __init__(self):
         super().__init__()
         self.topic = "Arithmetic Progression: Member Difference"
 
-    def generate(self):
-        # Task: "В арифметичній прогресії (a_n) відомо, що a_6 - a_1 = -30. Знайдіть значення виразу a_6 - a_4."
-        # Logic: a_n - a_k = (n-k)d = Known_Delta
-        # Find: a_p - a_q = (p-q)d
-        
-        # 1. Choose d (integer usually)
-        d = random.choice([x for x in range(-10, 11) if x != 0])
-        
-        # 2. Choose indices for the "Given" part
-        # n > k to keep it simple, or whatever
-        k = random.randint(1, 5)
-        n = k + random.randint(2, 6) # difference of 2 to 6 steps
-        
-        given_delta_val = (n - k) * d
-        
-        # 3. Choose indices for the "Find" part
-        # p, q. 
-        q = random.randint(1, n+2)
-        p = q + random.randint(1, 4)
-        if random.random() < 0.5:
-             p, q = q, p # Swap to allow negative differences
-             
-        target_delta_val = (p - q) * d
-        
+    def _render(self, n, k, p, q, given_delta_val, target_delta_val, d):
         question = f"В арифметичній прогресії $(a_n)$ відомо, що $a_{{{n}}} - a_{{{k}}} = {given_delta_val}$. Знайдіть значення виразу $a_{{{p}}} - a_{{{q}}}$."
         
         correct_ans = str(target_delta_val)
@@ -93,72 +86,115 @@ class ArithmeticMemberDifferenceGenerator(MathTaskGenerator):
         # 4. Proportional error? (p-q)/(n-k) reversed?
         # Let's just add random nearby integers if we need more
         while len(distractors) < 4:
-            distractors.add(str(target_delta_val + random.randint(-5, 5)))
+            distractors.add(str(target_delta_val + self.rng.randint(-5, 5)))
             distractors.discard(correct_ans) # Ensure we didn't add the correct answer
             
-        result = self.get_random_options(correct_ans, list(distractors)[:4])
+        return question, correct_ans, self.pick_distractors(distractors)
+
+    def generate(self):
+        # Task: "В арифметичній прогресії (a_n) відомо, що a_6 - a_1 = -30. Знайдіть значення виразу a_6 - a_4."
+        # Logic: a_n - a_k = (n-k)d = Known_Delta
+        # Find: a_p - a_q = (p-q)d
         
-        return {
-            "question": question,
-            "options": result["options"],
-            "correct_index": result["correct_index"],
-            "correct_letter": result["correct_letter"],
-            "raw_correct_value": target_delta_val
-        }
+        # 1. Choose d (integer usually)
+        d = self.rng.choice([x for x in range(-10, 11) if x != 0])
+        
+        # 2. Choose indices for the "Given" part
+        # n > k to keep it simple, or whatever
+        k = self.rng.randint(1, 5)
+        n = k + self.rng.randint(2, 6) # difference of 2 to 6 steps
+        
+        given_delta_val = (n - k) * d
+        
+        # 3. Choose indices for the "Find" part
+        # p, q. 
+        q = self.rng.randint(1, n+2)
+        p = q + self.rng.randint(1, 4)
+        if self.rng.random() < 0.5:
+             p, q = q, p # Swap to allow negative differences
+             
+        target_delta_val = (p - q) * d
+        return self.make_task(*self._render(n, k, p, q, given_delta_val, target_delta_val, d), target_delta_val)
+
+    def generate_batch(self, n, seed=None, shard_id=0):
+        if seed is not None:
+            self.reseed(seed, shard_id)
+        rng = self.rng
+        count = n
+        ds = rng.choices([x for x in range(-10, 11) if x != 0], k=count)
+        ks = rng.choices(range(1, 6), k=count)
+        ns = [k + step for k, step in zip(ks, rng.choices(range(2, 7), k=count))]
+        qs = [rng.randint(1, n_ + 2) for n_ in ns]
+        ps = [q + step for q, step in zip(qs, rng.choices(range(1, 5), k=count))]
+        swaps = rng.choices((False, True), k=count)
+        ps, qs = (
+            [q if swap else p for p, q, swap in zip(ps, qs, swaps)],
+            [p if swap else q for p, q, swap in zip(ps, qs, swaps)],
+        )
+
+        given = [(n_ - k) * d for n_, k, d in zip(ns, ks, ds)]
+        targets = [(p - q) * d for p, q, d in zip(ps, qs, ds)]
+
+        return self.make_tasks(map(self._render, ns, ks, ps, qs, given, targets, ds), targets)
 
 class ArithmeticSumGenerator(MathTaskGenerator):
+    N_CHOICES = [10, 20, 16, 8, 12, 100]
+
     def __init__(self):
         super().__init__()
         self.topic = "Arithmetic Progression: Sum"
 
+    def _render(self, n, first_plus_last, S_n):
+        question = f"Обчисліть суму перших {n}-ти членів арифметичної прогресії $(a_n)$, якщо $a_1 + a_{{{n}}} = {first_plus_last}$."
+        correct_ans = str(S_n)
+        
+        # Distractors
+        # 1. Forgot / 2 => S = sum * n
+        # 2. Calculation error (off by n?)
+        # 3. Arithmetic error (wrong sign)
+        # 4. Just the sum value
+        distractors = [
+            str(first_plus_last * n),
+            str(S_n + n),
+            str(S_n - n),
+            str(-S_n),
+            str(first_plus_last)
+        ]
+        
+        return question, correct_ans, distractors
+
+    def capacity(self):
+        return len(self.N_CHOICES) * 101
+
     def generate(self):
         # Task: "Обчисліть суму перших десяти членів арифметичної прогресії (a_n), якщо a_1 + a_{10} = -12."
         # Logic: S_n = (a_1 + a_n) / 2 * n
         
-        n = random.choice([10, 20, 16, 8, 12, 100])
+        n = self.rng.choice(self.N_CHOICES)
         
         # Sum of first and last 
         # For integer result, (a1 + an) * n must be divisible by 2.
         # If n is even, any integer sum works.
         # If n is odd, sum must be even.
         
-        first_plus_last = random.randint(-50, 50)
+        first_plus_last = self.rng.randint(-50, 50)
         
         # Ensure integer answer
         if n % 2 != 0 and first_plus_last % 2 != 0:
             first_plus_last += 1
             
         S_n = (first_plus_last * n) // 2
-        
-        question = f"Обчисліть суму перших {n}-ти членів арифметичної прогресії $(a_n)$, якщо $a_1 + a_{{{n}}} = {first_plus_last}$."
-        correct_ans = str(S_n)
-        
-        # Distractors
-        distractors = []
-        
-        # 1. Forgot / 2 => S = sum * n
-        distractors.append(str(first_plus_last * n))
-        
-        # 2. Multiplied by n/2 but forgot sum? No.
-        # 2. Calculation error (off by n?)
-        distractors.append(str(S_n + n))
-        distractors.append(str(S_n - n))
-        
-        # 3. Arithmetic error (wrong sign)
-        distractors.append(str(-S_n))
-        
-        # 4. Just the sum value
-        distractors.append(str(first_plus_last))
-        
-        result = self.get_random_options(correct_ans, distractors)
-         
-        return {
-            "question": question,
-            "options": result["options"],
-            "correct_index": result["correct_index"],
-            "correct_letter": result["correct_letter"],
-            "raw_correct_value": S_n
-        }
+        return self.make_task(*self._render(n, first_plus_last, S_n), S_n)
+
+    def generate_batch(self, n, seed=None, shard_id=0):
+        if seed is not None:
+            self.reseed(seed, shard_id)
+        rng = self.rng
+        ns = rng.choices(self.N_CHOICES, k=n)
+        sums = rng.choices(range(-50, 51), k=n)
+        sums = [s + 1 if m % 2 != 0 and s % 2 != 0 else s for m, s in zip(ns, sums)]
+        totals = [(s * m) // 2 for m, s in zip(ns, sums)]
+        return self.make_tasks(map(self._render, ns, sums, totals), totals)
 
 class ArithmeticTermPropertiesGenerator(MathTaskGenerator):
     def __init__(self):
@@ -173,12 +209,12 @@ class ArithmeticTermPropertiesGenerator(MathTaskGenerator):
         # Scenario 1: Decreasing seq, count positive terms.
         # Scenario 2: Increasing seq, count negative terms.
         
-        scenario = random.choice(['positive', 'negative'])
+        scenario = self.rng.choice(['positive', 'negative'])
         
         if scenario == 'positive':
             # Need a1 > 0, d < 0
-            n_terms = random.randint(5, 15)
-            d = -1 * random.choice([0.5, 1.5, 2.5, 0.4, 0.8, 1, 2, 3])
+            n_terms = self.rng.randint(5, 15)
+            d = -1 * self.rng.choice([0.5, 1.5, 2.5, 0.4, 0.8, 1, 2, 3])
             
             # Make sure the (n_terms)-th term is positive, and (n_terms+1)-th is <= 0
             # a_n = a_1 + (n-1)d
@@ -186,7 +222,7 @@ class ArithmeticTermPropertiesGenerator(MathTaskGenerator):
             # a_{n} = epsilon > 0
             # a_{n+1} = a_n + d <= 0
             
-            last_pos_val = random.choice([0.1, 0.5, 1, 2, 0.2, 0.3])
+            last_pos_val = self.rng.choice([0.1, 0.5, 1, 2, 0.2, 0.3])
             a1 = last_pos_val - (n_terms - 1) * d
             
             question_type = "додатних"
@@ -194,10 +230,10 @@ class ArithmeticTermPropertiesGenerator(MathTaskGenerator):
             
         else: # negative
             # Need a1 < 0, d > 0
-            n_terms = random.randint(5, 15)
-            d = random.choice([0.5, 1.5, 2.5, 0.4, 0.8, 1, 2, 3])
+            n_terms = self.rng.randint(5, 15)
+            d = self.rng.choice([0.5, 1.5, 2.5, 0.4, 0.8, 1, 2, 3])
             
-            last_neg_val = -1 * random.choice([0.1, 0.5, 1, 2, 0.2, 0.3])
+            last_neg_val = -1 * self.rng.choice([0.1, 0.5, 1, 2, 0.2, 0.3])
             a1 = last_neg_val - (n_terms - 1) * d
             
             question_type = "від'ємних"
@@ -231,32 +267,20 @@ class ArithmeticTermPropertiesGenerator(MathTaskGenerator):
         }
 
 class ArithmeticMiddleTermGenerator(MathTaskGenerator):
+    D_CHOICES = [0.5, 1.5, 2.5, 1, 2, 3, 4, 5, -1, -2, -3]
+
     def __init__(self):
         super().__init__()
         self.topic = "Arithmetic Progression: Middle Term"
 
-    def generate(self):
-        # Task: "Визначте восьмий член a_8 арифметичної прогресії (a_n), у якої a_7 = 11, a_9 = 18."
-        # Logic: a_n = (a_{n-1} + a_{n+1}) / 2
-        
-        n = random.randint(3, 20)
-        a_prev = random.randint(-20, 50)
-        
-        # We need a_next such that (a_prev + a_next) is divisible by 2 for integer result.
-        # So a_prev and a_next must have same parity.
-        delta = random.choice([2, 4, 6, 8, -2, -4, -6, 10, 12]) # even difference implies same parity
-        # Or just start with d
-        d = random.choice([0.5, 1.5, 2.5, 1, 2, 3, 4, 5, -1, -2, -3])
-        
-        a_prev_val = a_prev
-        a_next_val = a_prev + 2*d
-        a_target_val = a_prev + d
-        
-        def fmt(num):
-             if isinstance(num, float) and num.is_integer():
-                 return str(int(num))
-             return str(round(num, 2)).replace('.', '{,}')
+    @staticmethod
+    def _fmt(num):
+        if isinstance(num, float) and num.is_integer():
+            return str(int(num))
+        return str(round(num, 2)).replace('.', '{,}')
 
+    def _render(self, n, d, a_prev_val, a_next_val, a_target_val):
+        fmt = self._fmt
         question = f"Визначте {n}-й член $a_{{{n}}}$ арифметичної прогресії $(a_n)$, у якої $a_{{{n-1}}} = {fmt(a_prev_val)}$, $a_{{{n+1}}} = {fmt(a_next_val)}$."
         correct_ans = fmt(a_target_val)
         
@@ -271,35 +295,55 @@ class ArithmeticMiddleTermGenerator(MathTaskGenerator):
         # 4. d
         distractors.append(fmt(d))
         
-        result = self.get_random_options(correct_ans, distractors)
+        return question, correct_ans, distractors
+
+    def capacity(self):
+        return 18 * 71 * len(self.D_CHOICES)
+
+    def generate(self):
+        # Task: "Визначте восьмий член a_8 арифметичної прогресії (a_n), у якої a_7 = 11, a_9 = 18."
+        # Logic: a_n = (a_{n-1} + a_{n+1}) / 2
         
-        return {
-            "question": question,
-            "options": result["options"],
-            "correct_index": result["correct_index"],
-            "correct_letter": result["correct_letter"],
-            "raw_correct_value": a_target_val
-        }
+        n = self.rng.randint(3, 20)
+        a_prev = self.rng.randint(-20, 50)
+        
+        # We need a_next such that (a_prev + a_next) is divisible by 2 for integer result.
+        # So a_prev and a_next must have same parity.
+        delta = self.rng.choice([2, 4, 6, 8, -2, -4, -6, 10, 12]) # even difference implies same parity
+        # Or just start with d
+        d = self.rng.choice(self.D_CHOICES)
+        
+        a_prev_val = a_prev
+        a_next_val = a_prev + 2*d
+        a_target_val = a_prev + d
+        return self.make_task(*self._render(n, d, a_prev_val, a_next_val, a_target_val), a_target_val)
+
+    def generate_batch(self, n, seed=None, shard_id=0):
+        if seed is not None:
+            self.reseed(seed, shard_id)
+        rng = self.rng
+        ns = rng.choices(range(3, 21), k=n)
+        prevs = rng.choices(range(-20, 51), k=n)
+        ds = rng.choices(self.D_CHOICES, k=n)
+        nexts = [a + 2 * d for a, d in zip(prevs, ds)]
+        targets = [a + d for a, d in zip(prevs, ds)]
+        return self.make_tasks(map(self._render, ns, ds, prevs, nexts, targets), targets)
 
 class ArithmeticFormulaSearchGenerator(MathTaskGenerator):
+    COEFF_CHOICES = [-1.5, -2.5, -0.5, 1.5, 2.5, 3, 4, -3, -4]
+
     def __init__(self):
         super().__init__()
         self.topic = "Arithmetic Progression: Formula Search"
 
-    def generate(self):
-        # Task: "Арифметичну прогресію (a_n) задано формулою n-го члена a_n = 18 - 1.5n. Визначте номер члена, значення якого дорівнює -30."
-        # Logic: val = const + coeff * n  => n = (val - const) / coeff
-        
-        n_target = random.randint(5, 50)
-        coeff = random.choice([-1.5, -2.5, -0.5, 1.5, 2.5, 3, 4, -3, -4])
-        const = random.randint(10, 50)
-        
-        val = const + coeff * n_target
-        
-        def fmt(num):
-             if isinstance(num, float) and num.is_integer():
-                 return str(int(num))
-             return str(round(num, 2)).replace('.', '{,}')
+    @staticmethod
+    def _fmt(num):
+        if isinstance(num, float) and num.is_integer():
+            return str(int(num))
+        return str(round(num, 2)).replace('.', '{,}')
+
+    def _render(self, n_target, coeff, const, val):
+        fmt = self._fmt
              
         # Format formula: 18 - 1.5n or 18 + 1.5n
         sign = "+" if coeff > 0 else ""
@@ -314,25 +358,39 @@ class ArithmeticFormulaSearchGenerator(MathTaskGenerator):
         distractors.append(str(n_target - 1))
         # 2. Calculation error (e.g. forgot const)
         # val = coeff * n => n = val / coeff
-        try:
-            wrong_n = val / coeff
-            if wrong_n > 0 and wrong_n != n_target:
-                distractors.append(fmt(wrong_n))
-        except: pass
+        wrong_n = val / coeff
+        if wrong_n > 0 and wrong_n != n_target:
+            distractors.append(fmt(wrong_n))
         
         # 3. Random reasonable numbers
         distractors.append(str(n_target + 10))
         distractors.append(str(max(1, n_target - 10)))
         
-        result = self.get_random_options(correct_ans, distractors)
+        return question, correct_ans, distractors
+
+    def capacity(self):
+        return 46 * len(self.COEFF_CHOICES) * 41
+
+    def generate(self):
+        # Task: "Арифметичну прогресію (a_n) задано формулою n-го члена a_n = 18 - 1.5n. Визначте номер члена, значення якого дорівнює -30."
+        # Logic: val = const + coeff * n  => n = (val - const) / coeff
         
-        return {
-            "question": question,
-            "options": result["options"],
-            "correct_index": result["correct_index"],
-            "correct_letter": result["correct_letter"],
-            "raw_correct_value": n_target
-        }
+        n_target = self.rng.randint(5, 50)
+        coeff = self.rng.choice(self.COEFF_CHOICES)
+        const = self.rng.randint(10, 50)
+        
+        val = const + coeff * n_target
+        return self.make_task(*self._render(n_target, coeff, const, val), n_target)
+
+    def generate_batch(self, n, seed=None, shard_id=0):
+        if seed is not None:
+            self.reseed(seed, shard_id)
+        rng = self.rng
+        targets = rng.choices(range(5, 51), k=n)
+        coeffs = rng.choices(self.COEFF_CHOICES, k=n)
+        consts = rng.choices(range(10, 51), k=n)
+        vals = [c + k * t for t, k, c in zip(targets, coeffs, consts)]
+        return self.make_tasks(map(self._render, targets, coeffs, consts, vals), targets)
 
 class ArithmeticWordProblemGenerator(MathTaskGenerator):
     def __init__(self):
@@ -340,17 +398,17 @@ class ArithmeticWordProblemGenerator(MathTaskGenerator):
         self.topic = "Arithmetic Progression: Word Problem"
 
     def generate(self):
-        scenario = random.choice(['auditorium', 'stack', 'loan', 'training'])
+        scenario = self.rng.choice(['auditorium', 'stack', 'loan', 'training'])
         
         if scenario == 'auditorium':
             # Task: Row 1 has a1 seats. Last row (n) has an seats. Find mid row or total.
             
-            n_rows = random.randint(10, 30)
-            d = random.randint(1, 4)
-            a1 = random.randint(15, 60)
+            n_rows = self.rng.randint(10, 30)
+            d = self.rng.randint(1, 4)
+            a1 = self.rng.randint(15, 60)
             an = a1 + (n_rows - 1) * d
             
-            target_row = random.randint(2, n_rows - 1)
+            target_row = self.rng.randint(2, n_rows - 1)
             target_val = a1 + (target_row - 1) * d
             
             question = f"У залі для глядачів цирку встановлено {n_rows} рядів крісел: у першому ряду {a1} крісла, а в кожному наступному ряду кількість крісел на те саме число більше, ніж у попередньому. Визначте кількість крісел у \\textit{{{target_row}-му}} ряду, якщо в останньому ряду {an} крісла."
@@ -362,7 +420,7 @@ class ArithmeticWordProblemGenerator(MathTaskGenerator):
             # Usually simple: top row 1, increases by 1.
             
             top_row = 1
-            rows = random.randint(3, 8) # Keep rows small for drawing
+            rows = self.rng.randint(3, 8) # Keep rows small for drawing
             bottom_row = top_row + (rows - 1)
             # Sum = (top + bottom) * rows / 2
             total = (top_row + bottom_row) * rows // 2
@@ -402,12 +460,12 @@ class ArithmeticWordProblemGenerator(MathTaskGenerator):
         elif scenario == 'loan':
             # Task: Pay loan in n months. Month 1 = a1. Each month -d. Total sum?
             
-            months = random.choice([12, 24, 6, 10])
-            d = random.choice([10, 50, 20, 100])
+            months = self.rng.choice([12, 24, 6, 10])
+            d = self.rng.choice([10, 50, 20, 100])
             # Last payment should be > 0.
             # a_n = a1 - (n-1)d > 0 => a1 > (n-1)d
             min_a1 = (months) * d 
-            a1 = min_a1 + random.randint(1, 10) * 100
+            a1 = min_a1 + self.rng.randint(1, 10) * 100
             
             an = a1 - (months - 1) * d
             
@@ -420,9 +478,9 @@ class ArithmeticWordProblemGenerator(MathTaskGenerator):
         else: # training
             # Task: Day 1 = a1 words. Each day +d. Total in n days?
             
-            days = random.randint(10, 30)
-            a1 = random.randint(5, 20)
-            d = random.randint(1, 5)
+            days = self.rng.randint(10, 30)
+            a1 = self.rng.randint(5, 20)
+            d = self.rng.randint(1, 5)
             
             an = a1 + (days - 1) * d
             total = (a1 + an) * days // 2
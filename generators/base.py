@@ -1,11 +1,59 @@
 from abc import ABC, abstractmethod
+from collections import Counter
+from itertools import permutations
+import hashlib
 import random
 import json
+from generators.options import render_option, neighbours
+
+LABELS = ["А", "Б", "В", "Г", "Д"]
+# Orders of the wrong options, by their count; get_random_options_batch() draws one per task
+_ORDERS = {}
+
+def _orders(k):
+    if k not in _ORDERS:
+        _ORDERS[k] = list(permutations(range(k)))
+    return _ORDERS[k]
+
+def derive_seed(master_seed, generator_id, shard_id=0):
+    """
+    Derives a stable 64-bit seed for one (master seed, generator id, shard id) stream.
+    Unlike hash(), the result does not depend on PYTHONHASHSEED, so the same
+    triple gives the same stream in every process.
+    """
+    key = f"{master_seed}:{generator_id}:{shard_id}"
+    return int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "big")
 
 class MathTaskGenerator(ABC):
     def __init__(self):
         self.topic = "Unknown"
         self.task_type = "multiple_choice"
+        # Every generator draws from its own stream; see reseed()
+        self.rng = random.Random()
+        # How often get_random_options() had to invent options
+        self.option_stats = Counter()
+
+    @property
+    def generator_id(self):
+        """Stable identifier used to derive this generator's RNG streams."""
+        return type(self).__name__
+
+    def reseed(self, master_seed, shard_id=0):
+        """
+        Switches the generator to the stream derived from
+        (master_seed, generator_id, shard_id). Different shards never share a stream,
+        so they can be generated in separate processes.
+        """
+        self.rng = random.Random(derive_seed(master_seed, self.generator_id, shard_id))
+        return self
+
+    def generate_task(self, master_seed, task_index, shard_id=0):
+        """
+        Regenerates task #task_index of a shard on its own, without generating
+        the tasks before it. Each task index gets its own stream.
+        """
+        self.reseed(master_seed, (shard_id, task_index))
+        return self.generate()
 
     @abstractmethod
     def generate(self):
@@ -19,60 +67,209 @@ class MathTaskGenerator(ABC):
         """
         pass
 
+    def generate_batch(self, n, seed=None, shard_id=0):
+        """
+        Generates n task instances in one call.
+        Generators with closed-form parameters override this to draw the
+        parameters of all n tasks column-wise, compute answers/distractors
+        as lists and assemble all options in one make_tasks() call.
+        The default simply loops over generate().
+        If seed is given, the batch is drawn from the (seed, generator_id, shard_id) stream.
+        Returns a list of task dictionaries.
+        """
+        if seed is not None:
+            self.reseed(seed, shard_id)
+        return [self.generate() for _ in range(n)]
+
+    def parameter_space(self):
+        """
+        Lists every parameter combination for generators with a small finite
+        space, as tuples accepted by generate_from(). Returns None when the
+        space is not enumerated (large or unbounded).
+        """
+        return None
+
+    def generate_from(self, params):
+        """Generates the task for one entry of parameter_space()."""
+        raise NotImplementedError(f"{type(self).__name__} does not enumerate its parameters")
+
+    def capacity(self):
+        """
+        Number of distinct parameter combinations (an upper bound on distinct
+        tasks), or None if unknown/unbounded.
+        """
+        space = self.parameter_space()
+        return len(space) if space is not None else None
+
+    def capacity_is_upper_bound(self):
+        """True if capacity() may count tasks that render the same (see MatchingTaskGenerator)."""
+        return False
+
+    def distinct_answers(self):
+        """
+        Number of distinct rendered correct options over parameter_space(), or
+        None if the space is not enumerated. The rng state is restored afterwards.
+        """
+        space = self.parameter_space()
+        if space is None:
+            return None
+        state = self.rng.getstate()
+        try:
+            answers = set()
+            for params in space:
+                task = self.generate_from(params)
+                answers.add(task["options"][task["correct_index"]])
+            return len(answers)
+        finally:
+            self.rng.setstate(state)
+
+    def iter_distinct(self):
+        """
+        Endless task iterator. For an enumerated parameter space it samples
+        without replacement: every combination is used once (in a shuffled
+        order) before any repeats. Other generators just call generate().
+        """
+        space = self.parameter_space()
+        if space is None:
+            while True:
+                yield self.generate()
+        order = list(space)
+        while True:
+            self.rng.shuffle(order)
+            for params in order:
+                yield self.generate_from(params)
+
+    def pick_distractors(self, distractors, k=4):
+        """
+        Picks up to k distractors from a set.
+        Iteration order of a set of strings changes from process to process,
+        so candidates are sorted before sampling with the generator's rng.
+        """
+        pool = sorted(distractors)
+        return self.rng.sample(pool, min(k, len(pool)))
+
+    def make_task(self, question, correct, distractors, raw_correct_value):
+        """Task dictionary for one question; options come from get_random_options()."""
+        result = self.get_random_options(correct, distractors)
+        return {
+            "question": question,
+            "options": result["options"],
+            "correct_index": result["correct_index"],
+            "correct_letter": result["correct_letter"],
+            "raw_correct_value": raw_correct_value
+        }
+
+    def make_tasks(self, rendered, raw_correct_values):
+        """
+        make_task() for a whole batch: rendered yields (question, correct, distractors)
+        rows; options for all of them come from one get_random_options_batch() call.
+        """
+        rendered = list(rendered)
+        results = self.get_random_options_batch([row[1] for row in rendered], [row[2] for row in rendered])
+        return [
+            {
+                "question": row[0],
+                "options": result["options"],
+                "correct_index": result["correct_index"],
+                "correct_letter": result["correct_letter"],
+                "raw_correct_value": raw
+            }
+            for row, result, raw in zip(rendered, results, raw_correct_values)
+        ]
+
+    def _wrong_options(self, correct, distractors, count, pools=None):
+        """
+        Exactly count wrong options for the rendered correct answer: distractors are
+        rendered and deduplicated (keeping order), missing ones are filled from
+        neighbours of the correct answer and then from plain integers (both counted
+        in option_stats), extra ones are dropped at random.
+        pools caches neighbours() per correct answer across calls.
+        """
+        rng = self.rng
+        # One pass: render, drop duplicates (keeping order) and the correct answer
+        options = dict.fromkeys(d if type(d) is str else render_option(d) for d in distractors)
+        options.pop(correct, None)
+        options = list(options)
+
+        missing = count - len(options)
+        if missing > 0:
+            if pools is None:
+                neighbour_pool = list(dict.fromkeys(neighbours(correct)))
+            else:
+                if correct not in pools:
+                    pools[correct] = list(dict.fromkeys(neighbours(correct)))
+                neighbour_pool = pools[correct]
+            taken = set(options)
+            taken.add(correct)
+            pool = [n for n in neighbour_pool if n not in taken]
+            # Sample among the nearest candidates so fillers stay plausible
+            pool = pool[:max(2 * missing, 4)]
+            added = rng.sample(pool, min(missing, len(pool)))
+            options += added
+            taken.update(added)
+            self.option_stats["filler"] += len(added)
+            missing -= len(added)
+            # Last resort: small integers; at most len(taken) of them are taken
+            fallback = 1
+            while missing > 0:
+                if str(fallback) not in taken:
+                    options.append(str(fallback))
+                    self.option_stats["fallback"] += 1
+                    missing -= 1
+                fallback += 1
+        elif missing < 0:
+            options = rng.sample(options, count)
+        return options
+
+    def get_random_options_batch(self, corrects, distractor_lists, num_options=5):
+        """
+        get_random_options() for a whole batch in one pass over the columns.
+        The position of each correct answer and the order of the wrong options
+        are drawn for all tasks at once, and neighbours() is computed once per
+        distinct correct answer. Options follow the same rules (and the same
+        distribution) as get_random_options(), but not the same random stream.
+        Returns a list of {"options", "correct_index", "correct_letter"}.
+        """
+        rng = self.rng
+        count = len(corrects)
+        wrong_count = num_options - 1
+        positions = rng.choices(range(num_options), k=count)
+        orders = rng.choices(_orders(wrong_count), k=count)
+        pools = {}
+        results = []
+        for correct, distractors, position, order in zip(corrects, distractor_lists, positions, orders):
+            correct = correct if type(correct) is str else render_option(correct)
+            options = self._wrong_options(correct, distractors, wrong_count, pools)
+            options = [options[i] for i in order]
+            options.insert(position, correct)
+            results.append({
+                "options": options,
+                "correct_index": position,
+                "correct_letter": LABELS[position] if position < len(LABELS) else "?"
+            })
+        self.option_stats["calls"] += count
+        return results
+
     def get_random_options(self, correct, distractors, num_options=5):
         """
-        Helper to shuffle correct + distractors into a final list.
-        Returns (options_list, correct_index).
-        Guarantees num_options items by filling with random numbers if needed (last resort) or duplicating.
+        Shuffles correct + distractors into a final list of num_options distinct options.
+        Candidates may be option strings or typed values (int, Fraction, float).
+        Missing options are filled from neighbours of the correct answer of the
+        same kind (numbers, \\frac, intervals, LaTeX expressions); plain integers
+        are the last resort (see _wrong_options()).
+        Returns {"options", "correct_index", "correct_letter"}.
         """
-        options = [correct] + distractors
-        # Dedupe strictly strings
-        options = list(set(options))
-        
-        # Ensure correct is present
-        if correct not in options:
-            options.append(correct)
-            
-        # Fill if too few
-        attempts = 0
-        while len(options) < num_options:
-            # Last resort filler
-            try:
-                # Try to guess type from correct answer
-                if "," in correct or "." in correct:
-                    val = float(correct.replace(",", "."))
-                    new_val = val + random.choice([-1, 1, 0.5, -0.5, 2, -2])
-                    options.append(str(round(new_val, 2)).replace(".", ","))
-                else:
-                     val = int(correct)
-                     new_val = val + random.randint(-10, 10)
-                     options.append(str(new_val))
-            except:
-                 # Just random string
-                 options.append(str(random.randint(1, 100)))
-            
-            # Dedupe again
-            options = list(set(options))
-            attempts += 1
-            if attempts > 20: 
-                # If we really can't find unique distractors, just duplicate
-                options.append(options[0]) 
-
-        # If we have too many, cut it
-        if len(options) > num_options:
-            # Ensure we keep correct answer
-            options.remove(correct)
-            random.shuffle(options)
-            options = options[:num_options-1]
-            options.append(correct)
-
-        random.shuffle(options)
+        correct = render_option(correct)
+        options = self._wrong_options(correct, distractors, num_options - 1)
+        self.option_stats["calls"] += 1
+
+        options.append(correct)
+        self.rng.shuffle(options)
         correct_index = options.index(correct)
         
         # Map to A, B, C, D, E...
-        labels = ["А", "Б", "В", "Г", "Д"]
         return {
             "options": options,
             "correct_index": correct_index,
-            "correct_letter": labels[correct_index] if correct_index < len(labels) else "?"
+            "correct_letter": LABELS[correct_index] if correct_index < len(LABELS) else "?"
         }
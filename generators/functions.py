@@ -1,25 +1,29 @@
-import random
+import itertools
 from generators.base import MathTaskGenerator
 
 class FunctionShiftGenerator(MathTaskGenerator):
+    # Directions
+    SHIFTS = [
+        ("праворуч", "right", "-", "x"), # f(x - a)
+        ("ліворуч", "left", "+", "x"),   # f(x + a)
+        ("вгору", "up", "+", "y"),       # f(x) + a
+        ("вниз", "down", "-", "y")       # f(x) - a
+    ]
+
     def __init__(self):
         super().__init__()
         self.topic = "Functions: Graph Shifts"
 
+    def parameter_space(self):
+        return list(itertools.product(self.SHIFTS, range(1, 6)))
+
     def generate(self):
         # Task: Given graph of y=f(x), find equation for shifted graph OR vice versa.
         # Text-based: "Graph of g(x) is obtained from f(x) by moving 3 units right. Find g(x)."
-        
-        # Directions
-        shifts = [
-            ("праворуч", "right", "-", "x"), # f(x - a)
-            ("ліворуч", "left", "+", "x"),   # f(x + a)
-            ("вгору", "up", "+", "y"),       # f(x) + a
-            ("вниз", "down", "-", "y")       # f(x) - a
-        ]
-        
-        name_move, direction, sign_symbol, axis = random.choice(shifts)
-        units = random.randint(1, 5)
+        return self.generate_from((self.rng.choice(self.SHIFTS), self.rng.randint(1, 5)))
+
+    def generate_from(self, params):
+        (name_move, direction, sign_symbol, axis), units = params
         
         question = f"Графік функції $y = f(x)$ паралельно перенесли вздовж осі $O{axis}$ на {units} одиниць {name_move}. " \
                    f"Укажіть формулу для отриманої функції $y = g(x)$."
@@ -67,7 +71,7 @@ class FunctionShiftGenerator(MathTaskGenerator):
         distractors.add(f"$y = {units}f(x)$")
         
         distractors.discard(correct_ans)
-        result = self.get_random_options(correct_ans, list(distractors)[:4])
+        result = self.get_random_options(correct_ans, self.pick_distractors(distractors))
         
         return {
             "question": question,
@@ -78,21 +82,43 @@ class FunctionShiftGenerator(MathTaskGenerator):
         }
 
 class FunctionDomainGenerator(MathTaskGenerator):
+    LOG_BASES = [2, 3, 5, 0.5]
+
     def __init__(self):
         super().__init__()
         self.topic = "Functions: Domain"
 
+    def parameter_space(self):
+        # extra: numerator for "div", log base for "log", unused for "sqrt"
+        extras = {"sqrt": [None], "div": list(range(1, 6)), "log": self.LOG_BASES}
+        return [
+            (type_, k, b, extra)
+            for type_ in ["sqrt", "div", "log"]
+            for k in [1, -1]
+            for b in range(1, 10)
+            for extra in extras[type_]
+        ]
+
     def generate(self):
         # Task: Find domain of function.
         # Types: sqrt(x), size/x, log(x)
         
-        type_ = random.choice(["sqrt", "div", "log"])
+        type_ = self.rng.choice(["sqrt", "div", "log"])
         
         # f(x) = (Something)
         # Inside is usually linear: kx + b
         
-        k = random.choice([1, -1])
-        b = random.randint(1, 9)
+        k = self.rng.choice([1, -1])
+        b = self.rng.randint(1, 9)
+        extra = None
+        if type_ == "div":
+            extra = self.rng.randint(1, 5)
+        elif type_ == "log":
+            extra = self.rng.choice(self.LOG_BASES)
+        return self.generate_from((type_, k, b, extra))
+
+    def generate_from(self, params):
+        type_, k, b, extra = params
         sign_str = "+" if b > 0 else ""
         
         inner_expr = f"{k if k!=1 else ''}x {sign_str} {b}"
@@ -115,13 +141,13 @@ class FunctionDomainGenerator(MathTaskGenerator):
                 answer_interval = f"(-\\infty; {crit_val}]"
                 
         elif type_ == "div":
-            num = random.randint(1, 5)
+            num = extra
             func_display = f"$y = \\frac{{{num}}}{{{inner_expr}}}$"
             # Require inner != 0
             answer_interval = f"(-\\infty; {crit_val}) \\cup ({crit_val}; +\\infty)"
             
         elif type_ == "log":
-            base = random.choice([2, 3, 5, 0.5])
+            base = extra
             func_display = f"$y = \\log_{{{base}}} ({inner_expr})$"
             # Require inner > 0
             if k == 1: # x > -b
@@ -169,7 +195,7 @@ class FunctionDomainGenerator(MathTaskGenerator):
         distractors.add(correct_ans.replace(str(crit_val), str(wrong_val)))
         
         distractors.discard(correct_ans)
-        result = self.get_random_options(correct_ans, list(distractors)[:4])
+        result = self.get_random_options(correct_ans, self.pick_distractors(distractors))
         
         return {
             "question": question,
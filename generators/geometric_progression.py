@@ -1,104 +1,113 @@
-import random
 from generators.base import MathTaskGenerator
 
 class GeometricFindTermGenerator(MathTaskGenerator):
+    B1_CHOICES = [2, 3, 4, 5, 10, 16, 32, 64, 81, 27]
+    Q_CHOICES = [2, 3, 4, 0.5, 0.25, -2, -0.5]
+
     def __init__(self):
         super().__init__()
         self.topic = "Geometric Progression: Find Term (b_1, b_2 -> b_n)"
 
+    @staticmethod
+    def _fmt(num):
+        if isinstance(num, float) and num.is_integer():
+            return str(int(num))
+        return str(round(num, 4)).replace('.', '{,}')
+
+    def _render(self, b1, b2, n, bn, wrong):
+        fmt = self._fmt
+        question = f"У геометричній прогресії $(b_n)$ відомо, що $b_1 = {fmt(b1)}$, $b_2 = {fmt(b2)}$. Визначте $b_{{{n}}}$."
+        correct_ans = fmt(bn)
+        
+        distractors = set(fmt(w) for w in wrong)
+        
+        # Fill randoms
+        while len(distractors) < 4:
+            val = bn + self.rng.choice([-1, 1, -10, 10, -0.5, 0.5])
+            distractors.add(fmt(val))
+
+        distractors.discard(correct_ans)
+        
+        return question, correct_ans, self.pick_distractors(distractors)
+
+    @staticmethod
+    def _wrong(b1, b2, q, n, bn):
+        # 1. Arithmetic connection (d = b2 - b1)
+        # 2. q error (inverse q)
+        # 3. Off by one power
+        # 4. Sign error
+        d = b2 - b1
+        return (
+            b1 + (n-1)*d,
+            b1 * ((1/q) ** (n - 1)),
+            b1 * (q ** n),
+            b1 * (q ** (n - 2)),
+            -bn
+        )
+
+    def capacity(self):
+        # n has 3 values when |q| > 2, otherwise 4
+        per_b1 = sum(3 if abs(q) > 2 else 4 for q in self.Q_CHOICES)
+        return len(self.B1_CHOICES) * per_b1
+
     def generate(self):
         # Task: Given b_1, b_2, find b_n
         
-        b1 = random.choice([2, 3, 4, 5, 10, 16, 32, 64, 81, 27])
-        q = random.choice([2, 3, 4, 0.5, 0.25, -2, -0.5])
+        b1 = self.rng.choice(self.B1_CHOICES)
+        q = self.rng.choice(self.Q_CHOICES)
         
         # Ensure values don't explode too much.
         if abs(q) > 2:
-            n = random.randint(3, 5)
+            n = self.rng.randint(3, 5)
         else:
-            n = random.randint(4, 7)
+            n = self.rng.randint(4, 7)
             
         b2 = b1 * q
         
         # Target
         bn = b1 * (q ** (n - 1))
-        
-        def fmt(num):
-             if isinstance(num, float) and num.is_integer():
-                 return str(int(num))
-             return str(round(num, 4)).replace('.', '{,}')
-             
-        question = f"У геометричній прогресії $(b_n)$ відомо, що $b_1 = {fmt(b1)}$, $b_2 = {fmt(b2)}$. Визначте $b_{{{n}}}$."
-        correct_ans = fmt(bn)
-        
-        distractors = set()
-        # 1. Arithmetic connection (d = b2 - b1)
-        d = b2 - b1
-        distractors.add(fmt(b1 + (n-1)*d))
-        
-        # 2. q error (inverse q?)
-        if q != 0:
-             distractors.add(fmt(b1 * ((1/q) ** (n - 1))))
-             
-        # 3. Off by one power
-        distractors.add(fmt(b1 * (q ** n)))
-        distractors.add(fmt(b1 * (q ** (n - 2))))
-        
-        # 4. Sign error
-        distractors.add(fmt(-bn))
-        
-        # Fill randoms
-        while len(distractors) < 4:
-            val = bn + random.choice([-1, 1, -10, 10, -0.5, 0.5])
-            distractors.add(fmt(val))
+        return self.make_task(*self._render(b1, b2, n, bn, self._wrong(b1, b2, q, n, bn)), bn)
 
-        distractors.discard(correct_ans)
-        
-        result = self.get_random_options(correct_ans, list(distractors)[:4])
-        
-        return {
-            "question": question,
-            "options": result["options"],
-            "correct_index": result["correct_index"],
-            "correct_letter": result["correct_letter"],
-            "raw_correct_value": bn
-        }
+    def generate_batch(self, n, seed=None, shard_id=0):
+        if seed is not None:
+            self.reseed(seed, shard_id)
+        rng = self.rng
+        count = n
+        b1s = rng.choices(self.B1_CHOICES, k=count)
+        qs = rng.choices(self.Q_CHOICES, k=count)
+        short = rng.choices(range(3, 6), k=count)
+        long_ = rng.choices(range(4, 8), k=count)
+        ns = [s if abs(q) > 2 else l for q, s, l in zip(qs, short, long_)]
+
+        b2s = [b1 * q for b1, q in zip(b1s, qs)]
+        bns = [b1 * (q ** (m - 1)) for b1, q, m in zip(b1s, qs, ns)]
+        wrongs = [self._wrong(*row) for row in zip(b1s, b2s, qs, ns, bns)]
+
+        return self.make_tasks(map(self._render, b1s, b2s, ns, bns, wrongs), bns)
 
 class GeometricRatioGenerator(MathTaskGenerator):
+    Q_CHOICES = [2, 3, 4, 0.5, 0.2, 5, 10]
+    B1_CHOICES = [2, 4, 5, 10, 32]
+
     def __init__(self):
         super().__init__()
         self.topic = "Geometric Progression: Term Ratio"
 
-    def generate(self):
-        # Task: Find b_5 / b_7
-        
-        k = random.randint(3, 8)
-        delta = random.randint(1, 3)
-        m = k + delta
-        
-        # Ratio b_k / b_m = b1*q^(k-1) / b1*q^(m-1) = 1 / q^delta
-        
-        q_options = [2, 3, 4, 0.5, 0.2, 5, 10]
-        q = random.choice(q_options)
-        
-        # Just to make the problem look real, give b1 and b2
-        b1 = random.choice([2, 4, 5, 10, 32])
-        b2 = b1 * q
-        
-        ans_val = 1 / (q ** delta)
-        
-        def fmt(num):
-             if isinstance(num, float) and num.is_integer():
-                 return str(int(num))
-             
-             # Format fractions if possible? Or decimals.
-             # If ans is 1/4 -> 0,25
-             if abs(num - 0.5) < 0.001: return "0{,}5"
-             if abs(num - 0.25) < 0.001: return "0{,}25"
-             if abs(num - 0.125) < 0.001: return "0{,}125"
-             
-             return str(round(num, 4)).replace('.', '{,}')
+    @staticmethod
+    def _fmt(num):
+        if isinstance(num, float) and num.is_integer():
+            return str(int(num))
+        
+        # Format fractions if possible? Or decimals.
+        # If ans is 1/4 -> 0,25
+        if abs(num - 0.5) < 0.001: return "0{,}5"
+        if abs(num - 0.25) < 0.001: return "0{,}25"
+        if abs(num - 0.125) < 0.001: return "0{,}125"
+        
+        return str(round(num, 4)).replace('.', '{,}')
 
+    def _render(self, b1, b2, k, m, q, delta, ans_val):
+        fmt = self._fmt
         question = f"У геометричній прогресії $(b_n)$ відомо, що $b_1 = {fmt(b1)}$, $b_2 = {fmt(b2)}$. Обчисліть $\\dfrac{{b_{{{k}}}}}{{b_{{{m}}}}}$."
         
         correct_ans = fmt(ans_val)
@@ -116,14 +125,41 @@ class GeometricRatioGenerator(MathTaskGenerator):
         # Arithmetic difference
         distractors.append(fmt(b1 * q**(k-1) - b1 * q**(m-1)))
 
-        result = self.get_random_options(correct_ans, distractors)
-        return {
-            "question": question,
-            "options": result["options"],
-            "correct_index": result["correct_index"],
-            "correct_letter": result["correct_letter"],
-            "raw_correct_value": ans_val
-        }
+        return question, correct_ans, distractors
+
+    def capacity(self):
+        return 6 * 3 * len(self.Q_CHOICES) * len(self.B1_CHOICES)
+
+    def generate(self):
+        # Task: Find b_5 / b_7
+        
+        k = self.rng.randint(3, 8)
+        delta = self.rng.randint(1, 3)
+        m = k + delta
+        
+        # Ratio b_k / b_m = b1*q^(k-1) / b1*q^(m-1) = 1 / q^delta
+        
+        q = self.rng.choice(self.Q_CHOICES)
+        
+        # Just to make the problem look real, give b1 and b2
+        b1 = self.rng.choice(self.B1_CHOICES)
+        b2 = b1 * q
+        
+        ans_val = 1 / (q ** delta)
+        return self.make_task(*self._render(b1, b2, k, m, q, delta, ans_val), ans_val)
+
+    def generate_batch(self, n, seed=None, shard_id=0):
+        if seed is not None:
+            self.reseed(seed, shard_id)
+        rng = self.rng
+        ks = rng.choices(range(3, 9), k=n)
+        deltas = rng.choices(range(1, 4), k=n)
+        ms = [k + delta for k, delta in zip(ks, deltas)]
+        qs = rng.choices(self.Q_CHOICES, k=n)
+        b1s = rng.choices(self.B1_CHOICES, k=n)
+        b2s = [b1 * q for b1, q in zip(b1s, qs)]
+        answers = [1 / (q ** delta) for q, delta in zip(qs, deltas)]
+        return self.make_tasks(map(self._render, b1s, b2s, ks, ms, qs, deltas, answers), answers)
 
 class GeometricFormulaGenerator(MathTaskGenerator):
     def __init__(self):
@@ -133,17 +169,17 @@ class GeometricFormulaGenerator(MathTaskGenerator):
     def generate(self):
         # Task: b_n = A * q^n. Find b_k.
         
-        A = random.choice([1, 2, 3, 4, 5, 0.5, 0.8])
-        base = random.choice([2, 3, 4])
+        A = self.rng.choice([1, 2, 3, 4, 5, 0.5, 0.8])
+        base = self.rng.choice([2, 3, 4])
         
         # Formula types:
         # 1. A * base^n
         # 2. A * base^(n-k)
         # 3. (-1)^n / n (Not strictly GP but sequence, found in DB)
         
-        type = random.choice(['standard', 'offset', 'sequence'])
+        type = self.rng.choice(['standard', 'offset', 'sequence'])
         
-        k = random.randint(3, 6)
+        k = self.rng.randint(3, 6)
         
         def fmt(num):
              if isinstance(num, float) and num.is_integer():
@@ -153,7 +189,7 @@ class GeometricFormulaGenerator(MathTaskGenerator):
         if type == 'standard':
             # b_n = A * base^n + C*n (linear term distractor from DB?)
             # DB example: 0.8 * 2^n + 3n
-            linear_coeff = random.choice([0, 1, 2, 3])
+            linear_coeff = self.rng.choice([0, 1, 2, 3])
             
             formula = f"{fmt(A)} \\cdot {base}^n"
             if linear_coeff != 0:
@@ -164,13 +200,13 @@ class GeometricFormulaGenerator(MathTaskGenerator):
             
         elif type == 'offset':
             # 5 * 2^(n-3)
-            offset = random.randint(1, 4)
+            offset = self.rng.randint(1, 4)
             val = A * (base ** (k - offset))
             question = f"Геометричну прогресію задано формулою $n$-го члена $b_n = {fmt(A)} \\cdot {base}^{{n-{offset}}}$. Визначте {k}-й член цієї прогресії."
             
         else: # sequence (-1)^n * n etc
             # (-1)^n * n  or (-1)^n / n
-            op = random.choice(['mult', 'div'])
+            op = self.rng.choice(['mult', 'div'])
             if op == 'mult':
                  val = ((-1)**k) * k
                  question = f"Послідовність задано формулою $n$-го члена $b_n = (-1)^n \\cdot n$. Визначте {k}-й член цієї послідовності."
@@ -181,10 +217,10 @@ class GeometricFormulaGenerator(MathTaskGenerator):
         correct_ans = fmt(val)
         distractors = set([fmt(val + 1), fmt(val - 1), fmt(-val), fmt(val * 2)])
         while len(distractors) < 4:
-            distractors.add(fmt(val + random.randint(2, 10)))
+            distractors.add(fmt(val + self.rng.randint(2, 10)))
         distractors.discard(correct_ans)
         
-        result = self.get_random_options(correct_ans, list(distractors)[:4])
+        result = self.get_random_options(correct_ans, self.pick_distractors(distractors))
         return {
             "question": question,
             "options": result["options"],
@@ -194,29 +230,29 @@ class GeometricFormulaGenerator(MathTaskGenerator):
         }
 
 class GeometricSumGenerator(MathTaskGenerator):
+    N_CHOICES = [3, 4, 5]
+    Q_CHOICES = [2, 3, -2, -3, 0.5]
+    B2_CHOICES = [4, 6, 8, 12, 18, -4, -6]
+
     def __init__(self):
         super().__init__()
         self.topic = "Geometric Progression: Sum"
 
-    def generate(self):
-        # Task: S_4 given b_2 and q
-        
-        n = random.choice([3, 4, 5])
-        q = random.choice([2, 3, -2, -3, 0.5])
-        b2 = random.choice([4, 6, 8, 12, 18, -4, -6])
-        b1 = b2 / q
-        
+    @staticmethod
+    def _fmt(num):
+        if isinstance(num, float) and num.is_integer():
+            return str(int(num))
+        return str(round(num, 3)).replace('.', '{,}')
+
+    @staticmethod
+    def _total(b1, q, n):
         # S_n = b1 * (1 - q^n) / (1 - q)
-        if q == 1: 
-             total = b1 * n
-        else:
-             total = b1 * (1 - q**n) / (1 - q)
-             
-        def fmt(num):
-             if isinstance(num, float) and num.is_integer():
-                 return str(int(num))
-             return str(round(num, 3)).replace('.', '{,}')
-             
+        if q == 1:
+            return b1 * n
+        return b1 * (1 - q**n) / (1 - q)
+
+    def _render(self, n, q, b1, b2, total):
+        fmt = self._fmt
         question = f"Знайдіть суму {n} перших членів геометричної прогресії $(b_n)$, у якої $b_2 = {fmt(b2)}$, а знаменник $q = {fmt(q)}$."
         correct_ans = fmt(total)
         
@@ -233,21 +269,39 @@ class GeometricSumGenerator(MathTaskGenerator):
         attempts = 0
         while len(distractors) < 4 and attempts < 20:
             attempts += 1
-            val = total + random.randint(-50, 50)
+            val = total + self.rng.randint(-50, 50)
             if val != total:
                 distractors.add(fmt(val))
             
         # Ensure we don't have the correct answer in distractors
         distractors.discard(correct_ans)
             
-        result = self.get_random_options(correct_ans, list(distractors)[:4])
-        return {
-            "question": question,
-            "options": result["options"],
-            "correct_index": result["correct_index"],
-            "correct_letter": result["correct_letter"],
-            "raw_correct_value": total
-        }
+        return question, correct_ans, self.pick_distractors(distractors)
+
+    def capacity(self):
+        return len(self.N_CHOICES) * len(self.Q_CHOICES) * len(self.B2_CHOICES)
+
+    def generate(self):
+        # Task: S_4 given b_2 and q
+        
+        n = self.rng.choice(self.N_CHOICES)
+        q = self.rng.choice(self.Q_CHOICES)
+        b2 = self.rng.choice(self.B2_CHOICES)
+        b1 = b2 / q
+        
+        total = self._total(b1, q, n)
+        return self.make_task(*self._render(n, q, b1, b2, total), total)
+
+    def generate_batch(self, n, seed=None, shard_id=0):
+        if seed is not None:
+            self.reseed(seed, shard_id)
+        rng = self.rng
+        ns = rng.choices(self.N_CHOICES, k=n)
+        qs = rng.choices(self.Q_CHOICES, k=n)
+        b2s = rng.choices(self.B2_CHOICES, k=n)
+        b1s = [b2 / q for b2, q in zip(b2s, qs)]
+        totals = [self._total(b1, q, m) for b1, q, m in zip(b1s, qs, ns)]
+        return self.make_tasks(map(self._render, ns, qs, b1s, b2s, totals), totals)
 
 class GeometricWordProblemGenerator(MathTaskGenerator):
     def __init__(self):
@@ -258,10 +312,10 @@ class GeometricWordProblemGenerator(MathTaskGenerator):
         # Scenario: Virus/Views/Bacteria growth.
         # "Day 1 = A. Each day doubles. When > Limit?"
         
-        start_val = random.choice([10, 50, 100, 5])
+        start_val = self.rng.choice([10, 50, 100, 5])
         multiplier = 2
         
-        limit = random.choice([1000, 2000, 5000, 500])
+        limit = self.rng.choice([1000, 2000, 5000, 500])
         if limit < start_val * 4: limit = start_val * 8
         
         # Find n such that start * 2^(n-1) > limit? 
@@ -288,7 +342,7 @@ class GeometricWordProblemGenerator(MathTaskGenerator):
             ("Бактерія ділиться", "колонія налічувала", "бактерій"),
             ("Інвестор вклав гроші", "прибуток склав", "доларів")
         ]
-        sc = random.choice(scenarios)
+        sc = self.rng.choice(scenarios)
         
         question = f"{sc[0]}. Першого дня {sc[1]} {start_val} {sc[2]}. Кожного наступного дня кількість збільшувалася вдвічі. За яку \\textit{{найменшу}} кількість днів сумарна кількість {sc[2]} перевищить {limit}?"
         
@@ -1,5 +1,5 @@
-import random
 import math
+import itertools
 from generators.base import MathTaskGenerator
 
 class LogEquationGenerator(MathTaskGenerator):
@@ -11,9 +11,9 @@ class LogEquationGenerator(MathTaskGenerator):
         # Task: log_a (kx + m) = c
         # Smart Distractors: Square, Inverse, Arithmetic
         
-        base = random.choice([2, 3, 4, 5, 0.5, 0.2])
-        c = random.choice([1, 2, 3, -1, -2])
-        k = random.choice([1, 2, -1, -2])
+        base = self.rng.choice([2, 3, 4, 5, 0.5, 0.2])
+        c = self.rng.choice([1, 2, 3, -1, -2])
+        k = self.rng.choice([1, 2, -1, -2])
         
         # Calculate RHS value: base^c
         rhs = base ** c
@@ -21,7 +21,7 @@ class LogEquationGenerator(MathTaskGenerator):
         # We need x to be nice. 
         # kx + m = rhs => kx = rhs - m
         # Let's pick integer x first, then find m
-        x = random.randint(-5, 10)
+        x = self.rng.randint(-5, 10)
         # Avoid 0 if needed, but log domain matters.
         if rhs - k*x <= 0:
              # Adjust x to ensure argument is positive initially 
@@ -41,13 +41,13 @@ class LogEquationGenerator(MathTaskGenerator):
              pass
 
         # Simplification: Let's stick to integer arguments for now or simple decimals
-        if random.random() < 0.5:
+        if self.rng.random() < 0.5:
              # Integer base
-             base = random.choice([2, 3, 5])
-             c = random.randint(1, 4)
+             base = self.rng.choice([2, 3, 5])
+             c = self.rng.randint(1, 4)
              val_pow = base ** c
-             k = random.choice([1, 2])
-             m = random.randint(-10, 10)
+             k = self.rng.choice([1, 2])
+             m = self.rng.randint(-10, 10)
              # equation: log_base (kx + m) = c
              # kx + m = val_pow => kx = val_pow - m
              # Make sure (val_pow - m) is divisible by k
@@ -59,16 +59,16 @@ class LogEquationGenerator(MathTaskGenerator):
         else:
              # Fraction base or negative power
              base_opts = [(2, -1), (2, -2), (3, -1), (5, -1), (0.5, -1), (0.2, -1)]
-             b_idx, c_val = random.choice(base_opts)
+             b_idx, c_val = self.rng.choice(base_opts)
              base = b_idx
              c = c_val 
-             if base == 0.5: c = random.choice([-1, -2, -3])
+             if base == 0.5: c = self.rng.choice([-1, -2, -3])
              
              val_pow = base ** c 
              # e.g 2^-1 = 0.5. 0.5^-2 = 4.
              
              k = 1
-             m = random.randint(-5, 5)
+             m = self.rng.randint(-5, 5)
              x_corr = val_pow - m
              
              # Format floats
@@ -114,11 +114,11 @@ class LogEquationGenerator(MathTaskGenerator):
         
         # Fill random
         while len(distractors) < 4:
-            distractors.add(fmt(x_corr + random.choice([1, -1, 2, -2, 10, -10])))
+            distractors.add(fmt(x_corr + self.rng.choice([1, -1, 2, -2, 10, -10])))
             
         distractors.discard(correct_ans)
         
-        result = self.get_random_options(correct_ans, list(distractors)[:4])
+        result = self.get_random_options(correct_ans, self.pick_distractors(distractors))
         return {
             "question": question,
             "options": result["options"],
@@ -128,20 +128,28 @@ class LogEquationGenerator(MathTaskGenerator):
         }
 
 class LogInequalityGenerator(MathTaskGenerator):
+    BASES = [2, 5, 0.5, 0.2, 0.3] # Mixed bases
+    SIGNS = [">", "<", "\\geqslant", "\\leqslant"]
+
     def __init__(self):
         super().__init__()
         self.topic = "Logarithms: Inequality"
 
+    def parameter_space(self):
+        return list(itertools.product(self.BASES, range(1, 4), self.SIGNS))
+
     def generate(self):
         # Task: log_a x > b.
         # KEY LOGIC: If a < 1, sign flips! This is the #1 NMT trap.
-        
-        base = random.choice([2, 5, 0.5, 0.2, 0.3]) # Mixed bases
+        base = self.rng.choice(self.BASES)
+        b = self.rng.randint(1, 3)
+        sign = self.rng.choice(self.SIGNS)
+        return self.generate_from((base, b, sign))
+
+    def generate_from(self, params):
+        base, b, sign = params
         is_fraction = base < 1
         
-        b = random.randint(1, 3)
-        sign = random.choice([">", "<", "\\geqslant", "\\leqslant"])
-        
         # Question: log_a x [sign] b
         
         val = base ** b
@@ -226,10 +234,10 @@ class LogInequalityGenerator(MathTaskGenerator):
 
         # Fill random intervals
         while len(distractors) < 4:
-            distractors.add(f"({random.randint(-5,5)}; {random.randint(6, 10)})")
+            distractors.add(f"({self.rng.randint(-5,5)}; {self.rng.randint(6, 10)})")
 
         distractors.discard(correct_ans)
-        result = self.get_random_options(correct_ans, list(distractors)[:4])
+        result = self.get_random_options(correct_ans, self.pick_distractors(distractors))
         
         return {
             "question": question,
@@ -240,23 +248,28 @@ class LogInequalityGenerator(MathTaskGenerator):
         }
 
 class LogValueGenerator(MathTaskGenerator):
+    # Pairs (base, value, ans)
+    PAIRS = [
+        (2, 4, 2), (2, 8, 3), (2, 16, 4), (2, 32, 5), (2, 0.5, -1), (2, 0.25, -2),
+        (3, 9, 2), (3, 27, 3), (3, 81, 4), (3, 1/3, -1),
+        (5, 25, 2), (5, 125, 3), (5, 0.2, -1),
+        (0.5, 4, -2), (0.5, 2, -1), (0.2, 25, -2)
+    ]
+
     def __init__(self):
         super().__init__()
         self.topic = "Logarithms: Evaluate Value"
+
+    def parameter_space(self):
+        return list(self.PAIRS)
         
     def generate(self):
         # Task: Evaluate log_a b
         # Distractors: Inverse, Square
-        
-        # Pairs (base, value, ans)
-        pairs = [
-            (2, 4, 2), (2, 8, 3), (2, 16, 4), (2, 32, 5), (2, 0.5, -1), (2, 0.25, -2),
-            (3, 9, 2), (3, 27, 3), (3, 81, 4), (3, 1/3, -1),
-            (5, 25, 2), (5, 125, 3), (5, 0.2, -1),
-            (0.5, 4, -2), (0.5, 2, -1), (0.2, 25, -2)
-        ]
-        
-        base, val, ans = random.choice(pairs)
+        return self.generate_from(self.rng.choice(self.PAIRS))
+
+    def generate_from(self, params):
+        base, val, ans = params
         
         def fmt(num):
              if isinstance(num, float):
@@ -288,7 +301,7 @@ class LogValueGenerator(MathTaskGenerator):
         distractors.add(fmt(ans-1))
         
         distractors.discard(correct_ans)
-        result = self.get_random_options(correct_ans, list(distractors)[:4])
+        result = self.get_random_options(correct_ans, self.pick_distractors(distractors))
         
         return {
             "question": question,
@@ -1,76 +1,110 @@
-import random
+import math
 from generators.base import MathTaskGenerator
+from generators.options import neighbours
 
 class MatchingTaskGenerator(MathTaskGenerator):
     """
-    Adapter that runs a sub-generator 3 times to create a matching task (3 questions -> 5 options).
+    Adapter that runs a sub-generator to create a matching task:
+    items questions (3 or 4) -> 5 options.
     """
-    def __init__(self, sub_generator_class, topic_name=None):
+    NUM_OPTIONS = 5
+    # Sub-tasks are drawn in batches of BATCH_FACTOR * items until items of them have
+    # distinct answers; after MAX_BATCHES batches the sub-generator is taken to have too few
+    BATCH_FACTOR = 2
+    MAX_BATCHES = 20
+
+    def __init__(self, sub_generator_class, topic_name=None, items=3):
         super().__init__()
+        if items not in (3, 4):
+            raise ValueError(f"items must be 3 or 4 (the answer grid layouts), got {items}")
+        self.items = items
         self.sub_gen = sub_generator_class()
+        self.sub_gen.rng = self.rng
         self.topic = topic_name if topic_name else f"Matching: {self.sub_gen.topic}"
 
+    @property
+    def generator_id(self):
+        arity = f"x{self.items}" if self.items != 3 else ""
+        return f"{type(self).__name__}[{self.sub_gen.generator_id}]{arity}"
+
+    def reseed(self, master_seed, shard_id=0):
+        super().reseed(master_seed, shard_id)
+        # Sub-tasks are drawn from the same stream as the matching task itself
+        self.sub_gen.rng = self.rng
+        return self
+
+    def capacity(self):
+        """
+        Distinct sets of items sub-tasks with different correct answers, which is
+        what generate() deduplicates on: C(distinct rendered answers, items) when
+        the sub-generator enumerates its parameters. Otherwise C(sub capacity, items),
+        an upper bound, since many parameter combinations render the same answer.
+        """
+        answers = self.sub_gen.distinct_answers()
+        if answers is not None:
+            return math.comb(answers, self.items)
+        sub = self.sub_gen.capacity()
+        return math.comb(sub, self.items) if sub is not None else None
+
+    def capacity_is_upper_bound(self):
+        return self.sub_gen.parameter_space() is None and self.sub_gen.capacity() is not None
+
+    @staticmethod
+    def _answer(task):
+        return task["options"][task["correct_index"]]
+
     def generate(self):
-        # 1. Generate 3 distinct sub-tasks
-        tasks = []
-        attempts = 0
-        while len(tasks) < 3 and attempts < 10:
-            t = self.sub_gen.generate()
-            # Simple dedup strategy: check raw values
-            if not any(x["raw_correct_value"] == t["raw_correct_value"] for x in tasks):
-                tasks.append(t)
-            attempts += 1
-            
-        # If we failed to get 3 unique, just duplicate (fallback)
-        while len(tasks) < 3:
-            tasks.append(self.sub_gen.generate())
+        # 1. Draw sub-tasks in batches; keep the first task for every distinct correct option.
+        # raw_correct_value is 0 for many generators, so the rendered option is the key.
+        chosen = {}
+        drawn = []
+        for _ in range(self.MAX_BATCHES):
+            batch = self.sub_gen.generate_batch(self.BATCH_FACTOR * self.items)
+            drawn.extend(batch)
+            for t in batch:
+                chosen.setdefault(self._answer(t), t)
+            if len(chosen) >= self.items:
+                break
+        if len(chosen) < self.items:
+            # Repeating a sub-task would put the same question twice into one task
+            raise ValueError(f"{self.generator_id}: {len(chosen)} distinct answers in {len(drawn)} sub-tasks, "
+                             f"{self.items} needed")
+        tasks = list(chosen.values())[:self.items]
 
         # 2. Collect Questions and Correct Answers
         questions = [t["question"] for t in tasks]
         correct_vals = [t["raw_correct_value"] for t in tasks] # raw values (numbers/strings)
-        correct_strs = [t["correct_letter"] for t in tasks] # Wait, standard generator returns letter from its own 5 options. 
-        # We need the ACTUAL correct answer string (the value).
-        
-        # We need to extract the CORRECT option string from the sub-task.
-        # The sub-task result has 'options' (list of 5) and 'correct_index'.
-        real_answers = [t["options"][t["correct_index"]] for t in tasks]
-        
-        # 3. Create Pool of Options (3 Correct + 2 Distractors)
-        # We need 2 extra distractors that are NOT equal to any correct answer.
-        # We can pick distractors from the sub-tasks themselves!
-        candidate_distractors = set()
-        for t in tasks:
-            for opt in t["options"]:
-                if opt not in real_answers:
-                    candidate_distractors.add(opt)
-                    
-        # If not enough, generate more using sub-gen
-        while len(candidate_distractors) < 2:
-            extra = self.sub_gen.generate()
-            for opt in extra["options"]:
-                if opt not in real_answers:
-                    candidate_distractors.add(opt)
-                    
-        # Select 2 distractors
-        final_distractors = list(candidate_distractors)
-        random.shuffle(final_distractors)
-        final_distractors = final_distractors[:2]
-        
+        real_answers = [self._answer(t) for t in tasks]
+        answer_set = set(real_answers)
+
+        # 3. Distractors: options of the drawn sub-tasks that are not correct answers
+        needed = self.NUM_OPTIONS - len(answer_set)
+        candidates = list(dict.fromkeys(
+            opt for t in drawn for opt in t["options"] if opt not in answer_set
+        ))
+        if len(candidates) < needed:
+            extra = [n for n in neighbours(real_answers[0]) if n not in answer_set and n not in candidates]
+            self.option_stats["filler"] += min(needed - len(candidates), len(extra))
+            candidates += extra
+        # Last resort: small integers
+        fallback = 1
+        while len(candidates) < needed:
+            if str(fallback) not in answer_set and str(fallback) not in candidates:
+                candidates.append(str(fallback))
+                self.option_stats["fallback"] += 1
+            fallback += 1
+        final_distractors = self.rng.sample(candidates, needed)
+
         # 4. Final Options List (5 items)
-        all_options = real_answers + final_distractors
-        random.shuffle(all_options)
-        
+        all_options = list(dict.fromkeys(real_answers)) + final_distractors
+        self.rng.shuffle(all_options)
+
         # 5. Determine new mapping
-        # We need to know which letter (A-D) corresponds to Question 1, 2, 3
-        # mapping: index 0 (Q1) -> Letter X
-        
-        mapping = {}
-        for i, ans in enumerate(real_answers):
-            # Find index in all_options
-            idx = all_options.index(ans)
-            letter = ["А", "Б", "В", "Г", "Д"][idx]
-            mapping[i+1] = letter
-            
+        # mapping: question number -> letter of its answer
+        letters = ["А", "Б", "В", "Г", "Д"]
+        position = {opt: i for i, opt in enumerate(all_options)}
+        mapping = {i + 1: letters[position[ans]] for i, ans in enumerate(real_answers)}
+
         return {
             "type": "matching",
             "questions": questions,
@@ -0,0 +1,161 @@
+import re
+from fractions import Fraction
+
+# Numbers as generators print them: -3, 2{,}5, 0,25, 1.5
+NUMBER = re.compile(r"-?\d+(?:(?:\{,\}|[.,])\d+)?")
+SEPARATOR = re.compile(r"\{,\}|[.,]")
+FRAC = re.compile(r"^(\$?)(-?)\\frac\{(\d+)\}\{(\d+)\}(\$?)$")
+INTERVAL = re.compile(r"^([(\[])\s*(-\\infty|-?\d+(?:(?:\{,\}|[.,])\d+)?)\s*;\s*(\+\\infty|-?\d+(?:(?:\{,\}|[.,])\d+)?)\s*([)\]])$")
+
+# Offsets tried around a numeric answer, nearest first
+OFFSETS = [1, -1, 2, -2, 3, -3, 5, -5, 10, -10]
+
+# Trigonometric functions in LaTeX answers: \sin \alpha, \tg x, \arccos ...
+TRIG = re.compile(r"\\(arcsin|arccos|arcctg|arctg|sin|cos|ctg|tg|tan|cot)(?![a-zA-Z])")
+# Mixing up the paired function (sin/cos, tg/ctg)
+TRIG_SWAP = {"sin": "cos", "cos": "sin", "tg": "ctg", "ctg": "tg", "tan": "cot", "cot": "tan",
+             "arcsin": "arccos", "arccos": "arcsin", "arctg": "arcctg", "arcctg": "arctg"}
+# Mixing up sin/cos with tg/ctg
+TRIG_CROSS = {"sin": "tg", "cos": "ctg", "tg": "sin", "ctg": "cos", "tan": "sin", "cot": "cos"}
+# Period of a series of solutions: \pi k, 2\pi k or \frac{\pi k}{2}
+PERIOD = re.compile(r"(?<![\d}])(?:2\\pi ([kn])|\\pi ([kn])|\\frac\{\\pi ([kn])\}\{2\})(?![a-zA-Z])")
+PERIODS = ["2\\pi {}", "\\pi {}", "\\frac{{\\pi {}}}{{2}}"]
+
+def render_option(value):
+    """
+    Turns a typed candidate into option text: int -> "3", Fraction -> "\\frac{1}{3}"
+    (or an integer), float -> "2{,}5". Strings are LaTeX already and kept as is.
+    """
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, Fraction):
+        if value.denominator == 1:
+            return str(value.numerator)
+        sign = "-" if value < 0 else ""
+        return f"{sign}\\frac{{{abs(value.numerator)}}}{{{value.denominator}}}"
+    if isinstance(value, float):
+        if value.is_integer():
+            return str(int(value))
+        return str(round(value, 4)).replace(".", "{,}")
+    return str(value)
+
+def parse_number(text):
+    """Exact value of a number in generator notation, or None."""
+    if not NUMBER.fullmatch(text):
+        return None
+    return Fraction(text.replace("{,}", ".").replace(",", "."))
+
+def format_number(value, like):
+    """Formats value with the decimal separator and precision of the number text like."""
+    parts = SEPARATOR.split(like)
+    if len(parts) == 1:
+        return str(round(value))
+    separator = SEPARATOR.search(like).group()
+    return f"{float(value):.{len(parts[1])}f}".replace(".", separator)
+
+def classify(text):
+    """Kind of an option: "int", "fraction" (decimal or \\frac), "interval" or "latex"."""
+    if NUMBER.fullmatch(text):
+        return "fraction" if SEPARATOR.search(text) else "int"
+    if FRAC.match(text):
+        return "fraction"
+    if INTERVAL.match(text):
+        return "interval"
+    return "latex"
+
+def _shift(number_text, offset):
+    return format_number(parse_number(number_text) + offset, number_text)
+
+def _numeric_neighbours(text):
+    value = parse_number(text)
+    result = [_shift(text, offset) for offset in OFFSETS]
+    if value != 0:
+        result.insert(0, format_number(-value, text))
+    return result
+
+def _frac_neighbours(match):
+    open_, sign, p, q, close = match.groups()
+    p, q = int(p), int(q)
+    flipped = "" if sign else "-"
+    fracs = [(flipped, p, q), (sign, q, p), (sign, p + 1, q), (sign, p, q + 1)]
+    if p > 1:
+        fracs.append((sign, p - 1, q))
+    if q > 2:
+        fracs.append((sign, p, q - 1))
+    result = []
+    for s, a, b in fracs:
+        if b == 1:
+            result.append(f"{open_}{s}{a}{close}")
+        else:
+            result.append(f"{open_}{s}\\frac{{{a}}}{{{b}}}{close}")
+    return result
+
+def _interval_neighbours(match):
+    left, low, high, right = match.groups()
+    other = {"(": "[", "[": "(", ")": "]", "]": ")"}
+    low_finite = "infty" not in low
+    high_finite = "infty" not in high
+    result = []
+    # Bracket errors on finite ends
+    if low_finite:
+        result.append(f"{other[left]}{low}; {high}{right}")
+    if high_finite:
+        result.append(f"{left}{low}; {high}{other[right]}")
+    # Wrong endpoint value; bounded intervals move as a whole
+    for offset in OFFSETS:
+        new_low = _shift(low, offset) if low_finite else low
+        new_high = _shift(high, offset) if high_finite else high
+        result.append(f"{left}{new_low}; {new_high}{right}")
+    return result
+
+def _negate(text):
+    """Sign error on the whole expression, inside $...$ if it is wrapped."""
+    body = text[1:-1] if len(text) > 1 and text.startswith("$") and text.endswith("$") else None
+    if body is not None:
+        return f"${body[1:]}$" if body.startswith("-") else f"$-{body}$"
+    return text[1:] if text.startswith("-") else f"-{text}"
+
+def _structural_neighbours(text):
+    """Same expression with a mixed-up function (and its sign error) or series period."""
+    result = []
+    for mapping in (TRIG_SWAP, TRIG_CROSS):
+        swapped = TRIG.sub(lambda m: "\\" + mapping.get(m.group(1), m.group(1)), text)
+        if swapped != text:
+            result += [swapped, _negate(swapped)]
+    # The other periods, the nearer (2\pi k <-> \pi k) first
+    m = PERIOD.search(text)
+    if m:
+        current = m.lastindex - 1
+        for i in sorted(range(len(PERIODS)), key=lambda i: (abs(i - current), i)):
+            if i != current:
+                result.append(text[:m.start()] + PERIODS[i].format(m.group(m.lastindex)) + text[m.end():])
+    return result
+
+def _latex_neighbours(text):
+    result = []
+    # Perturb the last number in the expression
+    numbers = list(NUMBER.finditer(text))
+    if numbers:
+        last = numbers[-1]
+        for offset in OFFSETS:
+            result.append(text[:last.start()] + _shift(last.group(), offset) + text[last.end():])
+    result.append(_negate(text))
+    # Expressions without numbers would otherwise fall back to plain integers
+    result += _structural_neighbours(text)
+    return result
+
+def neighbours(correct):
+    """
+    Finite list of plausible wrong answers of the same kind as correct,
+    nearest first. Used to fill options when a generator runs short.
+    """
+    kind = classify(correct)
+    if kind == "int" or (kind == "fraction" and NUMBER.fullmatch(correct)):
+        return _numeric_neighbours(correct)
+    if kind == "fraction":
+        return _frac_neighbours(FRAC.match(correct))
+    if kind == "interval":
+        return _interval_neighbours(INTERVAL.match(correct))
+    return _latex_neighbours(correct)
@@ -1,4 +1,3 @@
-import random
 from generators.base import MathTaskGenerator
 
 class PolynomialSimplificationGenerator(MathTaskGenerator):
@@ -12,9 +11,9 @@ class PolynomialSimplificationGenerator(MathTaskGenerator):
         # Logic: Combine like terms.
         
         # Random coefficients
-        A = random.randint(-10, 10)
-        B = random.randint(-10, 10)
-        C = random.randint(-10, 10)
+        A = self.rng.randint(-10, 10)
+        B = self.rng.randint(-10, 10)
+        C = self.rng.randint(-10, 10)
         
         # Avoid 0 to keep it interesting
         if A == 0: A = 2
@@ -1,37 +1,45 @@
-import random
 import math
+import itertools
 from generators.base import MathTaskGenerator
 
 class TrigValueGenerator(MathTaskGenerator):
+    # Angles in degrees and their reference
+    # (angle, ref_angle, name, value_sin, value_cos)
+    # We'll use strings for values to keep latex pretty
+    
+    # Common values: 30, 45, 60, etc.
+    # But we want > 90 to test signs.
+    ANGLES = [
+        (120, 60, "\\frac{2\\pi}{3}"),
+        (135, 45, "\\frac{3\\pi}{4}"),
+        (150, 30, "\\frac{5\\pi}{6}"),
+        (210, 30, "\\frac{7\\pi}{6}"),
+        (225, 45, "\\frac{5\\pi}{4}"),
+        (240, 60, "\\frac{4\\pi}{3}"),
+        (300, 60, "\\frac{5\\pi}{3}"),
+        (315, 45, "\\frac{7\\pi}{4}"),
+        (330, 30, "\\frac{11\\pi}{6}")
+    ]
+    FUNCS = ["sin", "cos", "tg"]
+
     def __init__(self):
         super().__init__()
         self.topic = "Trigonometry: Values"
 
+    def parameter_space(self):
+        # 9 angles x 3 functions x (degrees | radians)
+        return list(itertools.product(self.ANGLES, self.FUNCS, (True, False)))
+
     def generate(self):
         # Task: Calculate simple trig value, e.g. cos(210), sin(4pi/3)
         # Smart Distractors: SignFlip (wrong quadrant), ValueSwap (1/2 vs sqrt3/2)
-        
-        # Angles in degrees and their reference
-        # (angle, ref_angle, name, value_sin, value_cos)
-        # We'll use strings for values to keep latex pretty
-        
-        # Common values: 30, 45, 60, etc.
-        # But we want > 90 to test signs.
-        
-        angles = [
-            (120, 60, "\\frac{2\\pi}{3}"),
-            (135, 45, "\\frac{3\\pi}{4}"),
-            (150, 30, "\\frac{5\\pi}{6}"),
-            (210, 30, "\\frac{7\\pi}{6}"),
-            (225, 45, "\\frac{5\\pi}{4}"),
-            (240, 60, "\\frac{4\\pi}{3}"),
-            (300, 60, "\\frac{5\\pi}{3}"),
-            (315, 45, "\\frac{7\\pi}{4}"),
-            (330, 30, "\\frac{11\\pi}{6}")
-        ]
-        
-        angle_deg, ref_deg, angle_rad = random.choice(angles)
-        func = random.choice(["sin", "cos", "tg"])
+        angle = self.rng.choice(self.ANGLES)
+        func = self.rng.choice(self.FUNCS)
+        in_degrees = self.rng.random() < 0.5
+        return self.generate_from((angle, func, in_degrees))
+
+    def generate_from(self, params):
+        (angle_deg, ref_deg, angle_rad), func, in_degrees = params
         
         # Values map
         vals = {
@@ -68,7 +76,7 @@ class TrigValueGenerator(MathTaskGenerator):
             val_raw = -val_raw
             
         # Question
-        q_angle = f"{angle_deg}^\\circ" if random.random() < 0.5 else angle_rad
+        q_angle = f"{angle_deg}^\\circ" if in_degrees else angle_rad
         func_tex = "\\tan" if func == "tg" else f"\\{func}"
         question = f"Обчисліть значення виразу ${func_tex} {q_angle}$."
         
@@ -103,7 +111,7 @@ class TrigValueGenerator(MathTaskGenerator):
             distractors.add(d)
             
         distractors.discard(correct_ans)
-        result = self.get_random_options(correct_ans, list(distractors)[:4])
+        result = self.get_random_options(correct_ans, self.pick_distractors(distractors))
         
         return {
             "question": question,
@@ -114,23 +122,29 @@ class TrigValueGenerator(MathTaskGenerator):
         }
 
 class TrigReductionGenerator(MathTaskGenerator):
+    BASES = [
+        ("\\pi", 180, "same"),
+        ("2\\pi", 360, "same"),
+        ("\\frac{\\pi}{2}", 90, "co"),
+        ("\\frac{3\\pi}{2}", 270, "co")
+    ]
+
     def __init__(self):
         super().__init__()
         self.topic = "Trigonometry: Reduction Formulas"
 
+    def parameter_space(self):
+        return list(itertools.product(["-", "+"], self.BASES, ["sin", "cos"]))
+
     def generate(self):
         # Task: Simplify cos(pi - alpha) or sin(270 + alpha)
-        
-        bases = [
-            ("\\pi", 180, "same"),
-            ("2\\pi", 360, "same"),
-            ("\\frac{\\pi}{2}", 90, "co"),
-            ("\\frac{3\\pi}{2}", 270, "co")
-        ]
-        
-        op = random.choice(["-", "+"])
-        base_tex, base_deg, behavior = random.choice(bases)
-        func = random.choice(["sin", "cos"])
+        op = self.rng.choice(["-", "+"])
+        base = self.rng.choice(self.BASES)
+        func = self.rng.choice(["sin", "cos"])
+        return self.generate_from((op, base, func))
+
+    def generate_from(self, params):
+        op, (base_tex, base_deg, behavior), func = params
         
         # Question: func(base op alpha)
         # Determine Quadrant
@@ -176,7 +190,7 @@ class TrigReductionGenerator(MathTaskGenerator):
         # Distractor 3: Constant? rare but possible
         
         distractors.discard(correct_ans)
-        result = self.get_random_options(correct_ans, list(distractors)[:4])
+        result = self.get_random_options(correct_ans, self.pick_distractors(distractors))
         
         return {
             "question": question,
@@ -187,29 +201,34 @@ class TrigReductionGenerator(MathTaskGenerator):
         }
 
 class TrigEquationGenerator(MathTaskGenerator):
+    VAL_MAP = [
+        (0, "0", "sin", "\\pi k", "cos", "\\frac{\\pi}{2} + \\pi k"),
+        (1, "1", "sin", "\\frac{\\pi}{2} + 2\\pi k", "cos", "2\\pi k"),
+        (-1, "-1", "sin", "-\\frac{\\pi}{2} + 2\\pi k", "cos", "\\pi + 2\\pi k"),
+        (0.5, "\\frac{1}{2}", "sin", "(-1)^k \\frac{\\pi}{6} + \\pi k", "cos", "\\pm \\frac{\\pi}{3} + 2\\pi k"),
+        (-0.5, "-\\frac{1}{2}", "sin", "(-1)^k (-\\frac{\\pi}{6}) + \\pi k", "cos", "\\pm \\frac{2\\pi}{3} + 2\\pi k") # Note: sin usually written with k+1? Or -pi/6
+    ]
+
     def __init__(self):
         super().__init__()
         self.topic = "Trigonometry: Equations"
 
+    def parameter_space(self):
+        return list(itertools.product(["sin", "cos"], self.VAL_MAP))
+
     def generate(self):
         # Task: Solve cos x = a
         # Smart Distractors: Wrong period (pi vs 2pi), wrong arc value
         
         # Case: cos x = 1/2
-        equation_type = random.choice(["sin", "cos"])
-        
-        val_map = [
-            (0, "0", "sin", "\\pi k", "cos", "\\frac{\\pi}{2} + \\pi k"),
-            (1, "1", "sin", "\\frac{\\pi}{2} + 2\\pi k", "cos", "2\\pi k"),
-            (-1, "-1", "sin", "-\\frac{\\pi}{2} + 2\\pi k", "cos", "\\pi + 2\\pi k"),
-            (0.5, "\\frac{1}{2}", "sin", "(-1)^k \\frac{\\pi}{6} + \\pi k", "cos", "\\pm \\frac{\\pi}{3} + 2\\pi k"),
-            (-0.5, "-\\frac{1}{2}", "sin", "(-1)^k (-\\frac{\\pi}{6}) + \\pi k", "cos", "\\pm \\frac{2\\pi}{3} + 2\\pi k") # Note: sin usually written with k+1? Or -pi/6
-        ]
+        equation_type = self.rng.choice(["sin", "cos"])
         
         # Let's stick to simple 0, 1, -1 for now to avoid extensive formula formatting logic
         # Or simple 1/2
-        
-        val_num, val_str, s_rule, s_ans, c_rule, c_ans = random.choice(val_map)
+        return self.generate_from((equation_type, self.rng.choice(self.VAL_MAP)))
+
+    def generate_from(self, params):
+        equation_type, (val_num, val_str, s_rule, s_ans, c_rule, c_ans) = params
         
         correct_ans = s_ans if equation_type == "sin" else c_ans
         question = f"Розв'яжіть рівняння $\\{equation_type} x = {val_str}$."
@@ -246,7 +265,7 @@ class TrigEquationGenerator(MathTaskGenerator):
         correct_ans = f"${correct_ans}$"
         
         distractors.discard(correct_ans)
-        result = self.get_random_options(correct_ans, list(distractors)[:4])
+        result = self.get_random_options(correct_ans, self.pick_distractors(distractors))
         
         return {
             "question": question,
@@ -0,0 +1,79 @@
+import os
+import re
+import hashlib
+from array import array
+
+def normalize_text(text):
+    """Collapses whitespace and drops the \\nmtyear{...} marker so that a task
+    compares equal whether it comes from a generator or from a parsed .tex file."""
+    text = re.sub(r'\\nmtyear\s*\{[^}]*\}', '', str(text))
+    return re.sub(r'\s+', ' ', text).strip()
+
+def task_key(task):
+    """
+    64-bit content hash of a task's normalized question(s); matching items are
+    sorted. Options are left out: generators fill them with random distractors,
+    so the same question published with other fillers must still match.
+    Generated tasks (raw LaTeX) and tasks parsed from .tex files (whose text
+    latex_parser.clean_latex_text() has already trimmed) normalize to the same
+    string, so both sides of the index use one key.
+    With 10^6 stored keys the chance of any false match is about 3e-8.
+    """
+    if task.get("type") == "matching":
+        questions = sorted(normalize_text(q) for q in task["questions"])
+    else:
+        questions = [normalize_text(task["question"])]
+    payload = "\x1e".join(questions)
+    return int.from_bytes(hashlib.blake2b(payload.encode("utf-8"), digest_size=8).digest(), "big")
+
+class TaskIndex:
+    """
+    Persistent set of task keys.
+    Keys live in memory as a set (O(1) membership) and on disk as an
+    append-only file of unsigned 64-bit integers, so loading 10^6 keys
+    is a single array read and save() only writes the keys added since.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.keys = set()
+        self.pending = array("Q")
+        if path and os.path.exists(path):
+            stored = array("Q")
+            with open(path, "rb") as f:
+                stored.frombytes(f.read())
+            self.keys.update(stored)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, task):
+        return task_key(task) in self.keys
+
+    def add_key(self, key):
+        """Adds a precomputed key. Returns False if it was already present."""
+        if key in self.keys:
+            return False
+        self.keys.add(key)
+        self.pending.append(key)
+        return True
+
+    def add(self, task):
+        """Adds a task. Returns False if an identical task is already indexed."""
+        return self.add_key(task_key(task))
+
+    def filter_new(self, tasks):
+        """Yields only tasks not seen before (in the index or earlier in tasks), indexing them."""
+        for task in tasks:
+            if self.add(task):
+                yield task
+
+    def save(self):
+        """Appends keys added since the last save to the index file."""
+        if not self.path or not self.pending:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "ab") as f:
+            self.pending.tofile(f)
+        self.pending = array("Q")
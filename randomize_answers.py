@@ -9,6 +9,8 @@ import random
 import os
 import sys
 
+from scripts.workspace import WORKSPACE_DIR, load_catalog
+
 def shuffle_answer_table(match):
     """Перемішує відповіді в \answerTable{...}{...}{...}{...}{...}"""
     # Отримуємо всі 5 відповідей
@@ -124,7 +126,7 @@ def process_file(filepath):
 
 def main():
     # Базова директорія
-    base_dir = "/Users/markiyankharchuk/Desktop/НМТ_по_темах_латех"
+    base_dir = WORKSPACE_DIR
 
     if len(sys.argv) > 1:
         base_dir = sys.argv[1]
@@ -136,16 +138,14 @@ def main():
     files_processed = 0
     files_changed = 0
 
-    for root, dirs, files in os.walk(base_dir):
-        for file in files:
-            if file == "завдання.tex":
-                filepath = os.path.join(root, file)
-                rel_path = os.path.relpath(filepath, base_dir)
-                print(f"\n📄 {rel_path}")
+    for rel_path in load_catalog(base_dir).task_files():
+        if os.path.basename(rel_path) == "завдання.tex":
+            filepath = os.path.join(base_dir, rel_path)
+            print(f"\n📄 {rel_path}")
 
-                if process_file(filepath):
-                    files_changed += 1
-                files_processed += 1
+            if process_file(filepath):
+                files_changed += 1
+            files_processed += 1
 
     print("\n" + "=" * 60)
     print(f"📊 Оброблено файлів: {files_processed}")
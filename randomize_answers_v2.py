@@ -4,141 +4,36 @@
 Версія 2: правильно обробляє вкладені дужки та складні LaTeX вирази.
 """
 
-import re
 import random
 import os
-import sys
-
-def extract_braced_args(text, start_pos, num_args=5):
-    """
-    Витягує num_args аргументів у фігурних дужках, починаючи з позиції start_pos.
-    Правильно обробляє вкладені дужки.
-    Повертає (список_аргументів, кінцева_позиція) або (None, start_pos) якщо не вдалося.
-    """
-    args = []
-    pos = start_pos
-
-    for _ in range(num_args):
-        # Пропускаємо пробіли
-        while pos < len(text) and text[pos] in ' \t\n':
-            pos += 1
-
-        if pos >= len(text) or text[pos] != '{':
-            return None, start_pos
-
-        # Знаходимо закриваючу дужку з урахуванням вкладеності
-        depth = 0
-        arg_start = pos + 1
-        while pos < len(text):
-            if text[pos] == '{':
-                depth += 1
-            elif text[pos] == '}':
-                depth -= 1
-                if depth == 0:
-                    args.append(text[arg_start:pos])
-                    pos += 1
-                    break
-            pos += 1
-        else:
-            return None, start_pos
-
-    return args, pos
-
-def shuffle_answers_in_content(content):
-    """
-    Знаходить всі виклики answerTable* та перемішує відповіді.
-    """
-    # Патерни команд
-    commands = ['\\answerTableBig', '\\answerTableTall', '\\answerTableSmall', '\\answerTable']
-
-    changes = 0
-    result = content
-
-    for cmd in commands:
-        new_result = ""
-        i = 0
-        while i < len(result):
-            # Шукаємо команду
-            idx = result.find(cmd, i)
-            if idx == -1:
-                new_result += result[i:]
-                break
-
-            # Перевіряємо, що це саме ця команда, а не частина іншої
-            # (наприклад, \answerTable не повинна захоплювати \answerTableBig)
-            is_exact = True
-            if cmd == '\\answerTable':
-                # Перевіряємо, чи немає далі Big/Tall/Small
-                suffix_start = idx + len(cmd)
-                if suffix_start < len(result):
-                    next_char = result[suffix_start]
-                    if next_char.isalpha():
-                        is_exact = False
-
-            if not is_exact:
-                new_result += result[i:idx + len(cmd)]
-                i = idx + len(cmd)
-                continue
-
-            # Додаємо все до команди
-            new_result += result[i:idx]
-
-            # Витягуємо 5 аргументів
-            args, end_pos = extract_braced_args(result, idx + len(cmd), 5)
-
-            if args is None or len(args) != 5:
-                # Не вдалося розпарсити, залишаємо як є
-                new_result += result[idx:idx + len(cmd)]
-                i = idx + len(cmd)
-                continue
-
-            # Перемішуємо відповіді
-            random.shuffle(args)
-            changes += 1
-
-            # Формуємо нову команду
-            new_cmd = cmd + ''.join(f'{{{a}}}' for a in args)
-            new_result += new_cmd
-
-            i = end_pos
-
-        result = new_result
-
-    return result, changes
-
-def process_file(filepath):
-    """Обробляє один файл"""
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except Exception as e:
-        print(f"  ❌ Помилка читання: {e}")
-        return False, 0
-
-    new_content, changes = shuffle_answers_in_content(content)
-
-    if changes > 0:
-        try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(new_content)
-            print(f"  ✅ Перемішано {changes} таблиць відповідей")
-            return True, changes
-        except Exception as e:
-            print(f"  ❌ Помилка запису: {e}")
-            return False, 0
-    else:
-        print(f"  ℹ️  Таблиць answerTable не знайдено")
-        return False, 0
-
-def main():
-    # Базова директорія
-    base_dir = "/Users/markiyankharchuk/Desktop/НМТ_по_темах_латех"
-
-    if len(sys.argv) > 1:
-        base_dir = sys.argv[1]
+import argparse
+
+from generators.base import derive_seed
+from scripts.answer_tables import write_atomic, manifest_entry
+from scripts.randomize_with_answers import shuffle_files, deferred_interrupt
+from scripts.shuffle_manifest import load_manifest, new_manifest, save_manifest, manifest_path
+from scripts.workspace import WORKSPACE_DIR, load_catalog
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Рандомізація відповідей у файлах завдань НМТ")
+    parser.add_argument("base_dir", nargs="?", default=WORKSPACE_DIR,
+                        help="Базова директорія з темами (за замовчуванням - поточна)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed для відтворюваного перемішування (за замовчуванням - випадковий)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Кількість процесів для перемішування (за замовчуванням - кількість ядер)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    base_dir = args.base_dir
+
+    # Без --seed обираємо випадковий, але друкуємо його, щоб запуск можна було повторити
+    seed = args.seed if args.seed is not None else random.SystemRandom().randrange(2**32)
 
     print(f"🔀 Рандомізація відповідей у файлах завдань НМТ")
     print(f"📁 Директорія: {base_dir}")
+    print(f"🎲 Seed: {seed}")
     print("=" * 60)
 
     # Знаходимо всі файли завдання.tex
@@ -146,18 +41,52 @@ def main():
     files_changed = 0
     total_tables = 0
 
-    for root, dirs, files in os.walk(base_dir):
-        for file in files:
-            if file == "завдання.tex":
-                filepath = os.path.join(root, file)
-                rel_path = os.path.relpath(filepath, base_dir)
+    # Файли з каталогу тем у фіксованому порядку, щоб вивід не залежав від файлової системи
+    catalog = load_catalog(base_dir)
+    paths = [os.path.join(base_dir, rel_path) for rel_path in sorted(catalog.task_files())
+             if os.path.basename(rel_path) == "завдання.tex"]
+
+    # Перемішування паралельне, запис - тут, по одному файлу; Ctrl+C
+    # зупиняє обробку між файлами, не залишаючи обрізаних файлів
+    # Маніфест спільний з randomize_with_answers: повторне перемішування рахується від оригіналу
+    manifest = load_manifest(base_dir) or new_manifest()
+    rel_paths = [os.path.relpath(filepath, base_dir) for filepath in paths]
+    jobs = [(filepath, random.Random(derive_seed(seed, "randomize_answers_v2", rel_path)), manifest["files"].get(rel_path))
+            for filepath, rel_path in zip(paths, rel_paths)]
+    with deferred_interrupt() as interrupted:
+        results = shuffle_files(jobs, args.jobs)
+        try:
+            for filepath, rel_path, (new_content, answers, record, error) in zip(paths, rel_paths, results):
+                if interrupted:
+                    break
                 print(f"\n📄 {rel_path}")
-
-                changed, tables = process_file(filepath)
-                if changed:
-                    files_changed += 1
-                    total_tables += tables
                 files_processed += 1
+                if error is not None:
+                    print(f"  ❌ {error}")
+                    continue
+                if not answers:
+                    print(f"  ℹ️  Таблиць answerTable не знайдено")
+                    continue
+                try:
+                    write_atomic(filepath, new_content)
+                except Exception as e:
+                    print(f"  ❌ Помилка запису: {e}")
+                    continue
+                manifest["files"][rel_path] = manifest_entry(rel_path.split(os.sep)[0], rel_path, record,
+                                                             script="randomize_answers_v2", seed=seed)
+                print(f"  ✅ Перемішано {len(answers)} таблиць відповідей")
+                files_changed += 1
+                total_tables += len(answers)
+        finally:
+            results.close()
+    if interrupted:
+        print(f"\n⚠️  Перервано після {files_processed} з {len(paths)} файлів")
+
+    try:
+        save_manifest(base_dir, manifest)
+        print(f"\n🧾 Збережено маніфест: {manifest_path(base_dir)}")
+    except Exception as e:
+        print(f"❌ Помилка збереження маніфесту: {e}")
 
     print("\n" + "=" * 60)
     print(f"📊 ПІДСУМОК:")
@@ -167,5 +96,4 @@ def main():
     print("\n💡 Тепер правильна відповідь розміщена випадково (А-Д)")
 
 if __name__ == "__main__":
-    random.seed()  # Випадковий seed для різних результатів
     main()
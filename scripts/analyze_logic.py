@@ -1,13 +1,17 @@
-import json
 import re
 import math
+import argparse
 from collections import Counter
 
+from scripts.task_store import iter_tasks
+
 DB_FILE = "nmt_database.json"
 
-def load_data():
-    with open(DB_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+def load_data(db_file=DB_FILE, topic=None, snapshot=False):
+    # Streams tasks from nmt_database.jsonl (or the JSON array, or a .sqlite database);
+    # snapshot=True loads the whole store from nmt_database.snapshot instead.
+    # Only multiple choice is analyzed
+    return iter_tasks(db_file, topic=topic, task_type="multiple_choice", snapshot=snapshot)
 
 def safe_float(s):
     try:
@@ -75,15 +79,23 @@ def analyze_task(task):
 
     return relations
 
-def main():
-    data = load_data()
-    print(f"Loaded {len(data)} tasks.")
-    
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Look for relations between the options of parsed tasks.")
+    parser.add_argument("--db", default=DB_FILE,
+                        help=f"Task database: .json, .jsonl or .sqlite (default: {DB_FILE})")
+    parser.add_argument("--topic", default=None, help="Only this topic (name or number)")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="Load the whole store from the cached snapshot (faster repeated runs, more memory)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     all_relations = []
     
     topic_distractors = {}
     
-    for task in data:
+    count = 0
+    for count, task in enumerate(load_data(args.db, args.topic, args.snapshot), 1):
         topic = task.get("topic", "Unknown")
         rels = analyze_task(task)
         if rels:
@@ -92,6 +104,8 @@ def main():
                 topic_distractors[topic] = []
             topic_distractors[topic].extend(rels)
             
+    print(f"Analyzed {count} multiple choice tasks.")
+
     # Stats
     print("\n--- Common Distractor Patterns (Global) ---")
     print(Counter(all_relations).most_common(10))
@@ -1,23 +1,24 @@
-import json
+import os
+import argparse
 from collections import defaultdict, Counter
 
-def analyze_structure():
-    try:
-        with open('nmt_database.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print("nmt_database.json not found.")
+from scripts.task_store import store_path, iter_tasks
+
+DB_FILE = "nmt_database.json"
+
+def analyze_structure(db_file=DB_FILE, snapshot=False):
+    if not os.path.exists(store_path(db_file)):
+        print(f"{db_file} not found.")
         return
 
     # Structure: topic -> type -> count
     stats = defaultdict(Counter)
 
-    for item in data:
+    # Streams the store; snapshot=True loads it whole from nmt_database.snapshot
+    for item in iter_tasks(db_file, snapshot=snapshot):
         # topics is a list, usually has 1 main topic or multiple
         # let's grab the first one for now, or all
-        topics = item.get('topics', [])
-        if not topics:
-            topics = ["Unknown"]
+        topics = item.get('topics') or [item.get('topic', "Unknown")]
         
         # Determine type
         # "choices" usually implies single choice (if 4 or 5 options)
@@ -25,7 +26,7 @@ def analyze_structure():
         # "short_answer" implies numerical
         
         t_type = "short_answer"
-        if item.get('choices'):
+        if item.get('choices') or item.get('options'):
             t_type = "single_choice"
         # How do we identify matching in the json? 
         # Usually checking if 'question' text has specific keywords or struct
@@ -54,4 +55,10 @@ def analyze_structure():
         print("-" * 70)
 
 if __name__ == "__main__":
-    analyze_structure()
+    parser = argparse.ArgumentParser(description="Count parsed tasks per topic and type.")
+    parser.add_argument("--db", default=DB_FILE,
+                        help=f"Task database: .json, .jsonl or .sqlite (default: {DB_FILE})")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="Load the whole store from the cached snapshot (faster repeated runs, more memory)")
+    args = parser.parse_args()
+    analyze_structure(args.db, args.snapshot)
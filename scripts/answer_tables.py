@@ -0,0 +1,167 @@
+"""
+Таблиці answerTable* і ключі відповідей: розбір тексту на сегменти,
+перестановки аргументів, мітки правильних відповідей, записи маніфесту
+і файли відповіді.tex. Спільне для randomize_with_answers.py,
+randomize_answers_v2.py, shuffle_manifest.py і generate_answers_files.py;
+сам модуль нічого з них не імпортує.
+"""
+
+import re
+import os
+import hashlib
+
+from scripts.latex_args import BraceIndex
+
+# Усі варіанти команди; (?![^\W\d_]) - далі не літера, тобто не частина довшої назви
+ANSWER_TABLE_PATTERN = re.compile(r'\\answerTable(?:Big|Tall|Small)?(?![^\W\d_])')
+LABELS = ['А', 'Б', 'В', 'Г', 'Д']
+
+def split_answer_tables(content):
+    """
+    Розбиває текст на сегменти: рядки (текст як є) і кортежі (команда, 5 аргументів)
+    для кожної таблиці answerTable*. Один прохід по тексту для всіх варіантів команди.
+    Перемішувати сегменти можна скільки завгодно разів без повторного розбору.
+    """
+    segments = []
+    # Пари дужок тексту: аргументи читаються без повторного сканування
+    braces = BraceIndex(content)
+    i = 0
+    for m in ANSWER_TABLE_PATTERN.finditer(content):
+        # Команда всередині аргументів попередньої таблиці вже скопійована разом з ними
+        if m.start() < i:
+            continue
+
+        # Витягуємо 5 аргументів
+        args, end_pos = braces.args(m.end(), 5)
+        if args is None:
+            # Не вдалося розпарсити, залишаємо як є
+            continue
+
+        segments.append(content[i:m.start()])
+        segments.append((m.group(), args))
+        i = end_pos
+
+    segments.append(content[i:])
+    return segments
+
+def apply_permutations(segments, permutations):
+    """Текст із сегментів split_answer_tables з аргументами таблиць у порядку permutations."""
+    parts = []
+    tables = iter(permutations)
+    for segment in segments:
+        if isinstance(segment, str):
+            parts.append(segment)
+            continue
+        command, args = segment
+        perm = next(tables)
+        parts.append(command + ''.join(f'{{{args[j]}}}' for j in perm))
+    return ''.join(parts)
+
+def answers_from_permutations(permutations):
+    """Мітки правильних відповідей: перший аргумент до перемішування - правильний."""
+    return [LABELS[perm.index(0)] for perm in permutations]
+
+def text_sha256(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def write_atomic(filepath, content):
+    """
+    Записує файл через тимчасовий файл поруч і os.replace: при збої чи Ctrl+C
+    на диску лишається або старий, або новий вміст, але не обрізаний.
+    """
+    tmp_path = filepath + ".tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def answers_tex_header(topic_name):
+    """Початок .tex файлу з відповідями (до першої відповіді)"""
+    return r"""\documentclass[12pt]{extarticle}
+\usepackage{fontspec}
+\usepackage{polyglossia}
+\setdefaultlanguage{ukrainian}
+
+\defaultfontfeatures{Ligatures=TeX}
+\setmainfont{Liberation Serif}
+
+\usepackage[a4paper,margin=2cm]{geometry}
+\usepackage{multicol}
+\usepackage{xcolor}
+
+\definecolor{headerblue}{RGB}{0, 102, 204}
+
+\begin{document}
+
+\begin{center}
+{\Large\textbf{\color{headerblue}ВІДПОВІДІ}}
+\end{center}
+
+\begin{center}
+{\large """ + f"Тема: {topic_name}" + r"""}
+\end{center}
+
+\vspace{0.5cm}
+
+\begin{multicols}{5}
+\noindent
+"""
+
+ANSWERS_TEX_FOOTER = r"""\end{multicols}
+
+\end{document}
+"""
+
+def generate_tex_answers(topic_name, answers):
+    """Генерує LaTeX код для відповідей"""
+    lines = [f"{i}. {ans}" for i, ans in enumerate(answers, 1)]
+    body = " \\\\\n".join(lines) + "\n" if lines else ""
+    return answers_tex_header(topic_name) + body + ANSWERS_TEX_FOOTER
+
+def topic_dir_of(rel_path):
+    """Відносна директорія теми файлу: "Тема" або "generated/Тема"."""
+    parts = rel_path.split(os.sep)[:-1]
+    if parts[:1] == ['generated']:
+        return os.path.join(*parts[:2])
+    return parts[0] if parts else ''
+
+def answer_key(rel_path):
+    """
+    Ключ файлу в answers_all.json: шлях відносно теки теми - зазвичай просто
+    ім'я файлу, але різний для двох завдання.tex у підтеках однієї теми.
+    """
+    topic_dir = topic_dir_of(rel_path)
+    return os.path.relpath(rel_path, topic_dir) if topic_dir else rel_path
+
+def manifest_entry(topic_name, rel_path, record, **fields):
+    """Запис файлу для shuffle_manifest.json: тема, ключ у answers_all.json і запис shuffle_segments."""
+    return {"topic": topic_name, "key": answer_key(rel_path), **fields, **record}
+
+def write_topic_answers(base_dir, entries, suffix=""):
+    """
+    Записує відповіді.tex (answers.tex для тем у generated/) у теку кожної теми.
+    entries - [(відносний шлях файлу, тема, відповіді)] у порядку файлів; теки
+    тем беруться з шляхів, тож однойменні теми в корені і в generated/ не змішуються.
+    Повертає [(шлях, помилка або None)].
+    """
+    by_dir = {}
+    for rel_path, topic_name, answers in entries:
+        topic_dir = topic_dir_of(rel_path)
+        by_dir.setdefault(topic_dir, (topic_name, []))[1].extend(answers)
+    results = []
+    for topic_dir, (topic_name, all_answers) in by_dir.items():
+        if not all_answers:
+            continue
+        name = 'answers.tex' if topic_dir.split(os.sep)[0] == 'generated' else 'відповіді.tex'
+        output_path = os.path.join(base_dir, topic_dir, name)
+        try:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            write_atomic(output_path, generate_tex_answers(topic_name + suffix, all_answers))
+            results.append((output_path, None))
+        except Exception as e:
+            results.append((output_path, str(e)))
+    return results
@@ -0,0 +1,186 @@
+"""
+Throughput and quality benchmark for every task generator.
+
+For each MathTaskGenerator subclass in generators/ (and every matching
+configuration used by generate_overleaf_doc.py) it reports tasks per second,
+the unique-task ratio after N tasks, how often get_random_options() had to
+invent options, and the distribution of the correct answer position.
+Results are saved as JSON together with the commit hash, so runs can be
+compared with --compare.
+
+    PYTHONPATH=. python3 scripts/benchmark_generators.py
+    PYTHONPATH=. python3 scripts/benchmark_generators.py --sizes 1000 10000 --only Log
+    PYTHONPATH=. python3 scripts/benchmark_generators.py --compare benchmarks/generators_<old>.json
+"""
+
+import sys
+import json
+import time
+import inspect
+import argparse
+import importlib
+import platform
+import pkgutil
+from collections import Counter
+
+import generators
+from generators.base import MathTaskGenerator
+from generators.matching import MatchingTaskGenerator
+from generators.uniqueness import task_key
+from scripts.benchmark_report import git_commit, default_report_path, save_report
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+BATCH_SIZE = 1000
+LETTERS = ["А", "Б", "В", "Г", "Д"]
+
+def discover_generators():
+    """
+    One instance of every concrete generator class in generators/, plus the
+    matching generators built by generate_overleaf_doc.topic_specs().
+    Sorted by generator_id.
+    """
+    found = {}
+    for module_info in pkgutil.iter_modules(generators.__path__):
+        module = importlib.import_module(f"generators.{module_info.name}")
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if (issubclass(cls, MathTaskGenerator) and cls.__module__ == module.__name__
+                    and not inspect.isabstract(cls) and cls is not MatchingTaskGenerator):
+                gen = cls()
+                found[gen.generator_id] = gen
+
+    from scripts.generate_overleaf_doc import topic_specs
+    for _, gens, _ in topic_specs():
+        for gen in gens:
+            if isinstance(gen, MatchingTaskGenerator):
+                found.setdefault(gen.generator_id, gen)
+    return [found[name] for name in sorted(found)]
+
+def option_stats(gen):
+    """get_random_options() counters of a generator (and of its sub-generator)."""
+    stats = Counter(gen.option_stats)
+    sub = getattr(gen, "sub_gen", None)
+    if sub is not None:
+        stats.update({f"sub_{k}": v for k, v in sub.option_stats.items()})
+    return stats
+
+def answer_positions(task):
+    """Indices (0-4) of the correct option(s) of a task; none for tasks without options."""
+    if task.get("type") == "matching":
+        return [LETTERS.index(letter) for letter in task["mapping"].values()]
+    if "correct_index" not in task:
+        return []
+    return [task["correct_index"]]
+
+def benchmark_generator(gen, sizes, seed):
+    """
+    Draws max(sizes) tasks in batches of BATCH_SIZE from a fixed stream.
+    Generation time is measured separately from the key hashing done for
+    the unique-task ratio.
+    """
+    gen.reseed(seed, "benchmark")
+    before = option_stats(gen)
+    checkpoints = sorted(sizes)
+    total = checkpoints[-1]
+
+    keys = set()
+    positions = Counter()
+    unique = {}
+    elapsed = 0.0
+    produced = 0
+    while produced < total:
+        count = min(BATCH_SIZE, total - produced)
+        start = time.perf_counter()
+        batch = gen.generate_batch(count)
+        elapsed += time.perf_counter() - start
+        for task in batch:
+            keys.add(task_key(task))
+            positions.update(answer_positions(task))
+            produced += 1
+            if produced in checkpoints:
+                unique[str(produced)] = round(len(keys) / produced, 4)
+
+    stats = option_stats(gen) - before
+    calls = stats.get("calls", 0)
+    return {
+        "topic": gen.topic,
+        "capacity": gen.capacity(),
+        "tasks": total,
+        "seconds": round(elapsed, 4),
+        "tasks_per_sec": round(total / elapsed, 1) if elapsed else None,
+        "unique_ratio": unique,
+        "option_stats": dict(sorted(stats.items())),
+        "filler_rate": round(stats.get("filler", 0) / calls, 4) if calls else None,
+        "fallback_rate": round(stats.get("fallback", 0) / calls, 4) if calls else None,
+        "correct_index": [positions.get(i, 0) for i in range(len(LETTERS))],
+    }
+
+def print_row(name, result, sizes):
+    ratios = " ".join(f"{result['unique_ratio'].get(str(n), 0):>7.3f}" for n in sizes)
+    positions = result["correct_index"]
+    # Most / least frequent answer position; 1.0 is perfectly uniform
+    spread = max(positions) / max(min(positions), 1) if any(positions) else 0.0
+    stats = result["option_stats"]
+    fills = f"{stats.get('filler', 0) + stats.get('sub_filler', 0)}/{stats.get('fallback', 0) + stats.get('sub_fallback', 0)}"
+    print(f"{result['tasks_per_sec'] or 0:>10.0f}  {ratios}  {fills:>13}  {spread:>6.2f}  {name}")
+
+def print_comparison(results, old_path):
+    """Tasks/s of this run relative to an earlier JSON report."""
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    print(f"\nCompared with {old_path} (commit {old.get('commit')}):")
+    for name, result in results["generators"].items():
+        before = old.get("generators", {}).get(name)
+        if not before or not before.get("tasks_per_sec") or not result["tasks_per_sec"]:
+            continue
+        ratio = result["tasks_per_sec"] / before["tasks_per_sec"]
+        print(f"{ratio:>7.2f}x  {before['tasks_per_sec']:>10.0f} -> {result['tasks_per_sec']:>10.0f}  {name}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the throughput and output quality of every task generator.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help=f"Task counts at which the unique ratio is reported (default: {' '.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Master seed; keep it fixed to compare commits (default: 0)")
+    parser.add_argument("--only", default=None, metavar="TEXT",
+                        help="Only benchmark generators whose id contains TEXT")
+    parser.add_argument("--output", default=None, metavar="PATH",
+                        help="JSON report path (default: benchmarks/generators_<commit>.json)")
+    parser.add_argument("--compare", default=None, metavar="PATH",
+                        help="Earlier JSON report to compare tasks/s against")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = sorted(set(args.sizes))
+    commit = git_commit()
+
+    gens = discover_generators()
+    if args.only:
+        gens = [gen for gen in gens if args.only in gen.generator_id]
+
+    print(f"Commit: {commit}  seed: {args.seed}  sizes: {sizes}")
+    header = " ".join(f"{'u@' + str(n):>7}" for n in sizes)
+    print(f"{'tasks/s':>10}  {header}  {'filler/fallbk':>13}  {'spread':>6}  generator")
+    results = {
+        "commit": commit,
+        "seed": args.seed,
+        "sizes": sizes,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "generators": {},
+    }
+    for gen in gens:
+        result = benchmark_generator(gen, sizes, args.seed)
+        results["generators"][gen.generator_id] = result
+        print_row(gen.generator_id, result, sizes)
+
+    output = args.output or default_report_path("generators", commit)
+    save_report(results, output)
+    print(f"\nSaved {output}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+if __name__ == "__main__":
+    sys.exit(main())
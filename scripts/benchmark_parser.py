@@ -0,0 +1,200 @@
+"""
+Throughput benchmark for latex_parser on synthetic corpora.
+
+Real tasks from the source archive (or directory) are used as templates and
+repeated until each corpus reaches 1, 10 and 100 MB (UTF-8). Besides the
+plain copies there are pathological variants:
+
+- nested:   every task starts with a balanced group nested NESTING_DEPTH deep
+- tikz:     every task ends with a TikZ picture of TIKZ_LINES \\draw lines
+- unclosed: every \\task/makebox question gets an extra "{" that never closes
+
+For each corpus it reports MB/s and the mean latency per task of
+parse_latex_content(), and the MB/s of clean_latex_text() on the whole
+corpus. Between two sizes of the same corpus the time should grow like the
+size; an exponent above SUPERLINEAR_EXPONENT is flagged. Results are saved
+as JSON with the commit hash and can be compared with --compare.
+
+    PYTHONPATH=. python3 scripts/benchmark_parser.py
+    PYTHONPATH=. python3 scripts/benchmark_parser.py --sizes 1 4 16 --only unclosed
+    PYTHONPATH=. python3 scripts/benchmark_parser.py --compare benchmarks/parser_<old>.json
+"""
+
+import os
+import sys
+import math
+import json
+import time
+import argparse
+import platform
+import contextlib
+
+from scripts.latex_lexer import tokenize
+from scripts.latex_parser import default_source, list_sources, read_source, parse_latex_content, clean_latex_text
+from scripts.benchmark_report import git_commit, default_report_path, save_report
+
+DEFAULT_SIZES = [1, 10, 100]
+MB = 1 << 20
+NESTING_DEPTH = 500
+TIKZ_LINES = 500
+# Time exponent between two sizes above which a corpus is flagged
+SUPERLINEAR_EXPONENT = 1.3
+
+def load_templates(source_dir):
+    """Every task of the sources as it appears in its file, from its start command to the next task."""
+    templates = []
+    for rel_path, _ in list_sources(source_dir):
+        content = read_source(source_dir, rel_path)
+        starts = tokenize(content).tasks
+        for task, following in zip(starts, starts[1:] + [None]):
+            end = following.start if following else len(content)
+            templates.append((task, content[task.start:end]))
+    return templates
+
+def nested(task, text):
+    group = "{" * NESTING_DEPTH + "x" + "}" * NESTING_DEPTH
+    offset = task.end - task.start
+    return text[:offset] + group + text[offset:]
+
+def with_tikz(task, text):
+    lines = "".join(f"\\draw ({i % 7},{i % 5}) -- ({i % 3},{i % 11}) node {{$A_{{{i}}}$}};\n" for i in range(TIKZ_LINES))
+    return text + "\\begin{tikzpicture}\n" + lines + "\\end{tikzpicture}\n"
+
+def unclosed(task, text):
+    if task.kind == "simple":
+        return text
+    offset = task.end - task.start
+    return text[:offset] + "{" + text[offset:]
+
+VARIANTS = {
+    "real": lambda task, text: text,
+    "nested": nested,
+    "tikz": with_tikz,
+    "unclosed": unclosed,
+}
+
+def build_corpus(templates, variant, size_mb):
+    """Variant copies of the templates, in order and repeated, up to size_mb megabytes."""
+    chunks = [VARIANTS[variant](task, text) for task, text in templates]
+    sizes = [len(chunk.encode("utf-8")) for chunk in chunks]
+    target = size_mb * MB
+    parts = []
+    total = 0
+    i = 0
+    while total < target:
+        parts.append(chunks[i % len(chunks)])
+        total += sizes[i % len(chunks)]
+        i += 1
+    return "".join(parts), total
+
+def measure(content, size_bytes):
+    # The parser reports unclosed tasks on stdout; keep that out of the table
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        tasks = parse_latex_content(content, "benchmark")
+        parse_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    clean_latex_text(content)
+    clean_seconds = time.perf_counter() - start
+    return {
+        "bytes": size_bytes,
+        "tasks": len(tasks),
+        "seconds": round(parse_seconds, 4),
+        "mb_per_sec": round(size_bytes / MB / parse_seconds, 3) if parse_seconds else None,
+        "us_per_task": round(parse_seconds / len(tasks) * 1e6, 1) if tasks else None,
+        "clean_mb_per_sec": round(size_bytes / MB / clean_seconds, 3) if clean_seconds else None,
+    }
+
+def growth_exponent(smaller, larger):
+    """log(time ratio) / log(size ratio) between two runs; 1.0 is linear."""
+    if not smaller["seconds"] or not larger["seconds"] or larger["bytes"] <= smaller["bytes"]:
+        return None
+    return math.log(larger["seconds"] / smaller["seconds"]) / math.log(larger["bytes"] / smaller["bytes"])
+
+def print_row(variant, size_mb, result):
+    exponent = result.get("exponent")
+    flag = "SUPERLINEAR" if result.get("superlinear") else ""
+    exponent_text = f"{exponent:>8.2f}" if exponent is not None else f"{'':>8}"
+    print(f"{variant:<9} {size_mb:>6} {result['tasks']:>8} {result['seconds']:>9.3f} {result['mb_per_sec'] or 0:>8.2f} "
+          f"{result['us_per_task'] or 0:>10.1f} {result['clean_mb_per_sec'] or 0:>9.1f} {exponent_text}  {flag}")
+
+def print_comparison(results, old_path):
+    """Parser MB/s of this run relative to an earlier JSON report."""
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    print(f"\nCompared with {old_path} (commit {old.get('commit')}):")
+    for variant, runs in results["corpora"].items():
+        for size, result in runs.items():
+            before = old.get("corpora", {}).get(variant, {}).get(size)
+            if not before or not before.get("mb_per_sec") or not result["mb_per_sec"]:
+                continue
+            ratio = result["mb_per_sec"] / before["mb_per_sec"]
+            print(f"{ratio:>7.2f}x  {before['mb_per_sec']:>8.2f} -> {result['mb_per_sec']:>8.2f} MB/s  {variant} {size} MB")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark latex_parser throughput on synthetic and pathological corpora.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help=f"Corpus sizes in MB (default: {' '.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument("--only", default=None, choices=sorted(VARIANTS),
+                        help="Only benchmark one corpus variant")
+    parser.add_argument("--source-dir", default=None,
+                        help="Directory or zip archive with the template tasks (default: as latex_parser)")
+    parser.add_argument("--time-limit", type=float, default=120.0,
+                        help="Skip larger sizes of a corpus once a run takes longer (default: 120 s)")
+    parser.add_argument("--output", default=None, metavar="PATH",
+                        help="JSON report path (default: benchmarks/parser_<commit>.json)")
+    parser.add_argument("--compare", default=None, metavar="PATH",
+                        help="Earlier JSON report to compare MB/s against")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = sorted(set(args.sizes))
+    variants = [args.only] if args.only else list(VARIANTS)
+    source_dir = args.source_dir or default_source()
+    commit = git_commit()
+
+    templates = load_templates(source_dir)
+    print(f"Commit: {commit}  templates: {len(templates)} tasks from {source_dir}  sizes: {sizes} MB")
+    print(f"{'corpus':<9} {'MB':>6} {'tasks':>8} {'seconds':>9} {'MB/s':>8} {'us/task':>10} {'clean MB/s':>9} {'exponent':>8}")
+    results = {
+        "commit": commit,
+        "sizes_mb": sizes,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "corpora": {},
+    }
+    flagged = []
+    for variant in variants:
+        runs = results["corpora"][variant] = {}
+        previous = None
+        for size_mb in sizes:
+            content, size_bytes = build_corpus(templates, variant, size_mb)
+            result = measure(content, size_bytes)
+            del content
+            exponent = growth_exponent(previous, result) if previous else None
+            if exponent is not None:
+                result["exponent"] = round(exponent, 3)
+                result["superlinear"] = exponent > SUPERLINEAR_EXPONENT
+                if result["superlinear"]:
+                    flagged.append(f"{variant} {size_mb} MB")
+            runs[str(size_mb)] = result
+            print_row(variant, size_mb, result)
+            previous = result
+            if result["seconds"] > args.time_limit:
+                print(f"{variant:<9} skipping larger sizes (over {args.time_limit:g} s)")
+                break
+
+    output = args.output or default_report_path("parser", commit)
+    save_report(results, output)
+    print(f"\nSaved {output}")
+    if flagged:
+        print(f"Superlinear (exponent > {SUPERLINEAR_EXPONENT}): {', '.join(flagged)}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+    return 1 if flagged else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""
+Helpers shared by benchmark_generators.py and benchmark_parser.py: the commit
+hash stored in every report and where reports are saved. Reports go to
+benchmarks/ (ignored by git) unless --output says otherwise.
+"""
+
+import os
+import json
+import subprocess
+
+REPORT_DIR = "benchmarks"
+
+def git_commit():
+    """Hash of the checked out commit, or None outside a git work tree."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+def default_report_path(kind, commit):
+    """benchmarks/<kind>_<short commit>.json"""
+    return os.path.join(REPORT_DIR, f"{kind}_{(commit or 'nogit')[:12]}.json")
+
+def save_report(results, output):
+    """Writes a report as indented JSON, creating its directory if needed."""
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
 """
 Скрипт для створення файлів відповідей на основі JSON.
+Якщо в base_dir є shuffle_manifest.json, відповіді беруться з нього
+(див. scripts/shuffle_manifest.py), інакше з answers_all.json.
+Теки тем шукаються в каталозі робочої теки (scripts/workspace.py).
 """
 
 import json
 import os
+import argparse
+
+from scripts.answer_tables import answers_from_permutations, topic_dir_of
+from scripts.shuffle_manifest import load_manifest
+from scripts.workspace import WORKSPACE_DIR, load_catalog
 
 def generate_tex_answers(topic_name, answers):
     """Генерує LaTeX код для відповідей"""
@@ -51,47 +59,66 @@ def generate_tex_answers(topic_name, answers):
 """
     return tex
 
-def main():
-    base_dir = "/Users/markiyankharchuk/Desktop/НМТ_по_темах_латех"
-    json_path = os.path.join(base_dir, 'answers_all.json')
-
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    # Список директорій
-    dirs = [d for d in os.listdir(base_dir) if os.path.isdir(os.path.join(base_dir, d))]
-
-    for topic_name, files in data.items():
-        # Збираємо всі відповіді
-        all_answers = []
-        for file_name, file_answers in files.items():
-            all_answers.extend(file_answers)
-
+def catalog_topic_dir(catalog, topic_name):
+    """
+    Тека теми з answers_all.json: тека з тією ж назвою в корені, інакше в generated/,
+    інакше тека в корені з тим самим номером; або None.
+    """
+    entry = catalog.topic(topic_name)
+    generated_dir = os.path.join('generated', topic_name)
+    if topic_name not in entry["source_dirs"] and generated_dir in entry["generated_dirs"]:
+        return generated_dir
+    return catalog.source_dir(topic_name)
+
+def topic_answers(base_dir, manifest):
+    """[(тека теми, тема, усі відповіді)] з маніфесту або answers_all.json."""
+    by_dir = {}
+    if manifest is not None:
+        # Тека теми - з шляху файлу в маніфесті
+        for rel_path, record in manifest["files"].items():
+            file_answers = answers_from_permutations(record["permutations"])
+            by_dir.setdefault(topic_dir_of(rel_path), (record["topic"], []))[1].extend(file_answers)
+    else:
+        json_path = os.path.join(base_dir, 'answers_all.json')
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        catalog = load_catalog(base_dir)
+        for topic_name, files in data.items():
+            topic_dir = catalog_topic_dir(catalog, topic_name)
+            if topic_dir is None:
+                continue
+            for file_answers in files.values():
+                by_dir.setdefault(topic_dir, (topic_name, []))[1].extend(file_answers)
+    return [(topic_dir, topic_name, all_answers) for topic_dir, (topic_name, all_answers) in by_dir.items()]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Створення файлів відповідей з маніфесту або answers_all.json")
+    parser.add_argument("base_dir", nargs="?", default=WORKSPACE_DIR,
+                        help="Базова директорія з темами (за замовчуванням - поточна)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    base_dir = args.base_dir
+    manifest = load_manifest(base_dir)
+
+    for topic_dir, topic_name, all_answers in topic_answers(base_dir, manifest):
         if not all_answers:
             continue
 
-        # Шукаємо директорію
-        topic_dir = None
-        for d in dirs:
-            if d == topic_name or d.startswith(topic_name.split('.')[0] + '.'):
-                full_path = os.path.join(base_dir, d)
-                if os.path.isdir(full_path) and d != 'generated':
-                    topic_dir = full_path
-                    break
-
-        if topic_dir:
-            # Перевіряємо, чи вже є файл
-            tex_path = os.path.join(topic_dir, 'відповіді.tex')
-            if not os.path.exists(tex_path):
-                tex_content = generate_tex_answers(topic_name, all_answers)
-                try:
-                    with open(tex_path, 'w', encoding='utf-8') as f:
-                        f.write(tex_content)
-                    print(f"✅ Створено: {tex_path}")
-                except Exception as e:
-                    print(f"❌ Помилка: {e}")
-            else:
-                print(f"ℹ️  Вже існує: {tex_path}")
+        # Перевіряємо, чи вже є файл
+        name = 'answers.tex' if topic_dir.split(os.sep)[0] == 'generated' else 'відповіді.tex'
+        tex_path = os.path.join(base_dir, topic_dir, name)
+        if not os.path.exists(tex_path):
+            tex_content = generate_tex_answers(topic_name, all_answers)
+            try:
+                with open(tex_path, 'w', encoding='utf-8') as f:
+                    f.write(tex_content)
+                print(f"✅ Створено: {tex_path}")
+            except Exception as e:
+                print(f"❌ Помилка: {e}")
+        else:
+            print(f"ℹ️  Вже існує: {tex_path}")
 
 if __name__ == "__main__":
     main()
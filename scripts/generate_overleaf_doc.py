@@ -1,5 +1,10 @@
 import os
+import json
 import random
+import argparse
+import copy
+import itertools
+from concurrent.futures import ProcessPoolExecutor
 from generators.arithmetic_progression import (
     ArithmeticFindDifferentGenerator,
     ArithmeticMemberDifferenceGenerator,
@@ -16,9 +21,22 @@ from generators.geometric_progression import (
     GeometricSumGenerator,
     GeometricWordProblemGenerator
 )
+from generators.logarithms import LogEquationGenerator, LogInequalityGenerator, LogValueGenerator
+from generators.trigonometry import TrigValueGenerator, TrigReductionGenerator, TrigEquationGenerator
+from generators.functions import FunctionShiftGenerator, FunctionDomainGenerator
+from generators.algebra import AlgebraSimplificationGenerator, AlgebraFractionGenerator, SymbolicLogGenerator
+from generators.matching import MatchingTaskGenerator
+from generators.uniqueness import TaskIndex, task_key
+from scripts.answer_tables import answers_tex_header, ANSWERS_TEX_FOOTER
 
 OUTPUT_FILE = "generated_tasks.tex"
 
+# Generate 20 examples per type (mix of single and matching)
+TASKS_PER_TYPE = 20
+
+# With a uniqueness index, a repeated task is redrawn up to this many times before it is accepted
+MAX_UNIQUE_ATTEMPTS = 20
+
 LATEX_HEADER = r"""\documentclass[14pt]{extarticle}
 \usepackage{fontspec}
 \usepackage{polyglossia}
@@ -76,6 +94,21 @@ LATEX_HEADER = r"""\documentclass[14pt]{extarticle}
     \endgroup
 }
 
+% Таблиця відповідей для відповідностей на 4 рядки
+\newcommand{\answerGridFour}{
+    \begingroup
+    \renewcommand{\arraystretch}{1.3} 
+    \setlength{\tabcolsep}{7pt} 
+    \begin{tabular}{r|c|c|c|c|c|}
+         \multicolumn{1}{c}{} & \multicolumn{1}{c}{\textbf{А}} & \multicolumn{1}{c}{\textbf{Б}} & \multicolumn{1}{c}{\textbf{В}} & \multicolumn{1}{c}{\textbf{Г}} & \multicolumn{1}{c}{\textbf{Д}} \\ \cline{2-6}
+         \textbf{1} & & & & & \\ \cline{2-6}
+         \textbf{2} & & & & & \\ \cline{2-6}
+         \textbf{3} & & & & & \\ \cline{2-6}
+         \textbf{4} & & & & & \\ \cline{2-6}
+    \end{tabular}
+    \endgroup
+}
+
 % Макет для завдань на відповідність
 \newcommand{\matchingLayout}[3]{
     \noindent
@@ -146,148 +179,452 @@ LATEX_FOOTER = r"""
 \end{document}
 """
 
-def generate_topic_doc(topic_name, generators, output_filename):
+def render_task(task, task_counter):
+    """Renders one generated task as a LaTeX fragment numbered task_counter."""
     content = ""
-    task_counter = 1
-    
-    # Header specific to topic? Or generic?
-    # Using generic header with specific title
-    header = LATEX_HEADER.replace("PLACEHOLDER_TOPIC", topic_name)
-    
-    for gen in generators:
-        content += f"% === {gen.topic} ===\n"
-        # Generate 10 examples per type for scale? Or keep 2 for now?
-        # User wants 5000 tasks eventually. Let's do 5 per type for now.
-        # Generate 20 examples per type (mix of single and matching)
-        for _ in range(20):
-            task = gen.generate()
-            
-            if task.get("type") == "matching":
-                # Layout for Matching Task
-                # 1. Questions Block
-                q_block = ""
-                for i, q in enumerate(task["questions"]):
-                    # Strip "Find..." text if verbose, but usually q is a math expression
-                    # The user layout has "1  expr", "2 expr"
-                    # clean up q: remove "Calculate" or "Solve" text? 
-                    # For now just dump it.
-                    # Usually generators return "Solve ..." text.
-                    # We might want to strip that for matching.
-                    # But let's just put it in.
-                    q_block += f"\\textbf{{{i+1}}} \\quad {q}\n\n\\vspace{{0.4cm}}\n\n"
-                
-                # 2. Options Block
-                o_block = ""
-                letters = ["А", "Б", "В", "Г", "Д"]
-                for i, opt in enumerate(task["options"]):
-                    o_block += f"\\textbf{{{letters[i]}}} \\quad {opt}\n\n\\vspace{{0.4cm}}\n\n"
-                
-                # 3. Grid Block
-                # We use standard \answerGrid command
-                grid_block = "\\answerGrid"
-                
-                content += f"\\noindent\\textbf{{{task_counter}.}} Установіть відповідність між виразом (1--3) та його значенням (А--Д). \\nmtyear{{2026}}\n\\vspace{{0.3cm}}\n\n"
-                content += f"\\matchingLayout{{\n\\textit{{Вираз}}\n\n{q_block}}}{{\n\\textit{{Значення}}\n\n{o_block}}}{{{grid_block}}}\n\n"
-                content += "\\vspace{0.8cm}\n\n"
-                
-            else:
-                # Standard Task
-                question = task["question"]
-                options = task["options"]
-                
-                content += f"\\noindent\\makebox[1.5em][l]{{\\textbf{{{task_counter}.}}}}\\parbox[t]{{\\dimexpr\\textwidth-1.5em}}{{{question} \\nmtyear{{2026}}}}\n\\vspace{{0.3cm}}\n\n"
-                
-                opts = task["options"]
-                # Use answerTableTall if options are fractions? Or standard? 
-                # Let's check length. If long, use Tall.
-                is_tall = any("frac" in str(o) for o in opts)
-                table_cmd = "answerTableTall" if is_tall else "answerTable"
-                
-                content += f"\\{table_cmd}{{{opts[0]}}}{{{opts[1]}}}{{{opts[2]}}}{{{opts[3]}}}{{{opts[4]}}}\n\n"
-                content += "\\vspace{0.5cm}\n\n"
-            
-            task_counter += 1
-
-    full_latex = header + content + LATEX_FOOTER
-    
-    # Ensure directory exists
-    os.makedirs(os.path.dirname(output_filename), exist_ok=True)
-    
-    with open(output_filename, "w", encoding="utf-8") as f:
-        f.write(full_latex)
-    
-    print(f"Generated {task_counter-1} tasks to {output_filename}")
-
-def generate_all():
-    # 1. Arithmetic
-    arithmetic_gens = [
-        ArithmeticFindDifferentGenerator(),
-        ArithmeticMemberDifferenceGenerator(),
-        ArithmeticSumGenerator(),
-        ArithmeticTermPropertiesGenerator(),
-        ArithmeticMiddleTermGenerator(),
-        ArithmeticFormulaSearchGenerator(),
-        ArithmeticWordProblemGenerator()
-    ]
-    generate_topic_doc("Арифметична прогресія", arithmetic_gens, "tex/arithmetic_progression.tex")
-    
-    # 2. Geometric
-    geometric_gens = [
-        GeometricFindTermGenerator(),
-        GeometricRatioGenerator(),
-        GeometricFormulaGenerator(),
-        GeometricSumGenerator(),
-        GeometricWordProblemGenerator()
-    ]
-    generate_topic_doc("Геометрична прогресія", geometric_gens, "tex/geometric_progression.tex")
-
-    # 3. Logarithms
-    from generators.logarithms import LogEquationGenerator, LogInequalityGenerator, LogValueGenerator
-    from generators.matching import MatchingTaskGenerator
-    
-    log_gens = [
-        LogValueGenerator(), # Single
-        MatchingTaskGenerator(LogValueGenerator), # Matching (3 items)
-        LogEquationGenerator(), # Single
-        LogInequalityGenerator(),
-        MatchingTaskGenerator(LogEquationGenerator) # Matching Equations? Why not.
-    ]
-    generate_topic_doc("Логарифмічні вирази та рівняння", log_gens, "tex/logarithms.tex")
-
-    # 4. Trigonometry
-
-    # 4. Trigonometry
-    from generators.trigonometry import TrigValueGenerator, TrigReductionGenerator, TrigEquationGenerator
-    trig_gens = [
-        TrigValueGenerator(),
-        MatchingTaskGenerator(TrigValueGenerator), # Matching Values
-        TrigReductionGenerator(),
-        MatchingTaskGenerator(TrigReductionGenerator), # Matching Reductions
-        TrigEquationGenerator()
-    ]
-    generate_topic_doc("Тригонометричні вирази та рівняння", trig_gens, "tex/trigonometry.tex")
-
-    # 5. Functions
-    from generators.functions import FunctionShiftGenerator, FunctionDomainGenerator
-    func_gens = [
-        FunctionShiftGenerator(),
-        MatchingTaskGenerator(FunctionShiftGenerator),
-        FunctionDomainGenerator(),
-        MatchingTaskGenerator(FunctionDomainGenerator)
+    if task.get("type") == "matching":
+        # Layout for Matching Task
+        # 1. Questions Block
+        q_block = ""
+        for i, q in enumerate(task["questions"]):
+            # Strip "Find..." text if verbose, but usually q is a math expression
+            # The user layout has "1  expr", "2 expr"
+            # clean up q: remove "Calculate" or "Solve" text? 
+            # For now just dump it.
+            # Usually generators return "Solve ..." text.
+            # We might want to strip that for matching.
+            # But let's just put it in.
+            q_block += f"\\textbf{{{i+1}}} \\quad {q}\n\n\\vspace{{0.4cm}}\n\n"
+        
+        # 2. Options Block
+        o_block = ""
+        letters = ["А", "Б", "В", "Г", "Д"]
+        for i, opt in enumerate(task["options"]):
+            o_block += f"\\textbf{{{letters[i]}}} \\quad {opt}\n\n\\vspace{{0.4cm}}\n\n"
+        
+        # 3. Grid Block
+        # \answerGrid has 3 rows, \answerGridFour has 4
+        items = len(task["questions"])
+        grid_block = "\\answerGridFour" if items == 4 else "\\answerGrid"
+        
+        content += f"\\noindent\\textbf{{{task_counter}.}} Установіть відповідність між виразом (1--{items}) та його значенням (А--Д). \\nmtyear{{2026}}\n\\vspace{{0.3cm}}\n\n"
+        content += f"\\matchingLayout{{\n\\textit{{Вираз}}\n\n{q_block}}}{{\n\\textit{{Значення}}\n\n{o_block}}}{{{grid_block}}}\n\n"
+        content += "\\vspace{0.8cm}\n\n"
+        
+    else:
+        # Standard Task
+        question = task["question"]
+        options = task["options"]
+        
+        content += f"\\noindent\\makebox[1.5em][l]{{\\textbf{{{task_counter}.}}}}\\parbox[t]{{\\dimexpr\\textwidth-1.5em}}{{{question} \\nmtyear{{2026}}}}\n\\vspace{{0.3cm}}\n\n"
+        
+        opts = task["options"]
+        # Use answerTableTall if options are fractions? Or standard? 
+        # Let's check length. If long, use Tall.
+        is_tall = any("frac" in str(o) for o in opts)
+        table_cmd = "answerTableTall" if is_tall else "answerTable"
+        
+        content += f"\\{table_cmd}{{{opts[0]}}}{{{opts[1]}}}{{{opts[2]}}}{{{opts[3]}}}{{{opts[4]}}}\n\n"
+        content += "\\vspace{0.5cm}\n\n"
+    return content
+
+_index_snapshots = {}
+
+def load_index_snapshot(index_path):
+    """
+    Read-only TaskIndex for index_path, loaded once per process and reloaded
+    only when the file has grown. Chunks check against this snapshot, so a
+    serial and a parallel build with the same seed make the same choices.
+    """
+    if index_path is None:
+        return None
+    size = os.path.getsize(index_path) if os.path.exists(index_path) else -1
+    cached = _index_snapshots.get(index_path)
+    if cached is None or cached[0] != size:
+        cached = (size, TaskIndex(index_path))
+        _index_snapshots[index_path] = cached
+    return cached[1]
+
+def chunk_entries(job):
+    """
+    Yields (task number, task, LaTeX fragment, key) for count tasks of one
+    generator, numbered from first_number, as they are produced.
+    The generator is reseeded from (seed, shard_id) first, so the chunk is the
+    same no matter which process renders it.
+    Tasks come from gen.iter_distinct(), so generators with an enumerated
+    parameter space do not repeat until it is exhausted.
+    With an index, tasks already in the on-disk snapshot or repeated within
+    the chunk are redrawn; key is None without an index. Repeats across chunks
+    of the same run are caught later by write_topic_doc().
+    """
+    gen, first_number, count, seed, shard_id, index_path = job
+    gen.reseed(seed, shard_id)
+    index = load_index_snapshot(index_path)
+    known = index.keys if index is not None else set()
+
+    seen = set()
+    tasks = gen.iter_distinct()
+    for number in range(first_number, first_number + count):
+        task = next(tasks)
+        key = None
+        if index is not None:
+            key = task_key(task)
+            attempts = 1
+            while (key in known or key in seen) and attempts < MAX_UNIQUE_ATTEMPTS:
+                task = next(tasks)
+                key = task_key(task)
+                attempts += 1
+            seen.add(key)
+        yield number, task, render_task(task, number), key
+
+def spare_tasks(job):
+    """
+    Endless stream of replacement tasks for one chunk job, drawn from its own
+    (seed, (shard_id, "spare")) stream by a copy of the generator, so the chunk
+    itself is not disturbed and serial and parallel builds draw the same spares.
+    """
+    gen, _, _, seed, shard_id, _ = job
+    spare = copy.deepcopy(gen)
+    spare.reseed(seed, (shard_id, "spare"))
+    return spare.iter_distinct()
+
+def stream_chunk(job):
+    """(section title, lazy entries) for one job; used by serial builds."""
+    return job[0].topic, chunk_entries(job)
+
+def render_chunk(job):
+    """(section title, entries) for one job, fully rendered. Runs inside the process pool."""
+    return job[0].topic, list(chunk_entries(job))
+
+def topic_jobs(topic_name, generators, seed, tasks_per_type=TASKS_PER_TYPE, index_path=None):
+    """One chunk job per generator; shard ids are fixed by topic and position."""
+    return [
+        (gen, 1 + i * tasks_per_type, tasks_per_type, seed, f"{topic_name}/{i}", index_path)
+        for i, gen in enumerate(generators)
     ]
-    generate_topic_doc("Функції та їх властивості", func_gens, "tex/functions.tex")
-
-    # 6. Symbolic Algebra (New)
-    from generators.algebra import AlgebraSimplificationGenerator, AlgebraFractionGenerator, SymbolicLogGenerator
-    alg_gens = [
-        AlgebraSimplificationGenerator(),
-        MatchingTaskGenerator(AlgebraSimplificationGenerator),
-        AlgebraFractionGenerator(),
-        MatchingTaskGenerator(AlgebraFractionGenerator),
-        SymbolicLogGenerator(),
-        MatchingTaskGenerator(SymbolicLogGenerator)
+
+class TexSink:
+    """
+    Writes the topic document: header on begin(), each task as soon as it
+    arrives, footer on end(). Nothing is kept in memory between tasks.
+
+    Every sink has the same four methods, so write_topic_doc() can feed
+    several outputs (document, answer key, ...) in one pass.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.f = None
+
+    def begin(self, topic_name):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.f = open(self.path, "w", encoding="utf-8")
+        self.f.write(LATEX_HEADER.replace("PLACEHOLDER_TOPIC", topic_name))
+
+    def section(self, title):
+        self.f.write(f"% === {title} ===\n")
+
+    def task(self, number, task, latex):
+        self.f.write(latex)
+
+    def end(self):
+        self.f.write(LATEX_FOOTER)
+        self.f.close()
+
+def task_answer(task):
+    """
+    (answer, value) for the key: the letter and text of the correct option, or
+    for a matching task "1-В, 2-А, 3-Д" and the options matched to each item.
+    """
+    if task.get("type") == "matching":
+        mapping = sorted(task["mapping"].items())
+        answer = ", ".join(f"{item}-{letter}" for item, letter in mapping)
+        letters = ["А", "Б", "В", "Г", "Д"]
+        return answer, [task["options"][letters.index(letter)] for _, letter in mapping]
+    return task["correct_letter"], task["options"][task["correct_index"]]
+
+class AnswerKeySink:
+    """
+    Writes the answer key of a topic document while the document itself is
+    written: a .tex sheet in the layout of randomize_with_answers.py and a JSON
+    file in the format of generated/answers/*.json. The .tex sheet is streamed
+    per task; the JSON entries (one short line each) are kept until end(),
+    because the task count comes before them, as in the committed files.
+    """
+    def __init__(self, tex_path, json_path):
+        self.tex_path = tex_path
+        self.json_path = json_path
+        self.count = 0
+
+    def begin(self, topic_name):
+        for path in (self.tex_path, self.json_path):
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self.count = 0
+        self.tex = open(self.tex_path, "w", encoding="utf-8")
+        self.tex.write(answers_tex_header(topic_name))
+        self.topic_name = topic_name
+        self.entries = []
+
+    def section(self, title):
+        pass
+
+    def task(self, number, task, latex):
+        answer, value = task_answer(task)
+        separator = " \\\\\n" if self.count else ""
+        self.tex.write(f"{separator}{number}. {answer}")
+        entry = {"номер": number, "відповідь": answer, "значення": value}
+        self.entries.append(json.dumps(entry, ensure_ascii=False))
+        self.count += 1
+
+    def end(self):
+        self.tex.write(("\n" if self.count else "") + ANSWERS_TEX_FOOTER)
+        self.tex.close()
+        with open(self.json_path, "w", encoding="utf-8") as f:
+            f.write(f'{{\n  "тема": {json.dumps(self.topic_name, ensure_ascii=False)},\n'
+                    f'  "кількість_завдань": {self.count},\n  "завдання": [')
+            f.write(",".join("\n    " + entry for entry in self.entries))
+            f.write("\n  ]\n}\n")
+        self.entries = []
+
+def answer_key_paths(output_filename):
+    """tex/algebra.tex -> (tex/algebra_answers.tex, tex/algebra_answers.json)"""
+    base = os.path.splitext(output_filename)[0]
+    return base + "_answers.tex", base + "_answers.json"
+
+def topic_sinks(output_filename, answers=True):
+    """The document sink, plus the answer key sinks when answers is true."""
+    sinks = [TexSink(output_filename)]
+    if answers:
+        sinks.append(AnswerKeySink(*answer_key_paths(output_filename)))
+    return sinks
+
+def write_topic_doc(topic_name, chunks, sinks, index=None, jobs=None):
+    """
+    Streams chunks of (section title, entries) into every sink, in order, and
+    records the task keys in index. Chunks only check the on-disk index, so a
+    task whose key is already in index (produced by an earlier chunk or topic of
+    this run) is replaced here from spare_tasks() of its chunk job (jobs[i] for
+    the i-th chunk), up to MAX_UNIQUE_ATTEMPTS times. Returns the number of
+    repeated tasks that were written anyway.
+    """
+    for sink in sinks:
+        sink.begin(topic_name)
+    repeats = 0
+    for i, (title, entries) in enumerate(chunks):
+        for sink in sinks:
+            sink.section(title)
+        spares = None
+        for number, task, latex, key in entries:
+            if key is not None and key in index.keys:
+                if spares is None:
+                    spares = spare_tasks(jobs[i])
+                for _ in range(MAX_UNIQUE_ATTEMPTS):
+                    task = next(spares)
+                    key = task_key(task)
+                    if key not in index.keys:
+                        break
+                else:
+                    repeats += 1
+                latex = render_task(task, number)
+            if key is not None:
+                index.add_key(key)
+            for sink in sinks:
+                sink.task(number, task, latex)
+    for sink in sinks:
+        sink.end()
+    return repeats
+
+def report_topic(output_filename, task_count, repeats, index):
+    message = f"Generated {task_count} tasks to {output_filename}"
+    if index is not None:
+        message += f" ({repeats} repeats)"
+    print(message)
+
+def generate_topic_doc(topic_name, generators, output_filename, seed=None, tasks_per_type=TASKS_PER_TYPE, index=None, answers=True):
+    """
+    Builds one topic document. Each generator's tasks form an independent chunk
+    seeded from (seed, topic, position), so the same seed gives the same document.
+    index: optional file-backed TaskIndex used to reject tasks produced before;
+    new keys are added to it (call index.save() to persist them).
+    answers: also write the answer key (see answer_key_paths()) in the same pass.
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**32)
+
+    index_path = index.path if index is not None else None
+    jobs = topic_jobs(topic_name, generators, seed, tasks_per_type, index_path)
+    repeats = write_topic_doc(topic_name, map(stream_chunk, jobs), topic_sinks(output_filename, answers), index, jobs)
+    report_topic(output_filename, len(jobs) * tasks_per_type, repeats, index)
+
+def index_published(index, tex_files):
+    """Adds the tasks of already published .tex worksheets to the index."""
+    from scripts.latex_parser import parse_latex_file
+    added = 0
+    for tex_file in tex_files:
+        topic_name = os.path.basename(os.path.dirname(tex_file))
+        for task in parse_latex_file(tex_file, topic_name):
+            if task["type"] == "multiple_choice" and index.add(task):
+                added += 1
+    print(f"Indexed {added} published tasks")
+
+def topic_specs():
+    """(topic name, generators, output file) for every document built by generate_all()."""
+    return [
+        # 1. Arithmetic
+        ("Арифметична прогресія", [
+            ArithmeticFindDifferentGenerator(),
+            ArithmeticMemberDifferenceGenerator(),
+            ArithmeticSumGenerator(),
+            ArithmeticTermPropertiesGenerator(),
+            ArithmeticMiddleTermGenerator(),
+            ArithmeticFormulaSearchGenerator(),
+            ArithmeticWordProblemGenerator()
+        ], "tex/arithmetic_progression.tex"),
+
+        # 2. Geometric
+        ("Геометрична прогресія", [
+            GeometricFindTermGenerator(),
+            GeometricRatioGenerator(),
+            GeometricFormulaGenerator(),
+            GeometricSumGenerator(),
+            GeometricWordProblemGenerator()
+        ], "tex/geometric_progression.tex"),
+
+        # 3. Logarithms
+        ("Логарифмічні вирази та рівняння", [
+            LogValueGenerator(), # Single
+            MatchingTaskGenerator(LogValueGenerator), # Matching (3 items)
+            LogEquationGenerator(), # Single
+            LogInequalityGenerator(),
+            MatchingTaskGenerator(LogEquationGenerator) # Matching Equations? Why not.
+        ], "tex/logarithms.tex"),
+
+        # 4. Trigonometry
+        ("Тригонометричні вирази та рівняння", [
+            TrigValueGenerator(),
+            MatchingTaskGenerator(TrigValueGenerator), # Matching Values
+            TrigReductionGenerator(),
+            MatchingTaskGenerator(TrigReductionGenerator), # Matching Reductions
+            TrigEquationGenerator()
+        ], "tex/trigonometry.tex"),
+
+        # 5. Functions
+        ("Функції та їх властивості", [
+            FunctionShiftGenerator(),
+            MatchingTaskGenerator(FunctionShiftGenerator),
+            FunctionDomainGenerator(),
+            MatchingTaskGenerator(FunctionDomainGenerator)
+        ], "tex/functions.tex"),
+
+        # 6. Symbolic Algebra (New)
+        ("Алгебраїчні вирази", [
+            AlgebraSimplificationGenerator(),
+            MatchingTaskGenerator(AlgebraSimplificationGenerator),
+            AlgebraFractionGenerator(),
+            MatchingTaskGenerator(AlgebraFractionGenerator),
+            SymbolicLogGenerator(),
+            MatchingTaskGenerator(SymbolicLogGenerator)
+        ], "tex/algebra.tex"),
     ]
-    generate_topic_doc("Алгебраїчні вирази", alg_gens, "tex/algebra.tex")
+
+def capacity_rows(specs, tasks_per_type=TASKS_PER_TYPE):
+    """
+    (topic, generator id, capacity, enough, upper bound) for every generator;
+    capacity None means unbounded.
+    """
+    rows = []
+    for topic_name, generators, _ in specs:
+        for gen in generators:
+            capacity = gen.capacity()
+            rows.append((topic_name, gen.generator_id, capacity, capacity is None or capacity >= tasks_per_type,
+                         gen.capacity_is_upper_bound()))
+    return rows
+
+def print_capacity_report(specs, tasks_per_type=TASKS_PER_TYPE):
+    """Prints the distinct-task capacity of every generator against the requested count."""
+    rows = capacity_rows(specs, tasks_per_type)
+    print(f"{'Capacity':>10}  {'Requested':>9}  Status  Generator")
+    for topic_name, generator_id, capacity, enough, upper_bound in rows:
+        shown = "unbounded" if capacity is None else f"<={capacity}" if upper_bound else capacity
+        print(f"{shown:>10}  {tasks_per_type:>9}  {'OK' if enough else 'SHORT':<6}  {topic_name}: {generator_id}")
+    if any(row[4] for row in rows):
+        print("<=N: upper bound (parameter combinations; some may render the same task)")
+
+def warn_capacity(specs, tasks_per_type=TASKS_PER_TYPE):
+    """Warns about generators that cannot produce tasks_per_type distinct tasks."""
+    for topic_name, generator_id, capacity, enough, _ in capacity_rows(specs, tasks_per_type):
+        if not enough:
+            print(f"Warning: {topic_name}: {generator_id} has only {capacity} distinct tasks, "
+                  f"{tasks_per_type} requested; {tasks_per_type - capacity} will repeat")
+
+def generate_all(seed=None, jobs=1, tasks_per_type=TASKS_PER_TYPE, index_path=None, published=(), answers=True):
+    """
+    Builds every topic document. With jobs > 1 the generator chunks of all
+    topics are rendered in a process pool; output is byte-for-byte the same
+    as jobs=1 for the same seed.
+    index_path: persistent uniqueness index; tasks seen in earlier runs (or in
+    the published .tex files) are not repeated, and this run's tasks are added.
+    answers: write each document's answer key next to it in the same pass.
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**32)
+    print(f"Seed: {seed}")
+
+    index = None
+    if index_path is not None:
+        index = TaskIndex(index_path)
+        if published:
+            index_published(index, published)
+            # Chunks read the index from disk, so published tasks must be saved first
+            index.save()
+        print(f"Uniqueness index: {len(index)} tasks in {index_path}")
+
+    specs = topic_specs()
+    warn_capacity(specs, tasks_per_type)
+    if jobs <= 1:
+        for topic_name, generators, output_filename in specs:
+            generate_topic_doc(topic_name, generators, output_filename, seed, tasks_per_type, index, answers)
+    else:
+        # Submit the chunks of all topics at once, then consume the results in order
+        per_topic = [topic_jobs(topic_name, generators, seed, tasks_per_type, index_path) for topic_name, generators, _ in specs]
+        all_jobs = [job for topic in per_topic for job in topic]
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = pool.map(render_chunk, all_jobs)
+            for (topic_name, _, output_filename), topic in zip(specs, per_topic):
+                repeats = write_topic_doc(topic_name, itertools.islice(results, len(topic)), topic_sinks(output_filename, answers), index, topic)
+                report_topic(output_filename, len(topic) * tasks_per_type, repeats, index)
+
+    if index is not None:
+        index.save()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate Overleaf-ready LaTeX documents for every topic.")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Master seed; the same seed reproduces the same documents (default: random, printed)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Number of worker processes (default: 1)")
+    parser.add_argument("--per-type", type=int, default=TASKS_PER_TYPE,
+                        help=f"Tasks generated per generator (default: {TASKS_PER_TYPE})")
+    parser.add_argument("--unique-index", default=None, metavar="PATH",
+                        help="Persistent uniqueness index; tasks already in it are not generated again")
+    parser.add_argument("--index-published", nargs="*", default=[], metavar="TEX",
+                        help="Published .tex worksheets to add to the uniqueness index before generating")
+    parser.add_argument("--no-answers", action="store_true",
+                        help="Do not write the answer key (.tex and .json) next to each document")
+    parser.add_argument("--capacity", action="store_true",
+                        help="Print the distinct-task capacity of every generator and exit")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    generate_all()
+    args = parse_args()
+    if args.capacity:
+        print_capacity_report(topic_specs(), args.per_type)
+        raise SystemExit(0)
+    if args.index_published and not args.unique_index:
+        raise SystemExit("--index-published requires --unique-index")
+    generate_all(seed=args.seed, jobs=args.jobs, tasks_per_type=args.per_type,
+                 index_path=args.unique_index, published=args.index_published,
+                 answers=not args.no_answers)
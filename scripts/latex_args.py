@@ -0,0 +1,158 @@
+"""
+Brace-delimited macro arguments of LaTeX source, e.g. the five options of
+\\answerTable{...}{...}{...}{...}{...}.
+
+match_braces() pairs every "{" with its "}" in one pass over the text, so
+reading the arguments of any macro afterwards costs O(number of arguments),
+whatever the nesting (\\frac{1}{2}) or however many unbalanced braces there
+are. The parser, its lexer and both randomizers share it.
+
+Run the module to benchmark it against the previous approaches on
+adversarial input:
+
+    PYTHONPATH=. python3 scripts/latex_args.py
+    PYTHONPATH=. python3 scripts/latex_args.py --sizes 1000 4000 16000
+"""
+
+import re
+import sys
+import time
+import argparse
+
+BRACE_PATTERN = re.compile(r'[{}]')
+WHITESPACE_PATTERN = re.compile(r'[ \t\r\n]*')
+
+def match_braces(text):
+    """{position of "{": position of its matching "}"} for every balanced pair in text."""
+    closing = {}
+    stack = []
+    push, pop = stack.append, stack.pop
+    for m in BRACE_PATTERN.finditer(text):
+        if m.group() == "{":
+            push(m.start())
+        elif stack:
+            closing[pop()] = m.start()
+    return closing
+
+class BraceIndex:
+    """Brace pairs of one text, for reading macro arguments by position."""
+
+    def __init__(self, text):
+        self.text = text
+        self.closing = match_braces(text)
+
+    def close_of(self, open_pos):
+        """Position of the "}" matching the "{" at open_pos, or None if unbalanced."""
+        return self.closing.get(open_pos)
+
+    def args(self, pos, count):
+        """
+        Reads count arguments in braces starting at pos; whitespace between
+        them is skipped. Returns (list of arguments, position after the last "}")
+        or (None, pos) if there are fewer than count balanced arguments.
+        """
+        text = self.text
+        args = []
+        end = pos
+        for _ in range(count):
+            end = WHITESPACE_PATTERN.match(text, end).end()
+            close = self.closing.get(end) if end < len(text) and text[end] == "{" else None
+            if close is None:
+                return None, pos
+            args.append(text[end + 1:close])
+            end = close + 1
+        return args, end
+
+def extract_args(text, pos, count):
+    """BraceIndex(text).args(pos, count) for a single lookup; reuse a BraceIndex for many."""
+    return BraceIndex(text).args(pos, count)
+
+# --- Benchmark -------------------------------------------------------------
+
+# The option regex latex_parser used before this module: five lazy DOTALL groups
+LAZY_OPTIONS_PATTERN = re.compile(r'\\answerTable(?:Small|Tall|Big)?\s*\{(.*?)\}\s*\{(.*?)\}\s*\{(.*?)\}\s*\{(.*?)\}\s*\{(.*?)\}', re.DOTALL)
+
+def scan_args(text, start_pos, num_args=5):
+    """The character-by-character extractor both randomizers carried before this module."""
+    args = []
+    pos = start_pos
+    for _ in range(num_args):
+        while pos < len(text) and text[pos] in ' \t\n':
+            pos += 1
+        if pos >= len(text) or text[pos] != '{':
+            return None, start_pos
+        depth = 0
+        arg_start = pos + 1
+        while pos < len(text):
+            if text[pos] == '{':
+                depth += 1
+            elif text[pos] == '}':
+                depth -= 1
+                if depth == 0:
+                    args.append(text[arg_start:pos])
+                    pos += 1
+                    break
+            pos += 1
+        else:
+            return None, start_pos
+    return args, pos
+
+def adversarial_inputs(size):
+    """Inputs of roughly size tables each that make the old approaches backtrack or rescan."""
+    return {
+        # Nested arguments: the lazy regex splits \frac{1}{2} into two options
+        "nested": "".join(
+            "\\answerTable{$\\frac{1}{2}$}{$\\frac{3}{4}$}{$2^{x}$}{$\\sqrt{5}$}{7}\n" for _ in range(size)),
+        # No "}{" between arguments: the lazy regex tries every later "}" for each table
+        "no_args": "".join(
+            "\\answerTable{" + "x} " * 20 + "\n" for _ in range(size)),
+        # One unclosed "{" early: a brace scanner started at each table runs to the end of the text
+        "unbalanced": "\\answerTable{" + "".join(
+            "\\answerTable{1}{2}{3}{4}{5 {\n" for _ in range(size)),
+    }
+
+def run_lazy_regex(text):
+    return [m.groups() for m in LAZY_OPTIONS_PATTERN.finditer(text)]
+
+def run_scan(text):
+    starts = [m.end() for m in re.finditer(r'\\answerTable', text)]
+    return [scan_args(text, pos)[0] for pos in starts]
+
+def run_index(text):
+    index = BraceIndex(text)
+    starts = [m.end() for m in re.finditer(r'\\answerTable', text)]
+    return [index.args(pos, 5)[0] for pos in starts]
+
+METHODS = [("lazy regex", run_lazy_regex), ("char scan", run_scan), ("brace index", run_index)]
+
+def benchmark(sizes, time_limit):
+    """Prints seconds per method, input and size; a method is dropped once a run exceeds time_limit."""
+    print(f"{'input':<12} {'tables':>7} {'KB':>7}  " + "  ".join(f"{name:>12}" for name, _ in METHODS))
+    slow = set()
+    for kind in adversarial_inputs(1):
+        for size in sizes:
+            text = adversarial_inputs(size)[kind]
+            cells = []
+            for name, method in METHODS:
+                if (kind, name) in slow:
+                    cells.append(f"{'-':>12}")
+                    continue
+                start = time.perf_counter()
+                method(text)
+                elapsed = time.perf_counter() - start
+                if elapsed > time_limit:
+                    slow.add((kind, name))
+                cells.append(f"{elapsed:>11.4f}s")
+            print(f"{kind:<12} {size:>7} {len(text) // 1024:>7}  " + "  ".join(cells))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark macro-argument extraction on adversarial input.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000, 4000],
+                        help="Number of tables per input (default: 500 1000 2000 4000)")
+    parser.add_argument("--time-limit", type=float, default=5.0,
+                        help="Skip larger inputs for a method once a run takes longer (default: 5 s)")
+    args = parser.parse_args(argv)
+    benchmark(sorted(args.sizes), args.time_limit)
+
+if __name__ == "__main__":
+    sys.exit(main())
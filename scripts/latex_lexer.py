@@ -0,0 +1,99 @@
+"""
+Linear-time lexer for the NMT task .tex files.
+
+One combined regex walks the file once and records:
+- task starts in the three layouts the parser understands
+  (\\task{n}{...}, \\noindent\\makebox...\\parbox...{...}, \\noindent\\textbf{n.});
+- the commands the parser and the randomizers look for
+  (\\nmtyear{...}, \\answerTable*, \\matchTable, \\includegraphics, tikzpicture).
+
+Braces are matched by scripts.latex_args in a second linear pass, so the
+closing brace of any group, and the arguments of any macro, are dictionary
+lookups instead of a character-by-character scan.
+
+Positions are offsets into the text. Lookups by range use bisect, so a
+whole file is processed in linear time.
+"""
+
+import re
+from bisect import bisect_left
+from collections import namedtuple
+
+from scripts.latex_args import BraceIndex
+
+# Every command behind one shared backslash: the regex engine only tries the
+# alternatives at a backslash, which keeps the pass fast.
+TOKEN_PATTERN = re.compile(
+    r'\\(?:'
+    r'(?P<task>task\s*\{(?P<task_num>\d+)\}\s*\{)'
+    r'|(?P<makebox>noindent\\makebox\[[^\]]*\]\[[^\]]*\]\{\\textbf\{(?P<makebox_num>\d+)\.\}\}\\parbox\[[^\]]*\](?:\{[^}]*\})?\{)'
+    r'|(?P<simple>noindent\s*\\textbf\{(?P<simple_num>\d+)\.\})'
+    r'|(?P<year>nmtyear\s*\{(?P<year_value>\d+)\})'
+    r'|(?P<answer>answerTable[A-Za-z]*)'
+    r'|(?P<match>matchTable)'
+    r'|(?P<image>includegraphics)'
+    r'|(?P<tikz>begin\{tikzpicture\}))'
+)
+
+TASK_KINDS = ("task", "makebox", "simple")
+COMMAND_KINDS = ("year", "answer", "match", "image", "tikz")
+
+# A task start: number as written, layout kind, span of the start command.
+# For "task" and "makebox" the command ends with the "{" that opens the question text.
+TaskStart = namedtuple("TaskStart", "number kind start end")
+
+# A command occurrence: value is the year for "year", the command name for
+# "answer" (e.g. "\\answerTableTall"), None otherwise.
+Command = namedtuple("Command", "kind start end value")
+
+class LatexTokens:
+    """Task starts, commands and brace pairs of one text, indexed by position."""
+
+    def __init__(self, text):
+        self.text = text
+        self.tasks = []
+        self.commands = {kind: [] for kind in COMMAND_KINDS}
+        self.braces = BraceIndex(text)
+
+        for m in TOKEN_PATTERN.finditer(text):
+            kind = m.lastgroup
+            if kind in TASK_KINDS:
+                self.tasks.append(TaskStart(m.group(f"{kind}_num"), kind, m.start(), m.end()))
+            else:
+                value = m.group("year_value") if kind == "year" else (m.group() if kind == "answer" else None)
+                self.commands[kind].append(Command(kind, m.start(), m.end(), value))
+
+        self._task_starts = [t.start for t in self.tasks]
+        self._command_starts = {kind: [c.start for c in cmds] for kind, cmds in self.commands.items()}
+
+    def next_task(self, pos):
+        """First task start at or after pos, or None."""
+        i = bisect_left(self._task_starts, pos)
+        return self.tasks[i] if i < len(self.tasks) else None
+
+    def find(self, kind, lo, hi):
+        """First command of kind that lies entirely within [lo, hi), or None."""
+        for cmd in self.find_all(kind, lo, hi):
+            return cmd
+        return None
+
+    def find_all(self, kind, lo, hi):
+        """Commands of kind that lie entirely within [lo, hi), in order."""
+        starts = self._command_starts[kind]
+        cmds = self.commands[kind]
+        i = bisect_left(starts, lo)
+        while i < len(cmds) and cmds[i].start < hi:
+            if cmds[i].end <= hi:
+                yield cmds[i]
+            i += 1
+
+    def close_of(self, open_pos):
+        """Position of the "}" matching the "{" at open_pos, or None if unbalanced."""
+        return self.braces.close_of(open_pos)
+
+    def args(self, pos, count):
+        """count arguments in braces starting at pos; see BraceIndex.args."""
+        return self.braces.args(pos, count)
+
+def tokenize(text):
+    return LatexTokens(text)
@@ -1,184 +1,146 @@
 import os
 import re
 import json
-import glob
+import fnmatch
+import hashlib
+import zipfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from scripts.latex_lexer import tokenize
+from scripts.task_store import jsonl_path, store_path, iter_tasks, write_tasks, append_tasks
+from scripts.task_db import write_database
 
 # Configuration
 SOURCE_DIR = "overleaf-lessons/extracted"
+SOURCE_ZIP = "overleaf-lessons/НМТ_по_темах копія.zip"
 OUTPUT_FILE = "nmt_database.json"
 
-def parse_latex_file(filepath, topic_name):
-    with open(filepath, 'r', encoding='utf-8') as f:
+# Source files to parse, as globs over the path relative to the source root
+# (e.g. "тест/*" or "*gemini.tex"); a pattern ending in "/" matches a folder.
+DEFAULT_INCLUDE = ("*.tex",)
+
+# Manifest of parsed source files, stored next to the database.
+# Version 2: tasks keep raw_spans/source_sha256 instead of raw_latex.
+MANIFEST_VERSION = 2
+
+# Answer-table macros with five options (scripts.latex_lexer matches any \\answerTable* name)
+ANSWER_TABLES = ("\\answerTable", "\\answerTableSmall", "\\answerTableTall", "\\answerTableBig")
+IMAGE_PATTERN = re.compile(r'\\includegraphics(?:\[.*?\])?\s*\{(.*?)\}')
+
+def parse_latex_file(filepath, topic_name, source=None):
+    # No newline translation: character offsets must map back to the bytes on disk
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
         content = f.read()
+    return parse_latex_content(content, topic_name, source)
 
+def parse_latex_content(content, topic_name, source=None):
+    """
+    Splits one .tex file into task records.
+    Task layouts:
+    1. \\task{num}{text}
+    2. \\noindent\\makebox...{\\textbf{num.}}\\parbox...{text}
+    3. \\noindent\\textbf{num.} text ... (Simple format found in Logarithms/Probability)
+    The file is lexed once (see latex_lexer.py); task boundaries, the closing
+    brace of the question text and the commands inside a task are then
+    lookups in the token index instead of new searches over the text.
+
+    The raw LaTeX of a task is not copied into the record: raw_spans holds
+    [byte offset, byte length] pairs into the UTF-8 source (question text and
+    body; the "}" between them is left out) and source_sha256 the hash of the
+    whole source. raw_latex.py loads the text on demand.
+    """
+    tokens = tokenize(content)
     tasks = []
-    
-    # Split content by \task command
-    # Pattern: \task{number}{text} ... content ...
-    # We will use a regex to find all task starts, then slice the content
-    
-    # Regex to find definition of tasks
-    # We use a custom parser because regex doesn't handle nested braces well
-    # Regex to find definition of tasks
-    # 1. \task{num}{text}
-    # 2. \noindent\makebox...{\textbf{num.}}\parbox...{text}
-    # 3. \noindent\textbf{num.} text ... (Simple format found in Logarithms/Probability)
-    
-    task_start_pattern = re.compile(
-        r'(?:\\task\s*\{(\d+)\}\s*\{)|' + 
-        r'(?:\\noindent\\makebox\[[^\]]*\]\[[^\]]*\]\{\\textbf\{(\d+)\.\}\}\\parbox\[[^\]]*\](?:\{[^}]*\})?\{)|' +
-        r'(?:\\noindent\s*\\textbf\{(\d+)\.\})'
-    )
-    
+    source_sha256 = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    byte_offset = ByteOffsets(content)
+
     current_pos = 0
     while True:
-        match = task_start_pattern.search(content, current_pos)
+        match = tokens.next_task(current_pos)
         if not match:
             break
-            
-        is_simple_format = False
-        
-        if match.group(1):
-             task_num = match.group(1)
-        elif match.group(2):
-             task_num = match.group(2)
-        else:
-             task_num = match.group(3)
-             is_simple_format = True
-            
-        start_content_idx = match.end()
-        
-        task_text = ""
-        task_text_end = -1
-        
+
+        task_num = match.number
+        is_simple_format = match.kind == "simple"
+        start_content_idx = match.end
+
         if not is_simple_format:
-            # Extract the question text by balancing braces
-            brace_count = 1
-            i = start_content_idx
-            
-            while i < len(content):
-                if content[i] == '{':
-                    brace_count += 1
-                elif content[i] == '}':
-                    brace_count -= 1
-                
-                if brace_count == 0:
-                    task_text_end = i
-                    break
-                i += 1
-                
-            if task_text_end == -1:
+            # The start command ends with the "{" that opens the question text
+            task_text_end = tokens.close_of(match.end - 1)
+            if task_text_end is None:
                 print(f"Error: Could not find closing brace for task {task_num}")
                 current_pos = start_content_idx
                 continue
-                
-            task_text = content[start_content_idx:task_text_end]
+
+            text_ranges = [(start_content_idx, task_text_end)]
             body_start = task_text_end + 1
-            
-        else:
-            # Simple format: Text is everything from here until \answerTable or \nmtyear or next task
-            # BUT we need to be careful. Ideally we read until we hit \answerTable or next task start.
-            # Usually \nmtyear is at the end of the question.
-            
-            # Let's find end of question heuristic.
-            # Usually ends before \answerTable
-            
-            # Find next task to set a hard limit
-            next_task_debug = task_start_pattern.search(content, start_content_idx)
-            hard_limit = next_task_debug.start() if next_task_debug else len(content)
-            
-            # Find \answerTable within this range
-            # Or \matchTable
-            # Or \vspace
-            
-            # Let's assume question text ends where \answerTable starts, OR at \nmtyear (which is part of q text usually but we strip it later)
-            
-            # Actually, `body_start` is where options definition starts.
-            # In \task{n}{text}... body starts after text.
-            # Here, there is no separation. "Text" is just the start of the body effectively.
-            
-            # Let's treat everything up to next task as "body", and extract question from it.
-            # This simplifies logic: question is part of "full content" which we parse later.
-            
-            # BUT downstream we rely on `task_text` separate from `task_body`.
-            # Let's say task_text is everything before the first \answerTable command?
-            
-            answer_match = re.search(r'\\answerTable', content[start_content_idx:hard_limit])
-            if answer_match:
-                task_text_end = start_content_idx + answer_match.start()
-            else:
-                # Maybe it is a matching task?
-                match_match = re.search(r'\\matchTable', content[start_content_idx:hard_limit])
-                if match_match:
-                     task_text_end = start_content_idx + match_match.start()
-                else:
-                     # Maybe text only?
-                     task_text_end = hard_limit
-            
-            task_text = content[start_content_idx:task_text_end]
-            body_start = task_text_end # The body starts exactly where question ended (e.g. at \answerTable)
-
-        
-        # Now find the "body" (everything after the question curly brace until the next task or newpage)
-        
-        # Find next task to determine body end (or end of file)
-        next_task_match = task_start_pattern.search(content, body_start)
-        
-        # Also check for \newpage or end of document
-        # But simplistic approach: look for next \task
-        if next_task_match:
-            body_end = next_task_match.start()
+
         else:
-            # Check for \newpage or \end{document}
-            # Actually, simply taking everything till end of file or next task is fine
-            # But we might want to stop at \newpage
-            # Let's take 'till next task' as safest approximate, or look for specific section breaks
-            body_end = len(content)
-            
-        task_body = content[body_start:body_end]
-        
-        full_task_content = task_text + task_body
-        
+            # Simple format: the question runs up to \\answerTable (or \\matchTable)
+            # within this task; the body starts exactly there.
+            next_task = tokens.next_task(start_content_idx)
+            hard_limit = next_task.start if next_task else len(content)
+
+            table = tokens.find("answer", start_content_idx, hard_limit) or tokens.find("match", start_content_idx, hard_limit)
+            task_text_end = table.start if table else hard_limit
+            text_ranges = [(start_content_idx, task_text_end)]
+            body_start = task_text_end
+
+        # The body is everything after the question until the next task (or end of file)
+        next_task_match = tokens.next_task(body_start)
+        body_end = next_task_match.start if next_task_match else len(content)
+        ranges = text_ranges + [(body_start, body_end)]
+
+        task_text = content[start_content_idx:task_text_end]
+        raw_spans = []
+        for lo, hi in strip_spans(content, [(start_content_idx, task_text_end), (body_start, body_end)]):
+            start = byte_offset(lo)
+            raw_spans.append([start, byte_offset(hi) - start])
+
         # Extract Year from text OR body
-        year_match = re.search(r'\\nmtyear\s*\{(\d+)\}', full_task_content)
-        year = year_match.group(1) if year_match else "Unknown"
-        
+        year_token = next((y for lo, hi in ranges for y in tokens.find_all("year", lo, hi)), None)
+        year = year_token.value if year_token else "Unknown"
+
         # Clean up text
         cleaned_text = clean_latex_text(task_text)
-        
+
         # Extract Options
         options = []
-        answer_table_match = re.search(r'\\answerTable(?:Small|Tall|Big)?\s*\{(.*?)\}\s*\{(.*?)\}\s*\{(.*?)\}\s*\{(.*?)\}\s*\{(.*?)\}', task_body, re.DOTALL)
-        
         task_type = "unknown"
-        
-        if answer_table_match:
+
+        # First answer table of the body whose five arguments are balanced and inside it
+        table_args = None
+        for table in tokens.find_all("answer", body_start, body_end):
+            if table.value in ANSWER_TABLES:
+                args, end = tokens.args(table.end, 5)
+                if args and end <= body_end:
+                    table_args = args
+                    break
+        if table_args:
             task_type = "multiple_choice"
-            options = [
-                clean_latex_text(answer_table_match.group(1)),
-                clean_latex_text(answer_table_match.group(2)),
-                clean_latex_text(answer_table_match.group(3)),
-                clean_latex_text(answer_table_match.group(4)),
-                clean_latex_text(answer_table_match.group(5))
-            ]
-        elif "\\matchTable" in task_body:
+            options = [clean_latex_text(arg) for arg in table_args]
+        elif tokens.find("match", body_start, body_end):
             task_type = "matching"
             # TODO: matching extraction is complex, saving raw for now
-            
+
         # Extract Images
         images = []
-        img_matches = re.finditer(r'\\includegraphics(?:\[.*?\])?\s*\{(.*?)\}', full_task_content)
-        for img in img_matches:
-            images.append(img.group(1))
-            
+        for lo, hi in ranges:
+            for cmd in tokens.find_all("image", lo, hi):
+                img = IMAGE_PATTERN.match(content, cmd.start, hi)
+                if img:
+                    images.append(img.group(1))
+
         # Check for TikZ
-        has_tikz = "\\begin{tikzpicture}" in full_task_content
+        has_tikz = any(tokens.find("tikz", lo, hi) for lo, hi in ranges)
 
         task_id = f"{topic_name.replace(' ', '_')}_task_{task_num}_{year}"
 
         tasks.append({
             "id": task_id,
             "topic": topic_name,
+            "source": source,
             "task_number": task_num,
             "year": year,
             "type": task_type,
@@ -186,17 +148,62 @@ def parse_latex_file(filepath, topic_name):
             "options": options,
             "images": images,
             "has_tikz": has_tikz,
-            "raw_latex": full_task_content.strip() 
+            "raw_spans": raw_spans,
+            "source_sha256": source_sha256,
         })
-        
-        # Move regex search to next task
+
+        # Continue from the next task
         if next_task_match:
-            current_pos = next_task_match.start()
+            current_pos = next_task_match.start
         else:
             break
-            
+
     return tasks
 
+def strip_spans(text, spans):
+    """
+    Character spans of the concatenated text of spans with outer whitespace
+    removed, as "".join(text[lo:hi] for lo, hi in spans).strip() would.
+    Empty spans are dropped and touching spans merged.
+    """
+    spans = [[lo, hi] for lo, hi in spans if lo < hi]
+    while spans:
+        lo, hi = spans[0]
+        piece = text[lo:hi]
+        spans[0][0] = hi - len(piece.lstrip())
+        if spans[0][0] < hi:
+            break
+        spans.pop(0)
+    while spans:
+        lo, hi = spans[-1]
+        piece = text[lo:hi]
+        spans[-1][1] = lo + len(piece.rstrip())
+        if lo < spans[-1][1]:
+            break
+        spans.pop()
+    merged = []
+    for lo, hi in spans:
+        if merged and merged[-1][1] == lo:
+            merged[-1][1] = hi
+        else:
+            merged.append([lo, hi])
+    return merged
+
+class ByteOffsets:
+    """Character offset -> UTF-8 byte offset in text; cheapest for increasing offsets."""
+
+    def __init__(self, text):
+        self.text = text
+        self.char = 0
+        self.byte = 0
+
+    def __call__(self, pos):
+        if pos < self.char:
+            self.char = self.byte = 0
+        self.byte += len(self.text[self.char:pos].encode("utf-8"))
+        self.char = pos
+        return self.byte
+
 def clean_latex_text(text):
     # Remove \nmtyear{...}
     text = re.sub(r'\\nmtyear\s*\{\d+\}', '', text)
@@ -204,40 +211,275 @@ def clean_latex_text(text):
     text = re.sub(r'\s+', ' ', text).strip()
     return text
 
-def main():
-    all_tasks = []
-    
-    # Find all top-level directories (Topics)
-    search_path = os.path.join(SOURCE_DIR, "*")
-    topic_dirs = glob.glob(search_path)
-    
-    print(f"Found {len(topic_dirs)} topic directories.")
-    
-    for topic_dir in topic_dirs:
-        if not os.path.isdir(topic_dir):
+def manifest_path(output_file):
+    """nmt_database.json -> nmt_database.manifest.json"""
+    return os.path.splitext(output_file)[0] + ".manifest.json"
+
+def sqlite_path(output_file):
+    """nmt_database.json -> nmt_database.sqlite"""
+    return os.path.splitext(output_file)[0] + ".sqlite"
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def default_source():
+    """The extracted source directory if there is one, else the zip archive."""
+    return SOURCE_DIR if os.path.isdir(SOURCE_DIR) else SOURCE_ZIP
+
+def is_zip(source_dir):
+    return source_dir.endswith(".zip") and os.path.isfile(source_dir)
+
+def matches_glob(rel_path, pattern):
+    if pattern.endswith("/"):
+        return rel_path.startswith(pattern)
+    return fnmatch.fnmatchcase(rel_path, pattern)
+
+def is_selected(rel_path, include=DEFAULT_INCLUDE, exclude=()):
+    """A .tex path matching one of include and none of exclude."""
+    return (rel_path.endswith(".tex")
+            and any(matches_glob(rel_path, p) for p in include)
+            and not any(matches_glob(rel_path, p) for p in exclude))
+
+def list_sources(source_dir, include=DEFAULT_INCLUDE, exclude=()):
+    """
+    (relative path, topic name) of every selected .tex file inside a topic
+    folder of source_dir (a directory or a zip archive), in a fixed order
+    (sorted by path components). The topic is the top-level folder; files in
+    its subfolders belong to it too. Paths use "/" on every platform.
+    """
+    if is_zip(source_dir):
+        with zipfile.ZipFile(source_dir) as archive:
+            paths = [info.filename for info in archive.infolist() if not info.is_dir()]
+    else:
+        paths = []
+        for root, dirs, files in os.walk(source_dir):
+            for name in files:
+                paths.append(os.path.relpath(os.path.join(root, name), source_dir).replace(os.sep, "/"))
+    sources = []
+    for rel_path in sorted(paths, key=lambda path: path.split("/")):
+        parts = rel_path.split("/")
+        # Files at the top level have no topic; skip hidden files and macOS metadata
+        if len(parts) < 2 or any(part.startswith(".") or part == "__MACOSX" for part in parts):
             continue
-            
-        topic_name = os.path.basename(topic_dir)
-        print(f"Processing topic: {topic_name}")
-        
-        # Find tex files in the directory
-        tex_files = glob.glob(os.path.join(topic_dir, "*.tex"))
-        
-        for tex_file in tex_files:
-            print(f"  Parsing {os.path.basename(tex_file)}...")
-            try:
-                tasks = parse_latex_file(tex_file, topic_name)
-                all_tasks.extend(tasks)
-                print(f"    Found {len(tasks)} tasks.")
-            except Exception as e:
-                print(f"    Error parsing {tex_file}: {e}")
-
-    print(f"Total tasks pased: {len(all_tasks)}")
-    
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(all_tasks, f, ensure_ascii=False, indent=2)
-        
-    print(f"Database saved to {OUTPUT_FILE}")
+        if is_selected(rel_path, include, exclude):
+            sources.append((rel_path, parts[0]))
+    return sources
+
+def read_source(source_dir, rel_path):
+    """Text of a source file from a directory or a zip archive, without newline translation."""
+    if is_zip(source_dir):
+        with zipfile.ZipFile(source_dir) as archive:
+            return archive.read(rel_path).decode("utf-8")
+    with open(os.path.join(source_dir, rel_path), encoding="utf-8", newline="") as f:
+        return f.read()
+
+def load_previous(output_file, manifest_file):
+    """
+    Manifest entries and tasks (grouped by source) of the previous run, read
+    from the JSONL store (or the JSON array if there is no store yet).
+    Returns ({}, {}) when there is nothing to reuse: no manifest or database,
+    an old manifest version, or a database written before tasks had a source.
+    """
+    if not (os.path.exists(manifest_file) and os.path.exists(store_path(output_file))):
+        return {}, {}
+    with open(manifest_file, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}, {}
+    by_source = {}
+    for task in iter_tasks(output_file):
+        if task.get("source") is None:
+            return {}, {}
+        by_source.setdefault(task["source"], []).append(task)
+    return manifest["files"], by_source
+
+def is_unchanged(path, entry):
+    """
+    Compares a source file with its manifest entry. Size and mtime are checked
+    first; the content hash is only computed when they differ (e.g. after a
+    fresh checkout), and a matching hash still counts as unchanged.
+    Returns (unchanged, updated manifest entry).
+    """
+    st = os.stat(path)
+    if entry and entry.get("size") == st.st_size and entry.get("mtime") == st.st_mtime_ns:
+        return True, entry
+    digest = file_sha256(path)
+    new_entry = {"size": st.st_size, "mtime": st.st_mtime_ns, "sha256": digest}
+    return bool(entry) and entry["sha256"] == digest, new_entry
+
+def is_member_unchanged(archive, rel_path, entry):
+    """
+    is_unchanged() for a zip member: size and CRC come from the archive's
+    central directory, so an unchanged member is not even decompressed.
+    Otherwise the member is read and its hash compared (e.g. when switching
+    from the extracted directory to the archive).
+    Returns (unchanged, updated manifest entry, text or None if not read).
+    """
+    info = archive.getinfo(rel_path)
+    if entry and entry.get("size") == info.file_size and entry.get("crc") == info.CRC:
+        return True, entry, None
+    data = archive.read(info)
+    digest = hashlib.sha256(data).hexdigest()
+    new_entry = {"size": info.file_size, "crc": info.CRC, "sha256": digest}
+    return bool(entry) and entry["sha256"] == digest, new_entry, data.decode("utf-8")
+
+def parse_source(job):
+    """
+    Parses one source file: job = (source root, topic name, relative path,
+    text or None to read it from the root).
+    Returns (tasks, None), or (None, error message) if parsing failed.
+    Runs inside the process pool for --jobs > 1.
+    """
+    source_dir, topic_name, rel_path, content = job
+    try:
+        if content is None:
+            content = read_source(source_dir, rel_path)
+        return parse_latex_content(content, topic_name, source=rel_path), None
+    except Exception as e:
+        return None, str(e)
+
+def build_database(source_dir=None, output_file=OUTPUT_FILE, full=False, jobs=1, json_array=True, sqlite=False,
+                   include=DEFAULT_INCLUDE, exclude=()):
+    """
+    Parses the topic .tex files of source_dir (a directory or the zip archive;
+    default: see default_source) that match include and none of exclude
+    into the JSONL store next to output_file
+    (nmt_database.jsonl) and, unless json_array is False, the JSON array
+    output_file itself. Only new or changed files are re-parsed; tasks of
+    unchanged files are taken from the previous database and tasks of deleted
+    files are dropped. When every parsed file is new and comes after every
+    reused one, their tasks are appended to the store instead of rewriting it;
+    a changed file always rewrites the store, since its old records are in it.
+    sqlite=True also writes the indexed SQLite database (nmt_database.sqlite,
+    see task_db.py). full=True ignores the previous run.
+    With jobs > 1 the files are parsed in a process pool; results are merged in
+    source order, so the database is identical to a serial run.
+    Returns the list of tasks, in source order.
+    """
+    source_dir = source_dir or default_source()
+    manifest_file = manifest_path(output_file)
+    old_files, old_tasks = ({}, {}) if full else load_previous(output_file, manifest_file)
+    if not old_files:
+        print("No usable manifest; parsing every file.")
+
+    sources = list_sources(source_dir, include, exclude)
+    print(f"Found {len(sources)} source files in {source_dir}.")
+
+    # Decide per file: reuse the previous tasks or parse again
+    plan = []
+    to_parse = []
+    archive = zipfile.ZipFile(source_dir) if is_zip(source_dir) else None
+    try:
+        for rel_path, topic_name in sources:
+            entry = old_files.get(rel_path)
+            if archive is not None:
+                unchanged, new_entry, content = is_member_unchanged(archive, rel_path, entry)
+            else:
+                unchanged, new_entry = is_unchanged(os.path.join(source_dir, rel_path), entry)
+                content = None
+            reused = old_tasks.get(rel_path, [])
+            if unchanged and len(reused) == entry.get("tasks"):
+                plan.append((rel_path, new_entry, reused))
+            else:
+                plan.append((rel_path, new_entry, None))
+                to_parse.append((source_dir, topic_name, rel_path, content))
+    finally:
+        if archive is not None:
+            archive.close()
+
+    if jobs > 1 and len(to_parse) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(parse_source, to_parse))
+    else:
+        results = [parse_source(job) for job in to_parse]
+    parsed_results = iter(results)
+
+    all_tasks = []
+    files = {}
+    parsed = 0
+    # Tasks from the first parsed file on; appendable while every parsed file is
+    # new (its old records are not in the store) and no file after it is reused
+    tail_start = None
+    appendable = True
+    for rel_path, entry, tasks in plan:
+        if tasks is None:
+            print(f"  Parsing {rel_path}...")
+            tasks, error = next(parsed_results)
+            if error is not None:
+                # Not recorded in the manifest, so the file is retried next run
+                print(f"    Error parsing {os.path.join(source_dir, rel_path)}: {error}")
+                continue
+            print(f"    Found {len(tasks)} tasks.")
+            parsed += 1
+            if rel_path in old_files:
+                appendable = False
+            if tail_start is None:
+                tail_start = len(all_tasks)
+        elif tail_start is not None:
+            appendable = False
+        all_tasks.extend(tasks)
+        files[rel_path] = dict(entry, tasks=len(tasks))
+
+    removed = sorted(set(old_files) - set(files))
+    for rel_path in removed:
+        print(f"  Removed {rel_path}")
+    print(f"Parsed {parsed} of {len(sources)} files; {len(all_tasks)} tasks in total.")
+
+    changed = parsed or removed or not old_files
+    store = jsonl_path(output_file)
+    if changed or not os.path.exists(store):
+        if old_files and not removed and appendable and os.path.exists(store):
+            count = append_tasks(store, all_tasks[tail_start:])
+            print(f"Appended {count} tasks to {store}")
+        else:
+            write_tasks(store, all_tasks)
+            print(f"Task store saved to {store}")
+    else:
+        print(f"{store} is up to date.")
+    if json_array and (changed or not os.path.exists(output_file)):
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(all_tasks, f, ensure_ascii=False, indent=2)
+        print(f"Database saved to {output_file}")
+    db_file = sqlite_path(output_file)
+    if sqlite and (changed or not os.path.exists(db_file)):
+        write_database(db_file, all_tasks)
+        print(f"SQLite database saved to {db_file}")
+    if files != old_files:
+        # Also refreshes mtimes of files that were touched but not changed
+        with open(manifest_file, 'w', encoding='utf-8') as f:
+            json.dump({"version": MANIFEST_VERSION, "files": files}, f, ensure_ascii=False, indent=2)
+    return all_tasks
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Parse the topic .tex files into a JSON task database.")
+    parser.add_argument("--source-dir", default=None,
+                        help=f"Directory with one subdirectory per topic, or a zip archive of it "
+                             f"(default: {SOURCE_DIR} if it exists, else {SOURCE_ZIP})")
+    parser.add_argument("--include", action="append", default=None, metavar="GLOB",
+                        help="Only parse .tex files whose path (relative to the source) matches GLOB; "
+                             "repeatable (default: all .tex files)")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                        help='Skip files whose path matches GLOB, e.g. "тест/" or "*gemini.tex"; repeatable')
+    parser.add_argument("--output", default=OUTPUT_FILE,
+                        help=f"Database file (default: {OUTPUT_FILE}); the JSONL store and the manifest are stored next to it")
+    parser.add_argument("--full", action="store_true",
+                        help="Re-parse every file instead of only the changed ones")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Number of worker processes for parsing (default: 1)")
+    parser.add_argument("--no-json", action="store_true",
+                        help="Only write the JSONL store, not the JSON array")
+    parser.add_argument("--sqlite", action="store_true",
+                        help="Also write the indexed SQLite database next to the output (see task_db.py)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    build_database(args.source_dir, args.output, full=args.full, jobs=args.jobs, json_array=not args.no_json,
+                   sqlite=args.sqlite, include=args.include or DEFAULT_INCLUDE, exclude=args.exclude)
 
 if __name__ == "__main__":
     main()
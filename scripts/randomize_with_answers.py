@@ -5,341 +5,378 @@
 
 Логіка: перший аргумент answerTable завжди є правильною відповіддю.
 Після перемішування визначаємо нову позицію правильної відповіді.
+
+З --variants N файли не змінюються: кожен розбирається один раз, і в
+<base_dir>_variants/variant_01 ... variant_NN записуються N різних варіантів
+із власними відповідями.
 """
 
-import re
 import random
 import os
-import sys
 import json
-from pathlib import Path
-
-def extract_braced_args(text, start_pos, num_args=5):
+import signal
+import argparse
+import shutil
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+from generators.base import derive_seed
+from scripts.answer_tables import (split_answer_tables, apply_permutations, answers_from_permutations, text_sha256,
+                                   write_atomic, answer_key, manifest_entry, write_topic_answers)
+from scripts.shuffle_manifest import load_manifest, new_manifest, save_manifest, manifest_path, write_answer_keys
+from scripts.workspace import WORKSPACE_DIR, load_catalog
+
+# Файли із завданнями в теках generated/
+GENERATED_TASK_FILES = ("generated_tasks.tex", "згенеровані.tex")
+
+def draw_permutations(segments, rng):
     """
-    Витягує num_args аргументів у фігурних дужках, починаючи з позиції start_pos.
-    Правильно обробляє вкладені дужки.
-    Повертає (список_аргументів, кінцева_позиція) або (None, start_pos) якщо не вдалося.
+    Перестановка для кожної таблиці: shuffled[i] = args[perm[i]].
+    random.shuffle залежить лише від довжини списку, тож це ті самі
+    перестановки, що й при перемішуванні самих аргументів тим самим rng.
     """
-    args = []
-    pos = start_pos
-
-    for _ in range(num_args):
-        # Пропускаємо пробіли та переноси рядків
-        while pos < len(text) and text[pos] in ' \t\n':
-            pos += 1
-
-        if pos >= len(text) or text[pos] != '{':
-            return None, start_pos
-
-        # Знаходимо закриваючу дужку з урахуванням вкладеності
-        depth = 0
-        arg_start = pos + 1
-        while pos < len(text):
-            if text[pos] == '{':
-                depth += 1
-            elif text[pos] == '}':
-                depth -= 1
-                if depth == 0:
-                    args.append(text[arg_start:pos])
-                    pos += 1
-                    break
-            pos += 1
-        else:
-            return None, start_pos
-
-    return args, pos
-
-def shuffle_answers_and_track(content):
+    permutations = []
+    for segment in segments:
+        if not isinstance(segment, str):
+            perm = list(range(len(segment[1])))
+            rng.shuffle(perm)
+            permutations.append(perm)
+    return permutations
+
+def compose_permutations(previous, permutations):
     """
-    Знаходить всі виклики answerTable* та перемішує відповіді.
-    Повертає (новий_контент, список_відповідей)
-    де список_відповідей = [('А'|'Б'|'В'|'Г'|'Д'), ...]
+    Перестановки відносно оригіналу для файлу, що вже був перемішаний
+    перестановками previous і тепер перемішується ще раз.
     """
-    # Патерни команд (в порядку від довших до коротших)
-    commands = ['\\answerTableBig', '\\answerTableTall', '\\answerTableSmall', '\\answerTable']
-    labels = ['А', 'Б', 'В', 'Г', 'Д']
-
-    answers = []
-    result = content
-    task_num = 0
-
-    for cmd in commands:
-        new_result = ""
-        i = 0
-        while i < len(result):
-            # Шукаємо команду
-            idx = result.find(cmd, i)
-            if idx == -1:
-                new_result += result[i:]
-                break
-
-            # Перевіряємо, що це саме ця команда, а не частина іншої
-            is_exact = True
-            if cmd == '\\answerTable':
-                suffix_start = idx + len(cmd)
-                if suffix_start < len(result):
-                    next_char = result[suffix_start]
-                    if next_char.isalpha():
-                        is_exact = False
-
-            if not is_exact:
-                new_result += result[i:idx + len(cmd)]
-                i = idx + len(cmd)
-                continue
-
-            # Додаємо все до команди
-            new_result += result[i:idx]
-
-            # Витягуємо 5 аргументів
-            args, end_pos = extract_braced_args(result, idx + len(cmd), 5)
-
-            if args is None or len(args) != 5:
-                # Не вдалося розпарсити, залишаємо як є
-                new_result += result[idx:idx + len(cmd)]
-                i = idx + len(cmd)
-                continue
-
-            # Запам'ятовуємо правильну відповідь (перший аргумент)
-            correct_answer = args[0]
+    return [[prev[j] for j in perm] for prev, perm in zip(previous, permutations)]
 
-            # Перемішуємо відповіді
-            shuffled = args.copy()
-            random.shuffle(shuffled)
-
-            # Знаходимо нову позицію правильної відповіді
-            correct_idx = shuffled.index(correct_answer)
-            correct_label = labels[correct_idx]
-            answers.append(correct_label)
-
-            task_num += 1
-
-            # Формуємо нову команду
-            new_cmd = cmd + ''.join(f'{{{a}}}' for a in shuffled)
-            new_result += new_cmd
-
-            i = end_pos
-
-        result = new_result
-
-    return result, answers
-
-def process_file(filepath, answers_dict, topic_name):
-    """Обробляє один файл і повертає кількість змін"""
+def shuffle_segments(segments, rng, content_sha256, previous=None):
+    """
+    Перемішує розібраний файл і повертає (новий_контент, відповіді, запис_маніфесту).
+    previous - запис маніфесту з попереднього перемішування цього файлу: якщо
+    файл з того часу не змінювався (той самий sha256), його перший аргумент уже
+    не правильна відповідь, тож перестановки складаються з попередніми і
+    відповіді та маніфест лишаються відносно оригіналу. Інакше поточний
+    вміст вважається оригіналом.
+    """
+    permutations = draw_permutations(segments, rng)
+    new_content = apply_permutations(segments, permutations)
+    source_sha256 = content_sha256
+    if (previous and previous.get("sha256") == content_sha256
+            and len(previous.get("permutations", [])) == len(permutations)):
+        permutations = compose_permutations(previous["permutations"], permutations)
+        source_sha256 = previous["source_sha256"]
+    record = {
+        "source_sha256": source_sha256,
+        "sha256": text_sha256(new_content),
+        "permutations": permutations,
+    }
+    return new_content, answers_from_permutations(permutations), record
+
+def file_rng(seed, rel_path):
+    """Окремий потік випадкових чисел для кожного файлу: (seed, скрипт, шлях)."""
+    return random.Random(derive_seed(seed, "randomize_with_answers", rel_path))
+
+def variant_rng(seed, rel_path, variant):
+    """Потік випадкових чисел для одного варіанту файлу: (seed, скрипт, шлях, номер варіанту)."""
+    return random.Random(derive_seed(seed, "randomize_with_answers", f"{rel_path}:variant{variant}"))
+
+def shuffle_job(job):
+    """
+    Перемішує один файл: job = (шлях, генератор з file_rng, попередній запис
+    маніфесту або None). Нічого не записує.
+    Повертає (новий_контент, відповіді, запис_маніфесту, None) або (None, None, None, помилка).
+    Виконується в пулі процесів при --jobs > 1.
+    """
+    filepath, rng, previous = job
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
     except Exception as e:
-        print(f"  ❌ Помилка читання: {e}")
-        return 0
-
-    new_content, answers = shuffle_answers_and_track(content)
-
-    if not answers:
-        print(f"  ℹ️  Таблиць answerTable не знайдено")
-        return 0
-
-    # Зберігаємо відповіді
-    if topic_name not in answers_dict:
-        answers_dict[topic_name] = {}
-
-    # Визначаємо базове ім'я файлу
-    base_name = os.path.basename(filepath)
-    answers_dict[topic_name][base_name] = answers
+        return None, None, None, f"Помилка читання: {e}"
+    new_content, answers, record = shuffle_segments(split_answer_tables(content), rng, text_sha256(content), previous)
+    # Без таблиць вміст не потрібен - не передаємо його назад з процесу
+    return (new_content if answers else None), answers, record, None
 
+def variants_job(job):
+    """
+    Розбирає один файл один раз і збирає з нього кілька варіантів:
+    job = (шлях, генератори випадкових чисел - по одному на варіант,
+    попередній запис маніфесту або None).
+    Повертає ([(контент, відповіді, запис_маніфесту) для кожного варіанту], None)
+    або (None, помилка).
+    """
+    filepath, rngs, previous = job
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        print(f"  ✅ Перемішано {len(answers)} таблиць відповідей")
-        return len(answers)
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
     except Exception as e:
-        print(f"  ❌ Помилка запису: {e}")
-        return 0
+        return None, f"Помилка читання: {e}"
+    segments = split_answer_tables(content)
+    content_sha256 = text_sha256(content)
+    return [shuffle_segments(segments, rng, content_sha256, previous) for rng in rngs], None
 
-def generate_answers_tex(answers_dict, output_dir):
-    """Генерує .tex файли з відповідями для кожної теми"""
+def shuffle_files(jobs, workers=1, job=shuffle_job):
+    """
+    Результати job (shuffle_job або variants_job) для jobs у тому ж порядку, по одному.
+    При workers > 1 файли обробляються паралельно в пулі процесів;
+    якщо споживач зупиниться (наприклад, Ctrl+C), незапущені завдання скасовуються.
+    """
+    if workers > 1 and len(jobs) > 1:
+        # Ctrl+C обробляє головний процес; робочі процеси його ігнорують
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=signal.signal,
+                                   initargs=(signal.SIGINT, signal.SIG_IGN))
+        try:
+            yield from pool.map(job, jobs)
+        finally:
+            pool.shutdown(cancel_futures=True)
+    else:
+        for item in jobs:
+            yield job(item)
+
+@contextlib.contextmanager
+def deferred_interrupt():
+    """
+    Ctrl+C всередині блоку не перериває його, а лише додає запис у список,
+    який повертає with; цикл перевіряє список між файлами.
+    """
+    interrupted = []
+    previous_handler = signal.signal(signal.SIGINT, lambda signum, frame: interrupted.append(signum))
+    try:
+        yield interrupted
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
 
-    for topic_name, files in answers_dict.items():
-        # Визначаємо директорію для збереження
-        topic_dir = os.path.join(output_dir, topic_name)
-        os.makedirs(topic_dir, exist_ok=True)
+def collect_files(base_dir, exclude_dir=None):
+    """
+    Файли із завданнями в base_dir за каталогом теки (scripts/workspace.py):
+    [(шлях, відносний шлях, тема)] у фіксованому порядку - спершу завдання.tex,
+    потім інші завдання*.tex, потім generated_tasks.tex і згенеровані.tex
+    з generated/, у кожній групі за шляхом. Файли всередині exclude_dir пропускаються.
+    """
+    catalog = load_catalog(base_dir)
+    task_files = [f for entry in catalog.topics.values() for f in entry["task_files"]]
+    generated_files = [f for entry in catalog.topics.values() for f in entry["generated_files"]]
+    groups = [
+        [f for f in task_files if os.path.basename(f) == "завдання.tex"],
+        [f for f in task_files if os.path.basename(f) != "завдання.tex"],
+    ] + [[f for f in generated_files if os.path.basename(f) == name] for name in GENERATED_TASK_FILES]
+    excluded = os.path.join(os.path.abspath(exclude_dir), '') if exclude_dir else None
+
+    files = []
+    for group in groups:
+        for rel_path in sorted(group):
+            filepath = os.path.join(base_dir, rel_path)
+            if excluded and os.path.abspath(filepath).startswith(excluded):
+                continue
 
-        # Об'єднуємо всі відповіді
-        all_answers = []
-        for file_name, file_answers in files.items():
-            all_answers.extend(file_answers)
+            # Назва теми - тека в корені або в generated/
+            parts = rel_path.split(os.sep)
+            topic_name = parts[1] if parts[0] == 'generated' else parts[0]
+            files.append((filepath, rel_path, topic_name))
+    return files
 
-        if not all_answers:
+def link_siblings(src_dir, dst_dir, skip):
+    """
+    Додає в dst_dir решту файлів із src_dir (малюнки тощо), крім імен зі skip:
+    жорстким посиланням, або копією, якщо посилання неможливе.
+    """
+    for name in sorted(os.listdir(src_dir)):
+        src = os.path.join(src_dir, name)
+        dst = os.path.join(dst_dir, name)
+        if name in skip or name.endswith('.tmp') or not os.path.isfile(src) or os.path.exists(dst):
             continue
-
-        # Генеруємо .tex файл
-        tex_content = generate_tex_answers(topic_name, all_answers)
-
-        output_path = os.path.join(topic_dir, 'answers.tex')
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(tex_content)
-            print(f"📄 Збережено відповіді: {output_path}")
-        except Exception as e:
-            print(f"❌ Помилка запису {output_path}: {e}")
-
-def generate_tex_answers(topic_name, answers):
-    """Генерує LaTeX код для відповідей"""
-
-    # Розбиваємо на групи по 15 (для multicols)
-    tex = r"""\documentclass[12pt]{extarticle}
-\usepackage{fontspec}
-\usepackage{polyglossia}
-\setdefaultlanguage{ukrainian}
-
-\defaultfontfeatures{Ligatures=TeX}
-\setmainfont{Liberation Serif}
-
-\usepackage[a4paper,margin=2cm]{geometry}
-\usepackage{multicol}
-\usepackage{xcolor}
-
-\definecolor{headerblue}{RGB}{0, 102, 204}
-
-\begin{document}
-
-\begin{center}
-{\Large\textbf{\color{headerblue}ВІДПОВІДІ}}
-\end{center}
-
-\begin{center}
-{\large """ + f"Тема: {topic_name}" + r"""}
-\end{center}
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
 
-\vspace{0.5cm}
-
-\begin{multicols}{5}
-\noindent
-"""
-
-    for i, ans in enumerate(answers, 1):
-        tex += f"{i}. {ans}"
-        if i < len(answers):
-            tex += " \\\\\n"
-        else:
-            tex += "\n"
-
-    tex += r"""\end{multicols}
+def emit_variants(base_dir, files, seed, count, output_dir, workers=1):
+    """
+    Режим варіантів: кожен файл із files (collect_files(base_dir)) розбирається один раз, а потім з нього
+    збирається count варіантів з різним порядком відповідей. Варіант v
+    записується в output_dir/variant_vv/ з тією ж структурою тек, разом
+    з відповідями (відповіді.tex / answers.tex у теці теми і answers_all.json),
+    маніфестом перемішування (shuffle_manifest.json) і рештою файлів тек
+    із завданнями (малюнки), щоб варіант компілювався.
+    Вихідні файли не змінюються. Повертає кількість записаних файлів.
+    """
+    variants = range(1, count + 1)
+
+    variant_dirs = [os.path.join(output_dir, f"variant_{v:02d}") for v in variants]
+    manifests = [new_manifest(variant=v, seed=seed) for v in variants]
+    # Якщо base_dir уже перемішували на місці, варіанти рахуються від оригіналу
+    base_manifest = load_manifest(base_dir)
+    previous = base_manifest["files"] if base_manifest else {}
+    # Теки із завданнями: їх решта файлів додається в кожен варіант наприкінці
+    task_dirs = {}
+    files_written = 0
+    total_tables = 0
 
-\end{document}
-"""
-    return tex
+    print(f"🗂️  Варіантів: {count} -> {output_dir}")
+    jobs = [(filepath, [variant_rng(seed, rel_path, v) for v in variants], previous.get(rel_path))
+            for filepath, rel_path, _ in files]
+    with deferred_interrupt() as interrupted:
+        results = shuffle_files(jobs, workers, variants_job)
+        try:
+            for (filepath, rel_path, topic_name), (rendered, error) in zip(files, results):
+                if interrupted:
+                    break
+                print(f"\n📄 {rel_path}")
+                if error is not None:
+                    print(f"  ❌ {error}")
+                    continue
+                try:
+                    # Файли без таблиць теж копіюються, щоб кожен варіант був повним
+                    for variant_dir, manifest, (content, answers, record) in zip(variant_dirs, manifests, rendered):
+                        target = os.path.join(variant_dir, rel_path)
+                        os.makedirs(os.path.dirname(target), exist_ok=True)
+                        write_atomic(target, content)
+                        if answers:
+                            manifest["files"][rel_path] = manifest_entry(topic_name, rel_path, record)
+                except Exception as e:
+                    print(f"  ❌ Помилка запису: {e}")
+                    continue
+                files_written += 1
+                tables = len(rendered[0][1]) if rendered else 0
+                total_tables += tables
+                task_dirs[os.path.dirname(filepath)] = os.path.dirname(rel_path)
+                if tables:
+                    print(f"  ✅ {count} варіантів по {tables} таблиць відповідей")
+                else:
+                    print(f"  ℹ️  Таблиць answerTable не знайдено, скопійовано без змін")
+        finally:
+            results.close()
+    if interrupted:
+        print(f"\n⚠️  Перервано після {files_written} з {len(files)} файлів; "
+              f"зберігаємо відповіді для вже записаних")
+
+    # Файли з відповідями не копіюються: у кожного варіанту вони свої
+    skip = {os.path.basename(filepath) for filepath, _, _ in files} | {'відповіді.tex', 'answers.tex', 'answers_all.json',
+                                                                  'shuffle_manifest.json'}
+    for src_dir, rel_dir in task_dirs.items():
+        for variant_dir in variant_dirs:
+            link_siblings(src_dir, os.path.join(variant_dir, rel_dir), skip)
 
-def main():
-    # Базова директорія
-    base_dir = "/Users/markiyankharchuk/Desktop/НМТ_по_темах_латех"
+    print("\n📝 Генерація файлів відповідей...")
+    for variant_dir, manifest in zip(variant_dirs, manifests):
+        try:
+            os.makedirs(variant_dir, exist_ok=True)
+            save_manifest(variant_dir, manifest)
+            write_answer_keys(variant_dir, manifest)
+        except Exception as e:
+            print(f"❌ Помилка запису відповідей у {variant_dir}: {e}")
 
-    if len(sys.argv) > 1:
-        base_dir = sys.argv[1]
+    print("\n" + "=" * 60)
+    print(f"📊 ПІДСУМОК:")
+    print(f"   Варіантів: {count} ({output_dir})")
+    print(f"   Файлів у кожному варіанті: {files_written}")
+    print(f"   Таблиць у кожному варіанті: {total_tables}")
+    return files_written * count
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Рандомізація відповідей з генерацією файлів відповідей")
+    parser.add_argument("base_dir", nargs="?", default=WORKSPACE_DIR,
+                        help="Базова директорія з темами (за замовчуванням - поточна)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed для відтворюваного перемішування (за замовчуванням - випадковий)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Кількість процесів для перемішування (за замовчуванням - кількість ядер)")
+    parser.add_argument("--variants", type=int, default=0, metavar="N",
+                        help="Не змінювати файли, а записати N перемішаних варіантів з відповідями в --output-dir")
+    parser.add_argument("--output-dir", default=None,
+                        help="Директорія для --variants (за замовчуванням - <base_dir>_variants)")
+    args = parser.parse_args(argv)
+    if args.output_dir is None:
+        args.output_dir = os.path.normpath(args.base_dir) + "_variants"
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    base_dir = args.base_dir
+
+    # Без --seed обираємо випадковий, але друкуємо його, щоб запуск можна було повторити
+    seed = args.seed if args.seed is not None else random.SystemRandom().randrange(2**32)
 
     print(f"🔀 Рандомізація відповідей у файлах завдань НМТ")
     print(f"📁 Директорія: {base_dir}")
+    print(f"🎲 Seed: {seed}")
     print("=" * 60)
 
     # Словник для збору відповідей
     answers_dict = {}
+    shuffled = []
 
     # Знаходимо всі .tex файли із завданнями
     files_processed = 0
     total_tables = 0
 
-    # Паттерни файлів для обробки
-    patterns = [
-        "**/завдання.tex",
-        "**/завдання*.tex",
-        "generated/**/generated_tasks.tex",
-        "generated/**/згенеровані.tex"
-    ]
-
-    processed_files = set()
+    files = collect_files(base_dir, exclude_dir=args.output_dir if args.variants else None)
 
-    for pattern in patterns:
-        from glob import glob
-        for filepath in glob(os.path.join(base_dir, pattern), recursive=True):
-            if filepath in processed_files:
-                continue
-            processed_files.add(filepath)
-
-            # Визначаємо назву теми
-            rel_path = os.path.relpath(filepath, base_dir)
-            parts = rel_path.split(os.sep)
+    if args.variants:
+        emit_variants(base_dir, files, seed, args.variants, args.output_dir, args.jobs)
+        return
 
-            if parts[0] == 'generated':
-                topic_name = parts[1] if len(parts) > 1 else 'Інше'
-            else:
-                topic_name = parts[0] if len(parts) > 0 else 'Інше'
+    # Перемішування паралельне, а запис і відповіді - тут, у порядку файлів.
+    # Після Ctrl+C поточний файл дописується разом з його відповідями,
+    # тож відповіді є рівно для тих файлів, що вже перемішані
 
-            print(f"\n📄 {rel_path}")
+    # Маніфест попередніх перемішувань: повторне перемішування рахується від оригіналу
+    manifest = load_manifest(base_dir) or new_manifest()
+    jobs = [(filepath, file_rng(seed, rel_path), manifest["files"].get(rel_path)) for filepath, rel_path, _ in files]
+    with deferred_interrupt() as interrupted:
+        results = shuffle_files(jobs, args.jobs)
+        try:
+            for (filepath, rel_path, topic_name), (new_content, answers, record, error) in zip(files, results):
+                if interrupted:
+                    break
+                print(f"\n📄 {rel_path}")
+                files_processed += 1
+                if error is not None:
+                    print(f"  ❌ {error}")
+                    continue
+                if not answers:
+                    print(f"  ℹ️  Таблиць answerTable не знайдено")
+                    continue
+                try:
+                    write_atomic(filepath, new_content)
+                except Exception as e:
+                    print(f"  ❌ Помилка запису: {e}")
+                    continue
+                previous = manifest["files"].get(rel_path)
+                if previous and previous["source_sha256"] != record["source_sha256"]:
+                    print(f"  ⚠️  Файл змінено після попереднього перемішування: вважаємо його новим оригіналом")
+                manifest["files"][rel_path] = manifest_entry(topic_name, rel_path, record,
+                                                             script="randomize_with_answers", seed=seed)
+                answers_dict.setdefault(topic_name, {})[answer_key(rel_path)] = answers
+                shuffled.append((rel_path, topic_name, answers))
+                total_tables += len(answers)
+                print(f"  ✅ Перемішано {len(answers)} таблиць відповідей")
+        finally:
+            results.close()
+    if interrupted:
+        print(f"\n⚠️  Перервано після {files_processed} з {len(files)} файлів; "
+              f"зберігаємо відповіді для вже перемішаних")
 
-            tables = process_file(filepath, answers_dict, topic_name)
-            total_tables += tables
-            files_processed += 1
+    try:
+        save_manifest(base_dir, manifest)
+        print(f"\n🧾 Збережено маніфест: {manifest_path(base_dir)}")
+    except Exception as e:
+        print(f"❌ Помилка збереження маніфесту: {e}")
 
     print("\n" + "=" * 60)
 
     # Генеруємо файли відповідей
     print("\n📝 Генерація файлів відповідей...")
 
-    # Для оригінальних тем - зберігаємо в ту ж директорію
-    for topic_name, files in answers_dict.items():
-        if topic_name.startswith('generated'):
-            continue
-
-        # Знаходимо директорію теми
-        topic_dir = None
-        for d in os.listdir(base_dir):
-            if d.startswith(topic_name.split('.')[0]) or d == topic_name:
-                topic_dir = os.path.join(base_dir, d)
-                break
-
-        if topic_dir and os.path.isdir(topic_dir):
-            all_answers = []
-            for file_answers in files.values():
-                all_answers.extend(file_answers)
-
-            if all_answers:
-                tex_content = generate_tex_answers(topic_name, all_answers)
-                output_path = os.path.join(topic_dir, 'відповіді.tex')
-                try:
-                    with open(output_path, 'w', encoding='utf-8') as f:
-                        f.write(tex_content)
-                    print(f"📄 Збережено: {output_path}")
-                except Exception as e:
-                    print(f"❌ Помилка: {e}")
-
-    # Для згенерованих тем
-    generated_dir = os.path.join(base_dir, 'generated')
-    if os.path.exists(generated_dir):
-        for topic_name, files in answers_dict.items():
-            # Шукаємо теми в generated
-            for gen_topic in os.listdir(generated_dir):
-                if gen_topic == topic_name or topic_name.endswith(gen_topic):
-                    gen_topic_dir = os.path.join(generated_dir, gen_topic)
-                    if os.path.isdir(gen_topic_dir):
-                        all_answers = []
-                        for file_answers in files.values():
-                            all_answers.extend(file_answers)
-
-                        if all_answers:
-                            tex_content = generate_tex_answers(gen_topic, all_answers)
-                            output_path = os.path.join(gen_topic_dir, 'answers.tex')
-                            try:
-                                with open(output_path, 'w', encoding='utf-8') as f:
-                                    f.write(tex_content)
-                                print(f"📄 Оновлено: {output_path}")
-                            except Exception as e:
-                                print(f"❌ Помилка: {e}")
-                        break
+    # Теки тем - з шляхів файлів (каталог робочої теки), а не пошуком за префіксом назви
+    for output_path, error in write_topic_answers(base_dir, shuffled):
+        print(f"❌ Помилка: {error}" if error else f"📄 Збережено: {output_path}")
 
     # Зберігаємо JSON з усіма відповідями
     json_path = os.path.join(base_dir, 'answers_all.json')
     try:
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(answers_dict, f, ensure_ascii=False, indent=2)
+        write_atomic(json_path, json.dumps(answers_dict, ensure_ascii=False, indent=2))
         print(f"\n📊 Збережено JSON: {json_path}")
     except Exception as e:
         print(f"❌ Помилка збереження JSON: {e}")
@@ -352,5 +389,4 @@ def main():
     print("\n💡 Тепер правильна відповідь розміщена випадково (А-Д)")
 
 if __name__ == "__main__":
-    random.seed()  # Випадковий seed для різних результатів
     main()
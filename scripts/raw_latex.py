@@ -0,0 +1,117 @@
+"""
+Loads the raw LaTeX of parsed tasks on demand.
+
+Task records keep only the location of their text: "source" (path relative
+to the source root), "raw_spans" ([byte offset, byte length] pairs into the
+UTF-8 file) and "source_sha256". SourceReader reads the spans from a
+memory-mapped file under a source directory, or from the member of the same
+name in the zip archive, and refuses sources whose hash no longer matches.
+Records written before the spans were introduced (such as the committed
+nmt_database.json) still carry their text inline as "raw_latex"; it is
+returned as is.
+
+    from scripts.raw_latex import SourceReader
+    with SourceReader() as reader:
+        for task in iter_tasks(topic="24", limit=3):
+            print(reader.raw_latex(task))
+
+    PYTHONPATH=. python3 scripts/raw_latex.py 24._Арифметична_прогресія_task_1_2024
+"""
+
+import os
+import sys
+import mmap
+import hashlib
+import zipfile
+import argparse
+
+from scripts.latex_parser import SOURCE_DIR, SOURCE_ZIP, OUTPUT_FILE, default_source
+from scripts.task_store import iter_tasks
+
+class SourceReader:
+    """Raw LaTeX of tasks from one source root (a directory or a .zip archive)."""
+
+    def __init__(self, root=None):
+        self.root = root or default_source()
+        self._zip = zipfile.ZipFile(self.root) if self.root.endswith(".zip") else None
+        # source -> (file object or None, bytes-like content), verified hashes
+        self._open = {}
+        self._verified = set()
+
+    def _member_name(self, source):
+        if source in self._zip.NameToInfo:
+            return source
+        # Archives with an extra top-level folder
+        for member in self._zip.namelist():
+            if member.endswith("/" + source):
+                return member
+        raise FileNotFoundError(f"{source} not found in {self.root}")
+
+    def data(self, source):
+        """Content of a source file as bytes (memory-mapped for directories)."""
+        if source not in self._open:
+            if self._zip is not None:
+                self._open[source] = (None, self._zip.read(self._member_name(source)))
+            else:
+                f = open(os.path.join(self.root, source), "rb")
+                size = os.fstat(f.fileno()).st_size
+                # mmap cannot map an empty file
+                content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+                self._open[source] = (f, content)
+        return self._open[source][1]
+
+    def raw_latex(self, task):
+        """The raw LaTeX of a task record, as latex_parser saw it."""
+        source = task.get("source")
+        if "raw_spans" not in task and "raw_latex" in task:
+            # Record from a database built before raw_spans
+            return task["raw_latex"]
+        if source is None or "raw_spans" not in task:
+            raise ValueError(f"Task {task.get('id')} has no source location; re-run latex_parser.py")
+        data = self.data(source)
+        expected = task.get("source_sha256")
+        if expected and (source, expected) not in self._verified:
+            if hashlib.sha256(data).hexdigest() != expected:
+                raise ValueError(f"{source} changed since it was parsed; re-run latex_parser.py")
+            self._verified.add((source, expected))
+        return b"".join(data[offset:offset + length] for offset, length in task["raw_spans"]).decode("utf-8")
+
+    def close(self):
+        for f, content in self._open.values():
+            if f is not None:
+                if isinstance(content, mmap.mmap):
+                    content.close()
+                f.close()
+        self._open.clear()
+        if self._zip is not None:
+            self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def load_raw_latex(task, root=None):
+    """Raw LaTeX of a single task; use a SourceReader for many."""
+    with SourceReader(root) as reader:
+        return reader.raw_latex(task)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the raw LaTeX of parsed tasks.")
+    parser.add_argument("ids", nargs="+", help="Task ids")
+    parser.add_argument("--db", default=OUTPUT_FILE, help=f"Task database (default: {OUTPUT_FILE})")
+    parser.add_argument("--root", default=None,
+                        help=f"Source directory or zip archive (default: {SOURCE_DIR}, else {SOURCE_ZIP})")
+    args = parser.parse_args(argv)
+
+    wanted = set(args.ids)
+    with SourceReader(args.root) as reader:
+        for task in iter_tasks(args.db):
+            if task["id"] in wanted:
+                print(f"% {task['id']} ({task.get('source', 'inline raw_latex')})")
+                print(reader.raw_latex(task))
+                print()
+
+if __name__ == "__main__":
+    sys.exit(main())
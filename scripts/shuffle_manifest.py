@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Маніфест перемішування відповідей (shuffle_manifest.json).
+
+randomize_with_answers.py і randomize_answers_v2.py записують його в base_dir
+(а режим --variants - у кожну теку варіанту). Для кожного перемішаного файлу:
+тема, seed, sha256 оригіналу (до першого перемішування), sha256 записаного
+файлу і перестановка кожної таблиці (shuffled[i] = args[perm[i]]) відносно
+оригіналу. Правильна відповідь таблиці - LABELS[perm.index(0)].
+
+З маніфесту, не читаючи і не переписуючи самі завдання, можна:
+- перевірити, чи файли змінювали після перемішування (sha256);
+- заново згенерувати відповіді.tex і answers_all.json;
+- відтворити перемішані файли з оригіналів (наприклад, варіант для друку).
+
+    PYTHONPATH=. python3 scripts/shuffle_manifest.py <base_dir>             # перевірка
+    PYTHONPATH=. python3 scripts/shuffle_manifest.py <base_dir> --answers
+    PYTHONPATH=. python3 scripts/shuffle_manifest.py <variant_dir> --rebuild-from <оригінали>
+"""
+
+import os
+import sys
+import json
+import argparse
+
+from scripts.answer_tables import (split_answer_tables, apply_permutations, answers_from_permutations, text_sha256,
+                                   write_topic_answers, write_atomic)
+
+MANIFEST_FILE = "shuffle_manifest.json"
+MANIFEST_VERSION = 1
+
+def manifest_path(directory):
+    return os.path.join(directory, MANIFEST_FILE)
+
+def new_manifest(**fields):
+    """Порожній маніфест; fields - додаткові поля верхнього рівня (наприклад, variant)."""
+    return {"version": MANIFEST_VERSION, **fields, "files": {}}
+
+def load_manifest(directory):
+    """Маніфест теки або None, якщо його немає."""
+    path = manifest_path(directory)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"{path}: версія маніфесту {manifest.get('version')}, очікувалась {MANIFEST_VERSION}")
+    return manifest
+
+def save_manifest(directory, manifest):
+    """Записує маніфест атомарно; по одному файлу на рядок, щоб diff був читабельним."""
+    head = json.dumps({key: value for key, value in manifest.items() if key != "files"}, ensure_ascii=False)
+    records = ",\n".join(f"  {json.dumps(rel_path, ensure_ascii=False)}: {json.dumps(record, ensure_ascii=False)}"
+                         for rel_path, record in manifest["files"].items())
+    body = f"{{\n{records}\n}}" if records else "{}"
+    write_atomic(manifest_path(directory), f'{head[:-1]}, "files": {body}}}\n')
+
+def file_status(directory, rel_path, record):
+    """"ok", "edited" (вміст не той, що був записаний) або "missing"."""
+    path = os.path.join(directory, rel_path)
+    if not os.path.exists(path):
+        return "missing"
+    with open(path, 'r', encoding='utf-8') as f:
+        return "ok" if text_sha256(f.read()) == record["sha256"] else "edited"
+
+def check_manifest(directory, manifest):
+    """[(відносний шлях, статус)] для кожного файлу маніфесту."""
+    return [(rel_path, file_status(directory, rel_path, record)) for rel_path, record in manifest["files"].items()]
+
+def answers_by_topic(manifest):
+    """Відповіді у форматі answers_all.json: {тема: {файл: [мітки]}}."""
+    answers = {}
+    for record in manifest["files"].values():
+        answers.setdefault(record["topic"], {})[record["key"]] = answers_from_permutations(record["permutations"])
+    return answers
+
+def write_answer_keys(directory, manifest):
+    """
+    Генерує відповіді.tex (answers.tex для тем у generated/) у теці кожної теми
+    і answers_all.json у directory - лише з маніфесту. Повертає список записаних шляхів.
+    """
+    suffix = f", варіант {manifest['variant']}" if manifest.get("variant") else ""
+    entries = [(rel_path, record["topic"], answers_from_permutations(record["permutations"]))
+               for rel_path, record in manifest["files"].items()]
+    written = []
+    for path, error in write_topic_answers(directory, entries, suffix):
+        if error is not None:
+            raise OSError(f"{path}: {error}")
+        written.append(path)
+    answers = answers_by_topic(manifest)
+    json_path = os.path.join(directory, 'answers_all.json')
+    write_atomic(json_path, json.dumps(answers, ensure_ascii=False, indent=2))
+    written.append(json_path)
+    return written
+
+def rebuild_files(source_dir, directory, manifest):
+    """
+    Відтворює перемішані файли маніфесту в directory з оригіналів у source_dir.
+    Оригінал з іншим sha256 пропускається. Повертає [(відносний шлях, помилка або None)].
+    """
+    results = []
+    for rel_path, record in manifest["files"].items():
+        try:
+            with open(os.path.join(source_dir, rel_path), 'r', encoding='utf-8') as f:
+                content = f.read()
+            if text_sha256(content) != record["source_sha256"]:
+                results.append((rel_path, "оригінал змінився після перемішування"))
+                continue
+            new_content = apply_permutations(split_answer_tables(content), record["permutations"])
+            target = os.path.join(directory, rel_path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            write_atomic(target, new_content)
+            results.append((rel_path, None))
+        except Exception as e:
+            results.append((rel_path, str(e)))
+    return results
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Перевірка маніфесту перемішування і генерація відповідей з нього")
+    parser.add_argument("directory", help=f"Тека з {MANIFEST_FILE} (base_dir або тека варіанту)")
+    parser.add_argument("--answers", action="store_true",
+                        help="Заново згенерувати відповіді.tex і answers_all.json з маніфесту")
+    parser.add_argument("--rebuild-from", default=None, metavar="SOURCE_DIR",
+                        help="Відтворити перемішані файли з оригіналів у SOURCE_DIR")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    manifest = load_manifest(args.directory)
+    if manifest is None:
+        print(f"❌ {manifest_path(args.directory)} не знайдено")
+        return 1
+
+    if args.rebuild_from:
+        failed = 0
+        for rel_path, error in rebuild_files(args.rebuild_from, args.directory, manifest):
+            if error:
+                failed += 1
+                print(f"❌ {rel_path}: {error}")
+        print(f"🔁 Відтворено файлів: {len(manifest['files']) - failed} з {len(manifest['files'])}")
+
+    if args.answers:
+        for path in write_answer_keys(args.directory, manifest):
+            print(f"📄 Збережено: {path}")
+
+    if not args.answers and not args.rebuild_from:
+        statuses = check_manifest(args.directory, manifest)
+        for rel_path, status in statuses:
+            if status != "ok":
+                print(f"⚠️  {rel_path}: {'змінено після перемішування' if status == 'edited' else 'файл відсутній'}")
+        bad = sum(status != "ok" for _, status in statuses)
+        print(f"📊 Файлів у маніфесті: {len(statuses)}, без змін: {len(statuses) - bad}, змінено або відсутні: {bad}")
+        return 1 if bad else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
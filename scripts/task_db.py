@@ -0,0 +1,221 @@
+"""
+Optional SQLite database of the parsed tasks, for indexed queries such as
+"all 2023 matching tasks in topic 30 with TikZ" without loading the corpus.
+
+latex_parser.py writes it with --sqlite (default nmt_database.sqlite):
+- tasks: one row per task, in source order, with indexes on topic,
+  topic_number, year, type, has_tikz and task_number;
+- options: one row per answer option (task, position, text);
+- task_search: FTS5 index over the question text (skipped, with a substring
+  match as the search fallback, if this SQLite build has no FTS5).
+
+query_tasks() returns the same task dicts as the JSON database:
+
+    PYTHONPATH=. python3 scripts/task_db.py --topic 30 --year 2023 --type matching --tikz
+    PYTHONPATH=. python3 scripts/task_db.py --search "площа трикутника" --limit 5
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import argparse
+
+from scripts.workspace import topic_number
+
+DB_FILE = "nmt_database.sqlite"
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE tasks (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    topic_number INTEGER,
+    source TEXT,
+    task_number TEXT,
+    year TEXT,
+    type TEXT,
+    question TEXT,
+    images TEXT,
+    has_tikz INTEGER,
+    raw_spans TEXT,
+    source_sha256 TEXT
+);
+CREATE INDEX tasks_id ON tasks(id);
+CREATE INDEX tasks_topic ON tasks(topic);
+CREATE INDEX tasks_topic_number ON tasks(topic_number);
+CREATE INDEX tasks_year ON tasks(year);
+CREATE INDEX tasks_type ON tasks(type);
+CREATE INDEX tasks_has_tikz ON tasks(has_tikz);
+CREATE INDEX tasks_task_number ON tasks(task_number);
+CREATE TABLE options (
+    task_seq INTEGER NOT NULL REFERENCES tasks(seq),
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (task_seq, position)
+);
+"""
+
+FTS_SCHEMA = "CREATE VIRTUAL TABLE task_search USING fts5(question, content='tasks', content_rowid='seq')"
+
+def has_fts5(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+    except sqlite3.OperationalError:
+        return False
+    conn.execute("DROP TABLE temp.fts5_probe")
+    return True
+
+def write_database(path, tasks):
+    """
+    (Re)builds the SQLite database at path from task dicts, in one transaction.
+    The file is written next to path first and renamed, so readers never see
+    a half-written database. Returns the number of tasks written.
+    """
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    count = 0
+    try:
+        with conn:
+            conn.executescript(SCHEMA)
+            fts = has_fts5(conn)
+            if fts:
+                conn.execute(FTS_SCHEMA)
+            for seq, task in enumerate(tasks, 1):
+                conn.execute(
+                    "INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (seq, task["id"], task["topic"], topic_number(task["topic"]), task.get("source"),
+                     task["task_number"], task["year"], task["type"], task["question"],
+                     json.dumps(task.get("images", []), ensure_ascii=False),
+                     int(bool(task.get("has_tikz"))), json.dumps(task.get("raw_spans", [])),
+                     task.get("source_sha256")))
+                conn.executemany(
+                    "INSERT INTO options VALUES (?, ?, ?)",
+                    [(seq, position, text) for position, text in enumerate(task.get("options", []))])
+                count = seq
+            if fts:
+                conn.execute("INSERT INTO task_search(task_search) VALUES ('rebuild')")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    return count
+
+def connect(path=DB_FILE):
+    """Read-only connection to an existing database."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found; build it with latex_parser.py --sqlite")
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != SCHEMA_VERSION:
+        conn.close()
+        raise ValueError(f"{path} has schema version {version}, expected {SCHEMA_VERSION}; rebuild it")
+    return conn
+
+def _task(row, options):
+    seq, id_, topic, _, source, task_number, year, type_, question, images, has_tikz, raw_spans, source_sha256 = row
+    return {
+        "id": id_,
+        "topic": topic,
+        "source": source,
+        "task_number": task_number,
+        "year": year,
+        "type": type_,
+        "question": question,
+        "options": options,
+        "images": json.loads(images),
+        "has_tikz": bool(has_tikz),
+        "raw_spans": json.loads(raw_spans),
+        "source_sha256": source_sha256,
+    }
+
+def query_tasks(path=DB_FILE, topic=None, year=None, task_type=None, has_tikz=None,
+                task_number=None, search=None, limit=None):
+    """
+    Tasks matching every given filter, in source order. topic is a full topic
+    name or a topic number; search is an FTS5 query over the question text
+    (a plain substring if FTS5 is not available).
+    """
+    conn = connect(path)
+    try:
+        where, params = [], []
+        if topic is not None:
+            if str(topic).strip().isdigit():
+                where.append("t.topic_number = ?")
+                params.append(int(topic))
+            else:
+                where.append("t.topic = ?")
+                params.append(topic)
+        for column, value in (("t.year", year), ("t.type", task_type), ("t.task_number", task_number)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(str(value))
+        if has_tikz is not None:
+            where.append("t.has_tikz = ?")
+            params.append(int(bool(has_tikz)))
+        if search is not None:
+            fts = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'task_search'").fetchone()
+            if fts:
+                where.append("t.seq IN (SELECT rowid FROM task_search WHERE task_search MATCH ?)")
+            else:
+                where.append("instr(t.question, ?) > 0")
+            params.append(search)
+
+        sql = "SELECT t.* FROM tasks t"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY t.seq"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        rows = conn.execute(sql, params).fetchall()
+        options = {}
+        if rows:
+            seqs = [row[0] for row in rows]
+            # One query for the options of all selected tasks (in batches below SQLite's variable limit)
+            for i in range(0, len(seqs), 500):
+                batch = seqs[i:i + 500]
+                marks = ", ".join("?" * len(batch))
+                for seq, text in conn.execute(
+                        f"SELECT task_seq, text FROM options WHERE task_seq IN ({marks}) ORDER BY task_seq, position", batch):
+                    options.setdefault(seq, []).append(text)
+        return [_task(row, options.get(row[0], [])) for row in rows]
+    finally:
+        conn.close()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Query the SQLite task database written by latex_parser.py --sqlite.")
+    parser.add_argument("--db", default=DB_FILE, help=f"Database file (default: {DB_FILE})")
+    parser.add_argument("--topic", default=None, help="Topic name or number")
+    parser.add_argument("--year", default=None)
+    parser.add_argument("--type", dest="task_type", default=None,
+                        help="multiple_choice, matching or unknown")
+    parser.add_argument("--tikz", dest="has_tikz", action="store_const", const=True, default=None,
+                        help="Only tasks with a TikZ picture")
+    parser.add_argument("--no-tikz", dest="has_tikz", action="store_const", const=False,
+                        help="Only tasks without a TikZ picture")
+    parser.add_argument("--task-number", default=None)
+    parser.add_argument("--search", default=None, help="Full-text query over the question text")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Print the matching tasks as JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    tasks = query_tasks(args.db, topic=args.topic, year=args.year, task_type=args.task_type,
+                        has_tikz=args.has_tikz, task_number=args.task_number,
+                        search=args.search, limit=args.limit)
+    if args.json:
+        json.dump(tasks, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return
+    for task in tasks:
+        print(f"{task['id']:<60} {task['type']:<16} {task['question'][:60]}")
+    print(f"{len(tasks)} tasks.")
+
+if __name__ == "__main__":
+    sys.exit(main())
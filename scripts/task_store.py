@@ -0,0 +1,245 @@
+"""
+JSON Lines store for the parsed task database.
+
+latex_parser.py writes nmt_database.jsonl next to nmt_database.json: one
+task per line, in source order. Newly parsed files can then be appended
+instead of rewriting the whole database, and readers can stream it with
+constant memory:
+
+    from scripts.task_store import iter_tasks
+    for task in iter_tasks(topic="24", task_type="multiple_choice", limit=10):
+        ...
+
+Without a .jsonl file the reader falls back to streaming the JSON array
+element by element, so existing databases keep working. A .sqlite path
+(latex_parser.py --sqlite) is queried through scripts.task_db, with the
+filters answered by its indexes.
+
+load_tasks() (and iter_tasks(..., snapshot=True)) loads the whole store from
+a marshal snapshot next to it (nmt_database.snapshot), which is rebuilt
+whenever the store's hash changes. Fields with few distinct values are
+interned, so every record shares one string object per value.
+"""
+
+import os
+import re
+import sys
+import json
+import marshal
+import hashlib
+from itertools import islice
+
+DB_FILE = "nmt_database.json"
+# Characters read at a time from a JSON array
+CHUNK_SIZE = 1 << 16
+
+SNAPSHOT_VERSION = 1
+# Fields with few distinct values: one shared string object per value
+INTERNED_FIELDS = ("topic", "source", "year", "type", "task_number", "source_sha256")
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r'\s*')
+_TOPIC_NUMBER = re.compile(r'\s*(\d+)\s*\.')
+
+def jsonl_path(path):
+    """nmt_database.json -> nmt_database.jsonl"""
+    return os.path.splitext(path)[0] + ".jsonl"
+
+def store_path(path=DB_FILE):
+    """The JSONL store of path if it exists, else path itself."""
+    if path.endswith((".jsonl", ".sqlite")):
+        return path
+    lines = jsonl_path(path)
+    return lines if os.path.exists(lines) else path
+
+def _task_line(task):
+    return json.dumps(task, ensure_ascii=False) + "\n"
+
+def write_tasks(path, tasks):
+    """(Re)writes a JSONL store. Returns the number of tasks written."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for task in tasks:
+            f.write(_task_line(task))
+            count += 1
+    return count
+
+def append_tasks(path, tasks):
+    """Appends tasks to a JSONL store. Returns the number of tasks appended."""
+    count = 0
+    with open(path, "a", encoding="utf-8") as f:
+        for task in tasks:
+            f.write(_task_line(task))
+            count += 1
+    return count
+
+def read_jsonl(path):
+    """Tasks of a JSONL store, one line at a time; blank lines are skipped."""
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: {e}") from None
+
+def read_json_array(path, chunk_size=CHUNK_SIZE):
+    """
+    Elements of a JSON array file, decoded one at a time with raw_decode from
+    a buffer that is refilled chunk_size characters at a time.
+    """
+    with open(path, encoding="utf-8") as f:
+        buf, pos, eof = "", 0, False
+        # "open": before "[", "first": after "[", "value": after ",", "next": after an element
+        state = "open"
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos == len(buf):
+                if eof:
+                    raise ValueError(f"{path}: truncated JSON array")
+                buf, pos = f.read(chunk_size), 0
+                eof = not buf
+                continue
+            char = buf[pos]
+            if state == "open":
+                if char != "[":
+                    raise ValueError(f"{path}: expected a JSON array")
+                pos += 1
+                state = "first"
+                continue
+            if char == "]" and state in ("first", "next"):
+                return
+            if state == "next":
+                if char != ",":
+                    raise ValueError(f"{path}: expected ',' or ']' after an array element")
+                pos += 1
+                state = "value"
+                continue
+            try:
+                value, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                value, end = None, None
+            # Until the "," or "]" after it is in the buffer, an element may be
+            # cut short (e.g. "2." of "2.5"); read on and decode it again
+            if end is not None:
+                after = _WHITESPACE.match(buf, end).end()
+                complete = after < len(buf) and buf[after] in ",]"
+            if end is None or not (complete or eof):
+                if eof:
+                    raise ValueError(f"{path}: invalid JSON array element")
+                more = f.read(chunk_size)
+                eof = not more
+                buf, pos = buf[pos:] + more, 0
+                continue
+            yield value
+            pos = end
+            state = "next"
+
+def matches_topic(task, topic):
+    """topic is a full topic name, or a topic number ("24" matches "24. Арифметична прогресія")."""
+    name = task.get("topic", "")
+    if name == topic:
+        return True
+    number = _TOPIC_NUMBER.match(name)
+    return number is not None and str(topic).strip() == number.group(1)
+
+def snapshot_path(path):
+    """nmt_database.jsonl -> nmt_database.snapshot"""
+    return os.path.splitext(path)[0] + ".snapshot"
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _read_snapshot(snap, store, st):
+    """
+    (tasks, refresh) from the snapshot if it was built from the current store,
+    else (None, True). refresh is set when only the mtime differed, so the
+    snapshot is rewritten and the hash is not needed next time.
+    """
+    try:
+        with open(snap, "rb") as f:
+            header = marshal.load(f)
+            if not (isinstance(header, dict)
+                    and header.get("version") == SNAPSHOT_VERSION
+                    and header.get("python") == tuple(sys.version_info[:2])
+                    and header.get("store") == os.path.basename(store)):
+                return None, True
+            # Size and mtime first; the hash only when they differ (e.g. after a checkout)
+            refresh = (header.get("size"), header.get("mtime")) != (st.st_size, st.st_mtime_ns)
+            if refresh and header.get("sha256") != _file_sha256(store):
+                return None, True
+            # marshal.load() on a file reads in small pieces; loads() on the rest is ~5x faster
+            return marshal.loads(f.read()), refresh
+    except (OSError, EOFError, ValueError, TypeError):
+        return None, True
+
+def _write_snapshot(snap, store, st, tasks):
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "python": tuple(sys.version_info[:2]),
+        "store": os.path.basename(store),
+        "size": st.st_size,
+        "mtime": st.st_mtime_ns,
+        "sha256": _file_sha256(store),
+    }
+    tmp = snap + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            marshal.dump(header, f)
+            marshal.dump(tasks, f)
+        os.replace(tmp, snap)
+    except OSError:
+        # A read-only checkout still loads, just without the cache
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def load_tasks(path=DB_FILE):
+    """
+    Every task of the store of path, as a list. Loaded from the marshal
+    snapshot next to the store when it matches the store (same size and
+    mtime, or same hash); otherwise the store is read and the snapshot rebuilt.
+    """
+    store = store_path(path)
+    if store.endswith(".sqlite"):
+        from scripts.task_db import query_tasks
+        return query_tasks(store)
+    st = os.stat(store)
+    snap = snapshot_path(store)
+    tasks, refresh = _read_snapshot(snap, store, st)
+    if tasks is None:
+        tasks = list(read_jsonl(store) if store.endswith(".jsonl") else read_json_array(store))
+        for task in tasks:
+            for field in INTERNED_FIELDS:
+                if isinstance(task.get(field), str):
+                    task[field] = sys.intern(task[field])
+    if refresh:
+        _write_snapshot(snap, store, st, tasks)
+    return tasks
+
+def iter_tasks(path=DB_FILE, topic=None, task_type=None, limit=None, snapshot=False):
+    """
+    Streams tasks from the store of path (see store_path), optionally only
+    those of one topic and/or type, and at most limit of them.
+    snapshot=True reads them through load_tasks() instead: the whole store
+    is in memory, but repeated runs start almost instantly.
+    """
+    path = store_path(path)
+    if path.endswith(".sqlite"):
+        from scripts.task_db import query_tasks
+        return iter(query_tasks(path, topic=topic, task_type=task_type, limit=limit))
+    if snapshot:
+        tasks = iter(load_tasks(path))
+    else:
+        tasks = read_jsonl(path) if path.endswith(".jsonl") else read_json_array(path)
+    if topic is not None:
+        tasks = (t for t in tasks if matches_topic(t, topic))
+    if task_type is not None:
+        tasks = (t for t in tasks if t.get("type") == task_type)
+    if limit is not None:
+        tasks = islice(tasks, limit)
+    return tasks
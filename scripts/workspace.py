@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Каталог робочої теки з темами (корінь репозиторію або її копія).
+
+Тека сканується один раз в індекс за номером теми:
+- source_dirs:    теки тем у корені ("12. Паралелограм");
+- task_files:     завдання*.tex у них (разом з підтеками);
+- generated_dirs: теки generated/ з тим самим номером ("generated/12. Чотирикутники");
+- generated_files: .tex у них, крім answers.tex;
+- answer_files:   відповіді.tex у теках тем і answers.tex у generated/.
+
+Теми зіставляються за номером, тож "12. Паралелограм" і "12. Чотирикутники"
+- одна тема 12, а "1. ..." не плутається з "13. ...". Шляхи відносні до кореня.
+
+Індекс зберігається в .cache/workspace_catalog.json разом з mtime кожної
+просканованої теки; при наступному завантаженні тека сканується заново,
+лише якщо якась з них змінилась (додали чи видалили файл або теку).
+
+    from scripts.workspace import load_catalog
+    catalog = load_catalog()
+    catalog.topic("12. Паралелограм")["generated_dirs"]   # ['generated/12. Чотирикутники']
+
+    PYTHONPATH=. python3 scripts/workspace.py 12
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+
+WORKSPACE_DIR = "."
+GENERATED_DIR = "generated"
+CACHE_FILE = os.path.join(".cache", "workspace_catalog.json")
+CATALOG_VERSION = 1
+
+TASK_FILE_PREFIX = "завдання"
+ANSWER_FILES = ("відповіді.tex", "answers.tex")
+
+_TOPIC_NUMBER = re.compile(r'\s*(\d+)\s*\.')
+
+def topic_number(topic):
+    """Leading number of a topic name ("30. Логарифм..." -> 30), or None."""
+    m = _TOPIC_NUMBER.match(topic or "")
+    return int(m.group(1)) if m else None
+
+def _empty_topic():
+    return {"source_dirs": [], "task_files": [], "generated_dirs": [], "generated_files": [], "answer_files": []}
+
+def scan_workspace(root=WORKSPACE_DIR):
+    """
+    Сканує root: {"topics": {номер: ...}, "dirs": {відносна тека: mtime_ns}}.
+    У dirs - усі теки, від яких залежить індекс (для перевірки кешу).
+    """
+    topics = {}
+    dirs = {".": os.stat(root).st_mtime_ns}
+
+    def topic(number):
+        return topics.setdefault(str(number), _empty_topic())
+
+    for name in sorted(os.listdir(root)):
+        path = os.path.join(root, name)
+        number = topic_number(name)
+        if number is None or name.startswith('.') or not os.path.isdir(path):
+            continue
+        entry = topic(number)
+        entry["source_dirs"].append(name)
+        for current, subdirs, files in os.walk(path):
+            subdirs.sort()
+            rel_dir = os.path.relpath(current, root)
+            dirs[rel_dir] = os.stat(current).st_mtime_ns
+            for file in sorted(files):
+                if file.startswith(TASK_FILE_PREFIX) and file.endswith('.tex'):
+                    entry["task_files"].append(os.path.join(rel_dir, file))
+                elif file in ANSWER_FILES:
+                    entry["answer_files"].append(os.path.join(rel_dir, file))
+
+    generated = os.path.join(root, GENERATED_DIR)
+    if os.path.isdir(generated):
+        dirs[GENERATED_DIR] = os.stat(generated).st_mtime_ns
+        for name in sorted(os.listdir(generated)):
+            path = os.path.join(generated, name)
+            number = topic_number(name)
+            # Теки без номера (дати, answers) - не теми
+            if number is None or not os.path.isdir(path):
+                continue
+            rel_dir = os.path.join(GENERATED_DIR, name)
+            dirs[rel_dir] = os.stat(path).st_mtime_ns
+            entry = topic(number)
+            entry["generated_dirs"].append(rel_dir)
+            for file in sorted(os.listdir(path)):
+                if file in ANSWER_FILES:
+                    entry["answer_files"].append(os.path.join(rel_dir, file))
+                elif file.endswith('.tex'):
+                    entry["generated_files"].append(os.path.join(rel_dir, file))
+
+    return {"topics": topics, "dirs": dirs}
+
+class WorkspaceCatalog:
+    """Індекс тем робочої теки; див. scan_workspace."""
+
+    def __init__(self, root, index):
+        self.root = root
+        self.topics = {int(number): entry for number, entry in index["topics"].items()}
+        self.dirs = index["dirs"]
+        # Ім'я теки (теми або generated/) -> номер теми
+        self._numbers = {}
+        for number, entry in self.topics.items():
+            for rel_dir in entry["source_dirs"] + entry["generated_dirs"]:
+                self._numbers.setdefault(os.path.basename(rel_dir), number)
+
+    def topic_number(self, topic):
+        """Номер теми за номером, назвою теки теми чи теки в generated/, або None."""
+        if isinstance(topic, int):
+            return topic if topic in self.topics else None
+        name = os.path.basename(os.path.normpath(str(topic)))
+        if name in self._numbers:
+            return self._numbers[name]
+        number = topic_number(name)
+        return number if number in self.topics else None
+
+    def topic(self, topic):
+        """Запис теми (див. scan_workspace) або порожній запис, якщо такої теми немає."""
+        number = self.topic_number(topic)
+        return self.topics[number] if number is not None else _empty_topic()
+
+    def source_dir(self, topic):
+        """Тека теми в корені: з тією ж назвою, якщо є, інакше перша з тим самим номером; або None."""
+        dirs = self.topic(topic)["source_dirs"]
+        name = os.path.basename(os.path.normpath(str(topic)))
+        if name in dirs:
+            return name
+        return dirs[0] if dirs else None
+
+    def generated_dir(self, topic):
+        """Тека теми в generated/ (з тією ж назвою, якщо є) або None."""
+        dirs = self.topic(topic)["generated_dirs"]
+        name = os.path.join(GENERATED_DIR, os.path.basename(os.path.normpath(str(topic))))
+        if name in dirs:
+            return name
+        return dirs[0] if dirs else None
+
+    def task_files(self):
+        """Усі завдання*.tex тем і .tex у generated/ (крім answers.tex), за номером теми."""
+        files = []
+        for number in sorted(self.topics):
+            entry = self.topics[number]
+            files.extend(entry["task_files"])
+            files.extend(entry["generated_files"])
+        return files
+
+def _cache_is_fresh(root, cached):
+    for rel_dir, mtime in cached["dirs"].items():
+        try:
+            if os.stat(os.path.join(root, rel_dir)).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+def load_catalog(root=WORKSPACE_DIR, refresh=False):
+    """
+    Каталог root з кешу, якщо жодна з його тек не змінилась, інакше сканує
+    root і оновлює кеш. refresh=True сканує завжди.
+    """
+    cache_path = os.path.join(root, CACHE_FILE)
+    if not refresh:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get("version") == CATALOG_VERSION and _cache_is_fresh(root, cached):
+                return WorkspaceCatalog(root, cached)
+        except (OSError, ValueError, KeyError):
+            pass
+
+    try:
+        # Тека кешу створюється до сканування: інакше її поява змінила б mtime кореня
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    except OSError:
+        pass
+    index = scan_workspace(root)
+    tmp_path = cache_path + ".tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": CATALOG_VERSION, **index}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Тека лише для читання: каталог працює і без кешу
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return WorkspaceCatalog(root, index)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Каталог тем робочої теки")
+    parser.add_argument("topics", nargs="*", help="Номери або назви тем (за замовчуванням - усі)")
+    parser.add_argument("--root", default=WORKSPACE_DIR, help="Робоча тека (за замовчуванням - поточна)")
+    parser.add_argument("--refresh", action="store_true", help="Сканувати заново, не дивлячись на кеш")
+    parser.add_argument("--json", action="store_true", help="Вивести записи тем як JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    catalog = load_catalog(args.root, refresh=args.refresh)
+    numbers = [catalog.topic_number(t if not t.isdigit() else int(t)) for t in args.topics] or sorted(catalog.topics)
+    selected = {number: catalog.topics[number] for number in numbers if number is not None}
+    if args.json:
+        json.dump(selected, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return
+    for number, entry in selected.items():
+        print(f"{number:>3}. {', '.join(entry['source_dirs']) or '-'}  |  "
+              f"{', '.join(entry['generated_dirs']) or '-'}  |  "
+              f"завдань: {len(entry['task_files'])}, згенерованих: {len(entry['generated_files'])}, "
+              f"відповідей: {len(entry['answer_files'])}")
+
+if __name__ == "__main__":
+    sys.exit(main())
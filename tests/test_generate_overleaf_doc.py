@@ -0,0 +1,73 @@
+import json
+
+from generators.arithmetic_progression import ArithmeticMemberDifferenceGenerator, ArithmeticSumGenerator
+from generators.logarithms import LogValueGenerator
+from generators.uniqueness import TaskIndex, task_key
+from scripts.generate_overleaf_doc import (answer_key_paths, generate_topic_doc, index_published, render_chunk,
+                                           stream_chunk, topic_jobs, topic_sinks, write_topic_doc)
+from scripts.latex_parser import parse_latex_file
+
+
+def questions(path):
+    return [task["question"] for task in parse_latex_file(str(path), "T")]
+
+
+def test_key_ignores_options_and_year_marker():
+    generated = {"question": "Знайдіть  $x$.", "options": ["1", "2", "3", "4", "5"]}
+    published = {"question": "Знайдіть $x$. \\nmtyear{2026}", "options": ["5", "6", "7", "8", "1"]}
+    assert task_key(generated) == task_key(published)
+
+
+def test_published_task_is_rejected(tmp_path):
+    gens = [ArithmeticMemberDifferenceGenerator()]
+    published = tmp_path / "published.tex"
+    generate_topic_doc("T", gens, str(published), seed=1, tasks_per_type=10, answers=False)
+    # Published with other distractors: only the question must decide
+    text = published.read_text(encoding="utf-8").replace("\\answerTable{", "\\answerTable{999}{")
+    published.write_text(text, encoding="utf-8")
+
+    index = TaskIndex(str(tmp_path / "index.bin"))
+    index_published(index, [str(published)])
+    index.save()
+    # Without the index the same seed would reproduce the published document
+    output = tmp_path / "out.tex"
+    generate_topic_doc("T", gens, str(output), seed=1, tasks_per_type=10, index=index, answers=False)
+
+    assert len(questions(output)) == 10
+    assert not set(questions(output)) & set(questions(published))
+
+
+def test_repeats_across_chunks_and_topics_are_rejected(tmp_path):
+    # 16 distinct questions: two chunks of 6 would overlap without the merged index
+    gens = [LogValueGenerator(), LogValueGenerator()]
+    index = TaskIndex(str(tmp_path / "index.bin"))
+    first = tmp_path / "first.tex"
+    second = tmp_path / "second.tex"
+    generate_topic_doc("T", gens, str(first), seed=3, tasks_per_type=6, index=index, answers=False)
+    generate_topic_doc("T", [ArithmeticSumGenerator()] + gens[:1], str(second), seed=3, tasks_per_type=2, index=index, answers=False)
+
+    written = questions(first) + questions(second)
+    assert len(written) == 16
+    assert len(set(written)) == 16
+
+
+def test_serial_and_pooled_chunks_write_the_same_document(tmp_path):
+    gens = [LogValueGenerator(), LogValueGenerator()]
+    outputs = []
+    for name, render in (("serial.tex", stream_chunk), ("pooled.tex", render_chunk)):
+        index = TaskIndex(str(tmp_path / f"{name}.bin"))
+        jobs = topic_jobs("T", gens, 5, 6, index.path)
+        write_topic_doc("T", map(render, jobs), topic_sinks(str(tmp_path / name), answers=False), index, jobs)
+        outputs.append((tmp_path / name).read_text(encoding="utf-8"))
+    assert outputs[0] == outputs[1]
+
+
+def test_answer_key_json_keeps_the_committed_layout(tmp_path):
+    output = tmp_path / "topic.tex"
+    generate_topic_doc("T", [LogValueGenerator()], str(output), seed=1, tasks_per_type=3)
+    text = open(answer_key_paths(str(output))[1], encoding="utf-8").read()
+    key = json.loads(text)
+    # Same key order as generated/answers/*.json: the count right after the topic
+    assert list(key) == ["тема", "кількість_завдань", "завдання"]
+    assert key["кількість_завдань"] == len(key["завдання"]) == 3
+    assert text.splitlines()[4].startswith('    {"номер": 1, ')
@@ -0,0 +1,54 @@
+import json
+
+from scripts.latex_parser import build_database
+from scripts.task_store import jsonl_path
+
+
+def write_topic(source, topic, count, text="Обчисліть"):
+    folder = source / topic
+    folder.mkdir(parents=True, exist_ok=True)
+    tasks = "".join(f"\\task{{{i}}}{{{text} ${i} + 1$. \\nmtyear{{2024}}}}\n"
+                    f"\\answerTable{{{i}}}{{{i + 1}}}{{{i + 2}}}{{{i + 3}}}{{{i + 4}}}\n\n"
+                    for i in range(1, count + 1))
+    (folder / "завдання.tex").write_text(tasks, encoding="utf-8")
+
+
+def build(source, output):
+    tasks = build_database(str(source), str(output))
+    with open(jsonl_path(str(output)), encoding="utf-8") as f:
+        stored = [json.loads(line) for line in f if line.strip()]
+    with open(output, encoding="utf-8") as f:
+        database = json.load(f)
+    return tasks, stored, database
+
+
+def test_changed_last_file_rewrites_the_store(tmp_path, capsys):
+    source = tmp_path / "src"
+    output = tmp_path / "db.json"
+    write_topic(source, "1. Перша", 3)
+    write_topic(source, "2. Друга", 2)
+    build(source, output)
+
+    for run in range(2):
+        write_topic(source, "2. Друга", 2, text=f"Знайдіть ({run})")
+        tasks, stored, database = build(source, output)
+        assert len(tasks) == len(stored) == len(database) == 5
+        assert "Appended" not in capsys.readouterr().out
+
+    # Nothing changed: nothing is parsed again
+    tasks, stored, database = build(source, output)
+    assert len(stored) == len(database) == 5
+    assert "Parsing" not in capsys.readouterr().out
+
+
+def test_new_last_file_is_appended(tmp_path, capsys):
+    source = tmp_path / "src"
+    output = tmp_path / "db.json"
+    write_topic(source, "1. Перша", 3)
+    build(source, output)
+    capsys.readouterr()
+
+    write_topic(source, "2. Друга", 2)
+    tasks, stored, database = build(source, output)
+    assert "Appended 2 tasks" in capsys.readouterr().out
+    assert stored == database == tasks
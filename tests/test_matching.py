@@ -0,0 +1,54 @@
+import math
+
+import pytest
+
+from generators.base import MathTaskGenerator
+from generators.logarithms import LogValueGenerator
+from generators.matching import MatchingTaskGenerator
+from generators.trigonometry import TrigReductionGenerator
+
+
+class TwoAnswersGenerator(MathTaskGenerator):
+    def generate(self):
+        value = self.rng.choice([1, 2])
+        return self.make_task(f"Задача {value}", value, [], value)
+
+
+def answer_sets(gen, count):
+    letters = "АБВГД"
+    return {
+        frozenset(task["options"][letters.index(letter)] for letter in task["mapping"].values())
+        for task in (gen.generate() for _ in range(count))
+    }
+
+
+def test_capacity_counts_distinct_answer_sets():
+    # 16 parameter combinations, but only 4 distinct answers: C(4, 3) sets
+    gen = MatchingTaskGenerator(TrigReductionGenerator).reseed(2)
+    assert gen.capacity() == 4
+    assert not gen.capacity_is_upper_bound()
+    assert len(answer_sets(gen, 500)) == gen.capacity()
+
+
+def test_capacity_leaves_the_stream_untouched():
+    gen = MatchingTaskGenerator(LogValueGenerator).reseed(1)
+    other = MatchingTaskGenerator(LogValueGenerator).reseed(1)
+    gen.capacity()
+    assert gen.generate() == other.generate()
+
+
+def test_four_items():
+    gen = MatchingTaskGenerator(LogValueGenerator, items=4).reseed(3)
+    assert gen.generator_id.endswith("x4")
+    assert gen.capacity() == math.comb(gen.sub_gen.distinct_answers(), 4)
+    for _ in range(200):
+        task = gen.generate()
+        assert len(task["questions"]) == len(set(task["questions"])) == 4
+        assert len(task["options"]) == len(set(task["options"])) == 5
+        assert sorted(task["mapping"]) == [1, 2, 3, 4]
+
+
+def test_too_few_distinct_answers_is_an_error():
+    gen = MatchingTaskGenerator(TwoAnswersGenerator).reseed(1)
+    with pytest.raises(ValueError, match="2 distinct answers"):
+        gen.generate()
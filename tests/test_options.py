@@ -0,0 +1,19 @@
+from generators.matching import MatchingTaskGenerator
+from generators.options import neighbours
+from generators.trigonometry import TrigEquationGenerator, TrigReductionGenerator
+
+
+def test_latex_without_numbers_has_same_kind_neighbours():
+    assert neighbours("$\\sin \\alpha$") == ["$-\\sin \\alpha$", "$\\cos \\alpha$", "$-\\cos \\alpha$",
+                                             "$\\tg \\alpha$", "$-\\tg \\alpha$"]
+    assert neighbours("$\\pi k$") == ["$-\\pi k$", "$2\\pi k$", "$\\frac{\\pi k}{2}$"]
+    # Only whole command names are swapped
+    assert neighbours("$\\sinh x$") == ["$-\\sinh x$"]
+
+
+def test_trig_generators_need_no_integer_fallback():
+    for gen in (TrigReductionGenerator(), TrigEquationGenerator(), MatchingTaskGenerator(TrigReductionGenerator)):
+        gen.reseed(1)
+        for _ in range(300):
+            gen.generate()
+        assert gen.option_stats["fallback"] == 0
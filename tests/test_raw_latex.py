@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from scripts.latex_parser import parse_latex_file
+from scripts.raw_latex import SourceReader
+from scripts.task_store import iter_tasks
+
+
+def test_reads_spans_from_the_source(tmp_path):
+    topic = tmp_path / "1. Тема"
+    topic.mkdir()
+    text = "\\task{1}{Обчисліть $2 + 2$. \\nmtyear{2024}}\n\\answerTable{1}{2}{3}{4}{5}\n"
+    (topic / "завдання.tex").write_text(text, encoding="utf-8")
+    task, = parse_latex_file(str(topic / "завдання.tex"), "1. Тема", source="1. Тема/завдання.tex")
+    with SourceReader(str(tmp_path)) as reader:
+        raw = reader.raw_latex(task)
+    assert "Обчисліть $2 + 2$." in raw and "\\answerTable{1}{2}{3}{4}{5}" in raw
+
+
+def test_falls_back_to_inline_raw_latex(tmp_path):
+    task = {"id": "old", "raw_latex": "\\task{1}{x}"}
+    with SourceReader(str(tmp_path)) as reader:
+        assert reader.raw_latex(task) == "\\task{1}{x}"
+
+
+def test_committed_database_is_readable(tmp_path):
+    task = next(iter_tasks(str(Path(__file__).resolve().parents[1] / "nmt_database.json")))
+    with SourceReader(str(tmp_path)) as reader:
+        assert reader.raw_latex(task).strip()